@@ -84,7 +84,7 @@ def create_empty_structure(project_path: Path) -> tuple[list[str], list[CreatedF
 
     FILES = [
         CreatedFile(path=Path("RULES.md"), content=None),
-        CreatedFile(path=Path(".naoignore"), content="templates/\n*.j2\n"),
+        CreatedFile(path=Path(".naoignore"), content="templates/\n*.j2\n.nao/\n"),
     ]
 
     created_folders = []
@@ -1,6 +1,8 @@
 """Sync command for synchronizing repositories and database schemas."""
 
+import contextlib
 import sys
+import time
 from pathlib import Path
 from typing import Annotated
 
@@ -11,9 +13,13 @@ from nao_core.config import NaoConfig
 from nao_core.templates.render import render_all_templates
 from nao_core.tracking import track_command
 
+from .plan import PlanFormat, print_plan
+from .profile import ProfileFormat, SyncProfiler
 from .providers import (
+    DEFAULT_PROVIDERS,
     PROVIDER_CHOICES,
     ProviderSelection,
+    SyncOptions,
     SyncResult,
     get_all_providers,
     get_providers_by_names,
@@ -22,6 +28,19 @@ from .providers import (
 console = Console()
 
 
+def _get_selected_items(selection: ProviderSelection, config: NaoConfig) -> list:
+    """Get a provider's items, filtered by connection name if one was selected."""
+    items = selection.provider.get_items(config)
+    connection_filter = selection.connection_name
+    if connection_filter:
+        items = [item for item in items if getattr(item, "name", None) == connection_filter]
+        if not items:
+            console.print(
+                f"[yellow]Warning:[/yellow] No connection named '{connection_filter}' found for {selection.provider.name}"
+            )
+    return items
+
+
 @track_command("sync")
 def sync(
     *,
@@ -35,6 +54,46 @@ def sync(
     output_dirs: Annotated[dict[str, str] | None, Parameter(show=False)] = None,
     _providers: Annotated[list[ProviderSelection] | None, Parameter(show=False)] = None,
     render_templates: bool = True,
+    resume: Annotated[
+        bool,
+        Parameter(
+            help="Continue an interrupted database sync from its last checkpoint instead of starting over.",
+        ),
+    ] = False,
+    profile: Annotated[
+        str | None,
+        Parameter(help="Write a machine-readable timing profile of the sync to this file."),
+    ] = None,
+    profile_format: Annotated[
+        ProfileFormat,
+        Parameter(help="Profile format: `json` (structured profile) or `chrome` (Chrome trace-event format)."),
+    ] = "json",
+    render_only: Annotated[
+        bool,
+        Parameter(
+            help="Re-render database outputs from the metadata snapshot of the last sync without querying "
+            "the warehouse (e.g. after editing templates). Other providers are skipped.",
+        ),
+    ] = False,
+    plan: Annotated[
+        bool,
+        Parameter(
+            help="Show the schemas, tables and queries a sync would run (with scan estimates where supported) "
+            "without rendering or writing anything.",
+        ),
+    ] = False,
+    plan_format: Annotated[
+        PlanFormat,
+        Parameter(help="Plan output: `text` (summary) or `json` (machine-readable, printed to stdout)."),
+    ] = "text",
+    force_render: Annotated[
+        bool,
+        Parameter(help="Re-render every Jinja template, even those whose inputs haven't changed since the last sync."),
+    ] = False,
+    repo_workers: Annotated[
+        int,
+        Parameter(help="Number of git repositories cloned or pulled concurrently."),
+    ] = 4,
 ):
     """Sync resources using configured providers.
 
@@ -46,68 +105,96 @@ def sync(
     the project directory, making the `nao` context object available for
     accessing provider data.
     """
-    console.print("\n[bold cyan]🔄 nao sync[/bold cyan]\n")
-
-    config = NaoConfig.try_load(exit_on_error=True)
-    assert config is not None  # Help type checker after exit_on_error=True
+    json_plan = plan and plan_format == "json"
+    # The JSON plan is all that goes to stdout; anything printed while computing it goes to stderr
+    with contextlib.redirect_stdout(sys.stderr) if json_plan else contextlib.nullcontext():
+        if not json_plan:
+            console.print("\n[bold cyan]🔄 nao sync[/bold cyan]\n")
+
+        config = NaoConfig.try_load(exit_on_error=True)
+        assert config is not None  # Help type checker after exit_on_error=True
+
+        # Get project path (current working directory after NaoConfig.try_load)
+        project_path = Path.cwd()
+
+        if not json_plan:
+            console.print(f"[dim]Project:[/dim] {config.project_name}")
+
+        # Resolve providers: CLI names > programmatic providers > all providers
+        if provider:
+            try:
+                active_providers = get_providers_by_names(provider)
+            except ValueError as e:
+                console.print(f"[red]Error:[/red] {e}")
+                sys.exit(1)
+        elif _providers is not None:
+            active_providers = _providers
+        else:
+            active_providers = get_all_providers()
 
-    # Get project path (current working directory after NaoConfig.try_load)
-    project_path = Path.cwd()
+        plans: dict[str, dict] = {}
+        if plan:
+            for selection in active_providers:
+                items = _get_selected_items(selection, config)
+                if items:
+                    plans[selection.provider.name] = selection.provider.plan(items, project_path=project_path)
 
-    console.print(f"[dim]Project:[/dim] {config.project_name}")
-
-    # Resolve providers: CLI names > programmatic providers > all providers
-    if provider:
-        try:
-            active_providers = get_providers_by_names(provider)
-        except ValueError as e:
-            console.print(f"[red]Error:[/red] {e}")
-            sys.exit(1)
-    elif _providers is not None:
-        active_providers = _providers
-    else:
-        active_providers = get_all_providers()
+    if plan:
+        print_plan(plans, console, plan_format)
+        return
 
     output_dirs = output_dirs or {}
+    profiler = SyncProfiler() if profile else None
+    options = SyncOptions(resume=resume, profiler=profiler, render_only=render_only, repo_workers=repo_workers)
 
     # Run each provider
     results: list[SyncResult] = []
     for selection in active_providers:
         sync_provider = selection.provider
-        connection_filter = selection.connection_name
 
         # Get output directory (custom or default)
         output_dir = output_dirs.get(sync_provider.name, sync_provider.default_output_dir)
         output_path = Path(output_dir)
 
+        if render_only and not sync_provider.supports_render_only:
+            continue
+
+        t_provider = time.monotonic()
         try:
-            sync_provider.pre_sync(config, output_path)
+            sync_provider.pre_sync(config, output_path, project_path=project_path)
 
             if not sync_provider.should_sync(config):
                 continue
 
-            # Get items and filter by connection name if specified
-            items = sync_provider.get_items(config)
-            if connection_filter:
-                items = [item for item in items if getattr(item, "name", None) == connection_filter]
-                if not items:
-                    console.print(
-                        f"[yellow]Warning:[/yellow] No connection named '{connection_filter}' found for {sync_provider.name}"
-                    )
-                    continue
-
-            result = sync_provider.sync(items, output_path, project_path=project_path)
+            items = _get_selected_items(selection, config)
+            if not items:
+                continue
+
+            result = sync_provider.sync(items, output_path, project_path=project_path, options=options)
             results.append(result)
+            if profiler:
+                profiler.record(sync_provider.name, "provider", t_provider, items=result.items_synced)
         except Exception as e:
             # Capture error but continue with other providers
             results.append(SyncResult.from_error(sync_provider.name, e))
             console.print(f"  [yellow]⚠[/yellow] {sync_provider.emoji} {sync_provider.name}: [red]{e}[/red]")
+            if profiler:
+                profiler.record(sync_provider.name, "provider", t_provider, error=f"{type(e).__name__}: {e}")
 
     # Render user Jinja templates
     template_result = None
     if render_templates:
         console.print("\n[bold cyan]📝 Rendering templates[/bold cyan]\n")
-        template_result = render_all_templates(project_path, config, console)
+        t_templates = time.monotonic()
+        provider_dirs = {p.default_output_dir for p in DEFAULT_PROVIDERS} | set(output_dirs.values())
+        template_result = render_all_templates(
+            project_path, config, console, exclude_paths=provider_dirs, force=force_render
+        )
+        if profiler:
+            profiler.record("templates", "provider", t_templates, items=template_result.templates_rendered)
+
+    if profiler and profile:
+        profiler.write(Path(profile), profile_format)
 
     # Separate successful and failed results
     successful_results = [r for r in results if r.success]
@@ -131,7 +218,11 @@ def sync(
             console.print(f"  [dim]{result.provider_name}:[/dim] {result.get_summary()}")
 
     # Show template results
-    if template_result and (template_result.templates_rendered > 0 or template_result.templates_failed > 0):
+    if template_result and (
+        template_result.templates_rendered > 0
+        or template_result.templates_failed > 0
+        or template_result.templates_skipped > 0
+    ):
         has_results = True
         console.print(f"  [dim]Templates:[/dim] {template_result.get_summary()}")
 
@@ -145,6 +236,9 @@ def sync(
     if not has_results:
         console.print("  [dim]Nothing to sync[/dim]")
 
+    if profile:
+        console.print(f"\n  [dim]Profile written to[/dim] {profile}")
+
     console.print()
 
     # Exit with error code if any provider or template failed
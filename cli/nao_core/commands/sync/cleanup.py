@@ -1,6 +1,10 @@
 """Cleanup utilities for removing stale sync files."""
 
+import heapq
+import json
 import shutil
+import threading
+import uuid
 from collections import defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -8,8 +12,27 @@ from typing import Dict, List
 
 from rich.console import Console
 
+from .layout import layout_files
+from .writer import write_if_changed
+
 console = Console()
 
+MANIFEST_FILENAME = "manifest.json"
+
+
+def get_trash_dir(base_path: Path, project_path: Path | None = None) -> Path:
+    """Get the directory where stale outputs are moved before being deleted.
+
+    It lives under the project's `.nao/` folder, next to the sync outputs, so
+    moving a directory there is a cheap rename on the same filesystem.
+
+    Args:
+        base_path: Base output path of the provider
+        project_path: Path to the nao project root (defaults to the parent of base_path)
+    """
+    root = project_path if project_path is not None else base_path.parent
+    return root / ".nao" / "trash"
+
 
 @dataclass
 class DatabaseSyncState:
@@ -21,6 +44,15 @@ class DatabaseSyncState:
     db_path: Path
     """The root path for this database (e.g., databases/type=duckdb/database=mydb)"""
 
+    state_dir: Path | None = None
+    """Bookkeeping directory holding the manifest of the last sync (None walks the output tree instead)"""
+
+    trash_dir: Path | None = None
+    """Directory stale paths are moved to before background deletion (None deletes them in place)"""
+
+    output_layout: str = "tables"
+    """Output layout the sync wrote ('tables', 'schema' or 'catalog'); files of another layout are stale"""
+
     synced_schemas: set[str] = field(default_factory=set)
     """Set of schema names that were synced"""
 
@@ -33,6 +65,42 @@ class DatabaseSyncState:
     tables_synced: int = 0
     """Count of tables synced"""
 
+    tables_resumed: int = 0
+    """Count of tables skipped because a previous interrupted run already synced them"""
+
+    completed: bool = False
+    """Whether the sync ran to the end (stale cleanup is only safe for completed syncs)"""
+
+    timeouts: int = 0
+    """Count of template renders abandoned because they exceeded the query timeout"""
+
+    skipped_tables: list[str] = field(default_factory=list)
+    """Tables (schema.table) whose expensive accessors were skipped by the circuit breaker"""
+
+    slowest_renders: list[tuple[float, str, str]] = field(default_factory=list)
+    """Min-heap of the slowest (seconds, schema.table, accessor) renders"""
+
+    files_written: int = 0
+    """Count of output files written because their content changed"""
+
+    files_unchanged: int = 0
+    """Count of output files left untouched because their content was identical"""
+
+    cache_hits: int = 0
+    """Count of accessor calls served from the per-table context cache"""
+
+    query_retries: int = 0
+    """Count of queries retried after a transient error"""
+
+    throttled_queries: int = 0
+    """Count of queries the warehouse throttled (retried under the database's query limits)"""
+
+    bytes_scanned: int = 0
+    """Estimated bytes scanned, as charged against the max_bytes_scanned budget"""
+
+    cache_misses: int = 0
+    """Count of accessor calls that had to query the warehouse"""
+
     def add_table(self, schema: str, table: str) -> None:
         """Record that a table was synced.
 
@@ -46,6 +114,16 @@ class DatabaseSyncState:
         self.synced_tables[schema].add(table)
         self.tables_synced += 1
 
+    def add_resumed_table(self, schema: str, table: str) -> None:
+        """Record a table that was synced by a previous, interrupted run.
+
+        Args:
+            schema: The schema/dataset name
+            table: The table name
+        """
+        self.add_table(schema, table)
+        self.tables_resumed += 1
+
     def add_schema(self, schema: str) -> None:
         """Record that a schema was synced (even if empty).
 
@@ -55,6 +133,161 @@ class DatabaseSyncState:
         self.synced_schemas.add(schema)
         self.schemas_synced += 1
 
+    def add_render_timing(self, schema: str, table: str, accessor: str, seconds: float, keep: int = 10) -> None:
+        """Track a render duration, keeping only the slowest ones.
+
+        Args:
+            schema: The schema/dataset name
+            table: The table name
+            accessor: The accessor (template) that was rendered
+            seconds: How long the render took
+            keep: How many of the slowest renders to retain
+        """
+        entry = (seconds, f"{schema}.{table}", accessor)
+        if len(self.slowest_renders) < keep:
+            heapq.heappush(self.slowest_renders, entry)
+        else:
+            heapq.heappushpop(self.slowest_renders, entry)
+
+    def add_skipped_table(self, schema: str, table: str) -> None:
+        """Record a table whose expensive accessors were skipped.
+
+        Args:
+            schema: The schema/dataset name
+            table: The table name
+        """
+        self.skipped_tables.append(f"{schema}.{table}")
+
+    def add_file_write(self, written: bool) -> None:
+        """Record the outcome of writing an output file.
+
+        Args:
+            written: Whether the file was written (False if it was unchanged)
+        """
+        if written:
+            self.files_written += 1
+        else:
+            self.files_unchanged += 1
+
+    def add_cache_stats(self, hits: int, misses: int) -> None:
+        """Accumulate accessor cache statistics from a table's DatabaseContext.
+
+        Args:
+            hits: Accessor calls served from the context cache
+            misses: Accessor calls that queried the warehouse
+        """
+        self.cache_hits += hits
+        self.cache_misses += misses
+
+
+def _read_manifest(path: Path) -> tuple[dict[str, set[str]], str, bool] | None:
+    """Read a manifest as (tables per schema, output layout, whether the sync that wrote it completed)."""
+    try:
+        data = json.loads(path.read_text())
+        schemas = {schema: set(tables) for schema, tables in data["schemas"].items()}
+        return schemas, data.get("layout", "tables"), data.get("complete", True)
+    except (OSError, ValueError, KeyError, AttributeError, TypeError):
+        return None
+
+
+def load_manifest(path: Path) -> dict[str, set[str]] | None:
+    """Load the schema -> tables manifest written by a previous sync.
+
+    Returns:
+        The synced tables per schema, or None if there is no readable manifest
+    """
+    manifest = _read_manifest(path)
+    return manifest[0] if manifest is not None else None
+
+
+def _write_manifest(path: Path, schemas: dict[str, list[str]], layout: str, complete: bool) -> None:
+    data: dict = {"layout": layout, "schemas": schemas}
+    if not complete:
+        data["complete"] = False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_if_changed(path, json.dumps(data, indent=1) + "\n")
+
+
+def write_manifest(state: DatabaseSyncState) -> None:
+    """Record the schemas and tables of a completed sync for the next run's cleanup."""
+    if state.state_dir is None:
+        return
+    schemas = {schema: sorted(state.synced_tables.get(schema, ())) for schema in sorted(state.synced_schemas)}
+    _write_manifest(state.state_dir / MANIFEST_FILENAME, schemas, state.output_layout, complete=True)
+
+
+def mark_manifest_incomplete(state: DatabaseSyncState) -> None:
+    """Flag the last manifest as out of date before a sync starts writing.
+
+    If the sync is interrupted, the tables it wrote are in no manifest, so the
+    next cleanup walks the output tree as well as reading the manifest.
+    """
+    if state.state_dir is None:
+        return
+    path = state.state_dir / MANIFEST_FILENAME
+    manifest = _read_manifest(path)
+    if manifest is None or not manifest[2]:
+        return
+    schemas, layout, _ = manifest
+    _write_manifest(path, {schema: sorted(tables) for schema, tables in schemas.items()}, layout, complete=False)
+
+
+def _scan_synced_tables(db_path: Path) -> dict[str, set[str]]:
+    """Walk the output tree to find the schemas and tables currently on disk."""
+    existing: dict[str, set[str]] = {}
+    for schema_dir in db_path.iterdir():
+        if not (schema_dir.is_dir() and schema_dir.name.startswith("schema=")):
+            continue
+        existing[schema_dir.name.replace("schema=", "")] = {
+            d.name.replace("table=", "") for d in schema_dir.iterdir() if d.is_dir() and d.name.startswith("table=")
+        }
+    return existing
+
+
+def remove_path(path: Path, trash_dir: Path | None = None) -> None:
+    """Remove a directory, moving it into the trash when possible so the caller doesn't wait on rmtree.
+
+    Args:
+        path: The directory to remove
+        trash_dir: Directory to rename the path into, or None to delete in place
+    """
+    if trash_dir is not None:
+        try:
+            trash_dir.mkdir(parents=True, exist_ok=True)
+            path.rename(trash_dir / f"{uuid.uuid4().hex}-{path.name}")
+            return
+        except OSError:
+            # e.g. trash on another filesystem; fall back to deleting in place
+            pass
+    shutil.rmtree(path)
+
+
+def empty_trash(trash_dir: Path) -> threading.Thread | None:
+    """Delete the contents of the trash directory in a background thread.
+
+    The thread is a daemon so it never delays exit; anything it did not get to
+    is swept by the next call.
+
+    Returns:
+        The started thread, or None if the trash is empty
+    """
+    if not trash_dir.is_dir():
+        return None
+    entries = list(trash_dir.iterdir())
+    if not entries:
+        return None
+
+    def _delete() -> None:
+        for entry in entries:
+            if entry.is_dir() and not entry.is_symlink():
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                entry.unlink(missing_ok=True)
+
+    thread = threading.Thread(target=_delete, name="nao-empty-trash", daemon=True)
+    thread.start()
+    return thread
+
 
 def cleanup_stale_paths(state: DatabaseSyncState, verbose: bool = False) -> int:
     """Remove directories that exist on disk but weren't synced.
@@ -63,6 +296,13 @@ def cleanup_stale_paths(state: DatabaseSyncState, verbose: bool = False) -> int:
     - Table directories that no longer exist in the source
     - Schema directories that no longer exist or have no tables
 
+    - Files of the previous output layout when the database's layout changed
+
+    Stale paths are the difference between the previous sync's manifest and
+    this one, so the output tree is only walked when there is no manifest yet,
+    or when a sync was interrupted after the manifest was written (the tables
+    it wrote are in no manifest). The new manifest is written afterwards.
+
     Args:
         state: The sync state tracking what was synced
         verbose: Whether to print cleanup messages
@@ -70,45 +310,83 @@ def cleanup_stale_paths(state: DatabaseSyncState, verbose: bool = False) -> int:
     Returns:
         Number of stale paths removed
     """
+    manifest = _read_manifest(state.state_dir / MANIFEST_FILENAME) if state.state_dir else None
     removed_count = 0
 
-    if not state.db_path.exists():
-        return 0
-
-    # Find all existing schema directories
-    existing_schemas = {
-        d.name.replace("schema=", ""): d for d in state.db_path.iterdir() if d.is_dir() and d.name.startswith("schema=")
-    }
+    if state.db_path.exists():
+        if manifest is None:
+            # A tree without a manifest can only be told apart in the per-table layout: only table
+            # directories found on disk show that a previous sync used it
+            existing = _scan_synced_tables(state.db_path)
+            previous_layout = "tables" if any(existing.values()) else state.output_layout
+            manifest = (existing, previous_layout, True)
+        previous, previous_layout, complete = manifest
+        if not complete:
+            for schema_name, tables in _scan_synced_tables(state.db_path).items():
+                previous.setdefault(schema_name, set()).update(tables)
+        layout_changed = previous_layout != state.output_layout
+        if layout_changed and verbose:
+            console.print(
+                f"  [dim red]removing {previous_layout} layout files[/dim red] "
+                f"[dim](output_layout is now {state.output_layout})[/dim]"
+            )
+
+        for schema_name in sorted(previous):
+            schema_path = state.db_path / f"schema={schema_name}"
+
+            # Remove schemas that weren't synced, and schema directories the catalog layout no longer uses
+            if schema_name not in state.synced_schemas or (layout_changed and state.output_layout == "catalog"):
+                if schema_path.exists():
+                    if verbose and not layout_changed:
+                        console.print(f"  [dim red]removing stale schema:[/dim red] {schema_name}")
+                    remove_path(schema_path, state.trash_dir)
+                    removed_count += 1
+                continue
 
-    # Remove schemas that weren't synced
-    for schema_name, schema_path in existing_schemas.items():
-        if schema_name not in state.synced_schemas:
-            if verbose:
-                console.print(f"  [dim red]removing stale schema:[/dim red] {schema_name}")
-            shutil.rmtree(schema_path)
-            removed_count += 1
-            continue
+            # Remove tables that weren't synced, or all table directories when leaving the per-table layout
+            stale_tables = previous[schema_name] - state.synced_tables.get(schema_name, set())
+            if layout_changed and previous_layout == "tables":
+                stale_tables = previous[schema_name]
+            for table_name in sorted(stale_tables):
+                table_path = schema_path / f"table={table_name}"
+                if not table_path.exists():
+                    continue
+                if verbose and not layout_changed:
+                    console.print(f"  [dim red]removing stale table:[/dim red] {schema_name}.{table_name}")
+                remove_path(table_path, state.trash_dir)
+                removed_count += 1
 
-        # Find existing tables in this schema
-        existing_tables = {
-            d.name.replace("table=", ""): d for d in schema_path.iterdir() if d.is_dir() and d.name.startswith("table=")
-        }
+            if layout_changed and previous_layout == "schema":
+                removed_count += _remove_files(schema_path, layout_files("schema"))
 
-        synced_tables_for_schema = state.synced_tables.get(schema_name, set())
+        if layout_changed and previous_layout == "catalog":
+            removed_count += _remove_files(state.db_path, layout_files("catalog"))
 
-        # Remove tables that weren't synced
-        for table_name, table_path in existing_tables.items():
-            if table_name not in synced_tables_for_schema:
-                if verbose:
-                    console.print(f"  [dim red]removing stale table:[/dim red] {schema_name}.{table_name}")
-                shutil.rmtree(table_path)
-                removed_count += 1
+    write_manifest(state)
+    if state.trash_dir is not None:
+        empty_trash(state.trash_dir)
 
     return removed_count
 
 
-def cleanup_stale_databases(active_databases: List, base_path: Path, verbose: bool = False):
-    """Remove databases that are not present in the config file."""
+def _remove_files(directory: Path, names: tuple[str, ...]) -> int:
+    """Delete the named files in a directory, returning how many existed."""
+    removed = 0
+    for name in names:
+        path = directory / name
+        if path.exists():
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def cleanup_stale_databases(
+    active_databases: List, base_path: Path, verbose: bool = False, trash_dir: Path | None = None
+):
+    """Remove databases that are not present in the config file.
+
+    Removed directories are moved into `trash_dir` (when given) and deleted in the background.
+    """
 
     valid_db_folders_by_type: Dict[str, set] = defaultdict(set)
 
@@ -127,7 +405,7 @@ def cleanup_stale_databases(active_databases: List, base_path: Path, verbose: bo
 
         # Remove entire type directory if it doesn't exist in nao_config
         if type_folder_name not in valid_db_folders_by_type:
-            shutil.rmtree(type_dir)
+            remove_path(type_dir, trash_dir)
             if verbose:
                 console.print(f"\n[yellow] Removed unused database type:[/yellow] {type_dir}")
             continue
@@ -140,10 +418,13 @@ def cleanup_stale_databases(active_databases: List, base_path: Path, verbose: bo
                 continue
 
             if db_dir.name not in valid_db_folders:
-                shutil.rmtree(db_dir)
+                remove_path(db_dir, trash_dir)
                 if verbose:
                     console.print(f"\n[yellow] Removed unused database:[/yellow] {type_folder_name}/{db_dir.name}")
 
+    if trash_dir is not None:
+        empty_trash(trash_dir)
+
 
 def cleanup_stale_repos(config_repos: list, base_path: Path, verbose: bool = False) -> None:
     """Remove repositories that are not present in the config file."""
@@ -0,0 +1,102 @@
+"""Checkpoint journal for resumable database syncs."""
+
+import json
+from pathlib import Path
+from typing import IO
+
+from rich.console import Console
+
+console = Console()
+
+JOURNAL_FILENAME = "journal.jsonl"
+
+
+def get_database_state_dir(db_path: Path, base_path: Path, project_path: Path | None = None) -> Path:
+    """Get the directory holding sync bookkeeping files for a database.
+
+    Bookkeeping lives under the project's `.nao/sync/` folder (mirroring the
+    output layout) so it never ends up in the synced context itself.
+
+    Args:
+        db_path: Output path of the database (e.g., databases/type=duckdb/database=mydb)
+        base_path: Base output path of the databases provider
+        project_path: Path to the nao project root (defaults to the parent of base_path)
+
+    Returns:
+        Directory for this database's sync state
+    """
+    root = project_path if project_path is not None else base_path.parent
+    return root / ".nao" / "sync" / base_path.name / db_path.relative_to(base_path)
+
+
+class SyncJournal:
+    """Append-only journal of (schema, table) pairs completed during a sync.
+
+    The first line is a header identifying the templates being rendered, so a
+    checkpoint is only reused when the run would produce the same files.
+    """
+
+    def __init__(self, path: Path, templates: list[str]):
+        self.path = path
+        self.templates = sorted(templates)
+        self._file: IO[str] | None = None
+
+    def _load(self) -> set[tuple[str, str]]:
+        """Read completed pairs from an existing journal matching the current templates."""
+        if not self.path.exists():
+            return set()
+
+        completed: set[tuple[str, str]] = set()
+        with self.path.open() as f:
+            try:
+                header = json.loads(f.readline())
+            except json.JSONDecodeError:
+                return set()
+            if header.get("templates") != self.templates:
+                console.print("  [yellow]⚠[/yellow] [dim]Templates changed since checkpoint, starting over[/dim]")
+                return set()
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Last line may be truncated if the previous run was killed mid-write
+                    continue
+                completed.add((entry["schema"], entry["table"]))
+        return completed
+
+    def open(self, resume: bool = False) -> set[tuple[str, str]]:
+        """Open the journal for writing.
+
+        Args:
+            resume: Keep entries from a previous interrupted run instead of starting over
+
+        Returns:
+            Set of (schema, table) pairs already completed by the previous run
+        """
+        completed = self._load() if resume else set()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.path.open("w")
+        self._file.write(json.dumps({"templates": self.templates}) + "\n")
+        for schema, table in sorted(completed):
+            self._file.write(json.dumps({"schema": schema, "table": table}) + "\n")
+        self._file.flush()
+        return completed
+
+    def record(self, schema: str, table: str) -> None:
+        """Checkpoint a completed table."""
+        if self._file is None:
+            raise RuntimeError("Journal is not open")
+        self._file.write(json.dumps({"schema": schema, "table": table}) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the journal, keeping it on disk for a later resume."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def complete(self) -> None:
+        """Close and remove the journal once the run has finished."""
+        self.close()
+        self.path.unlink(missing_ok=True)
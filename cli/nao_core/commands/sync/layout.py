@@ -0,0 +1,308 @@
+"""Output layouts for synced table docs: per-table files or consolidated, indexed files."""
+
+from __future__ import annotations
+
+import filecmp
+import json
+import os
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+from nao_core.config.databases.base import OutputLayout
+
+from .writer import write_if_changed
+
+if TYPE_CHECKING:
+    from .cleanup import DatabaseSyncState
+
+SCHEMA_FILENAME = "tables.md"
+CATALOG_FILENAME = "catalog.md"
+
+# {schema: {table: {accessor: [offset, length]}}}, with byte offsets into the consolidated file
+SectionIndex = dict[str, dict[str, dict[str, list[int]]]]
+
+
+def layout_files(layout: str) -> tuple[str, ...]:
+    """Names of the consolidated files (and indexes) a layout writes per schema or database directory."""
+    if layout == "schema":
+        return (SCHEMA_FILENAME, get_index_path(Path(SCHEMA_FILENAME)).name)
+    if layout == "catalog":
+        return (CATALOG_FILENAME, get_index_path(Path(CATALOG_FILENAME)).name)
+    return ()
+
+
+def get_index_path(path: Path) -> Path:
+    """Get the index file of a consolidated file (e.g. tables.md -> tables.index.json)."""
+    return path.with_name(f"{path.stem}.index.json")
+
+
+def consolidated_path(layout: OutputLayout, db_path: Path, schema: str) -> Path | None:
+    """Get the consolidated file holding a schema's tables, or None for the per-table layout."""
+    if layout == "schema":
+        return db_path / f"schema={schema}" / SCHEMA_FILENAME
+    if layout == "catalog":
+        return db_path / CATALOG_FILENAME
+    return None
+
+
+def load_index(path: Path) -> SectionIndex | None:
+    """Load the section index of a consolidated file, or None if it has none."""
+    try:
+        return json.loads(get_index_path(path).read_text())["tables"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def read_section(path: Path, schema: str, table: str, accessor: str, index: SectionIndex | None = None) -> str | None:
+    """Read one table's rendered section from a consolidated file, seeking to it through the index.
+
+    Args:
+        path: The consolidated file (tables.md or catalog.md)
+        schema: The schema name
+        table: The table name
+        accessor: The accessor (template) whose output to read, e.g. "columns"
+        index: The file's already loaded index (loaded from disk when omitted)
+
+    Returns:
+        The section's content, or None if the table or accessor is not in the file
+    """
+    if index is None:
+        index = load_index(path)
+    if index is None:
+        return None
+    try:
+        offset, length = index[schema][table][accessor]
+    except (TypeError, KeyError):
+        return None
+    with path.open("rb") as f:
+        f.seek(offset)
+        return f.read(length).decode("utf-8")
+
+
+class ConsolidatedWriter:
+    """Appends table sections to one consolidated file and records their byte offsets.
+
+    Sections go to a `.partial` file (with an append-only `.partial` index) that
+    replaces the published file once complete, unless the content is identical.
+    An interrupted sync leaves the partial behind so a resumed one can carry over
+    the sections of the tables already done.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.partial_path = path.with_name(f".{path.name}.partial")
+        self.partial_index_path = path.with_name(f".{path.stem}.index.partial")
+        self.sections: SectionIndex = {}
+        self._file: IO[bytes] | None = None
+        self._index_file: IO[str] | None = None
+        self._offset = 0
+        self._published: SectionIndex | None = None
+
+    def open(self, keep: set[tuple[str, str]] | None = None) -> None:
+        """Start a new file, carrying over the sections of the `keep` tables from an interrupted run."""
+        carried = self._read_kept_sections(keep) if keep else []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.partial_path.open("wb")
+        self._index_file = self.partial_index_path.open("w")
+        for schema, table, accessor, data in carried:
+            self._append(schema, table, accessor, data)
+
+    def _read_kept_sections(self, keep: set[tuple[str, str]]) -> list[tuple[str, str, str, bytes]]:
+        # An interrupted run's partial holds the newest sections; the published file those of completed files
+        sources = [(self.partial_path, self._load_partial_index()), (self.path, load_index(self.path))]
+        carried: list[tuple[str, str, str, bytes]] = []
+        done: set[tuple[str, str]] = set()
+        for data_path, index in sources:
+            if not index:
+                continue
+            found: set[tuple[str, str]] = set()
+            try:
+                with data_path.open("rb") as f:
+                    for schema, tables in index.items():
+                        for table, sections in tables.items():
+                            if (schema, table) not in keep or (schema, table) in done:
+                                continue
+                            found.add((schema, table))
+                            for accessor, (offset, length) in sections.items():
+                                f.seek(offset)
+                                carried.append((schema, table, accessor, f.read(length)))
+            except OSError:
+                continue
+            done |= found
+        return carried
+
+    def _load_partial_index(self) -> SectionIndex:
+        index: SectionIndex = {}
+        try:
+            with self.partial_index_path.open() as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Last line may be truncated if a previous run was killed mid-write
+                        continue
+                    sections = index.setdefault(entry["schema"], {}).setdefault(entry["table"], {})
+                    sections[entry["accessor"]] = [entry["offset"], entry["length"]]
+        except OSError:
+            pass
+        return index
+
+    def published_section(self, schema: str, table: str, accessor: str) -> str | None:
+        """Read a section from the currently published file (the previous sync's output)."""
+        if self._published is None:
+            self._published = load_index(self.path) or {}
+        try:
+            return read_section(self.path, schema, table, accessor, self._published)
+        except OSError:
+            return None
+
+    def add(self, schema: str, table: str, accessor: str, content: str) -> None:
+        """Append a table's rendered section."""
+        self._append(schema, table, accessor, content.encode("utf-8"))
+
+    def _append(self, schema: str, table: str, accessor: str, data: bytes) -> None:
+        if self._file is None or self._index_file is None:
+            raise RuntimeError("Consolidated file is not open")
+        # A marker line lets grep hits be attributed to their table
+        marker = f"<!-- {schema}.{table} {accessor} -->\n".encode("utf-8")
+        offset = self._offset + len(marker)
+        self._file.write(marker + data + b"\n")
+        self._file.flush()
+        self._offset = offset + len(data) + 1
+
+        self.sections.setdefault(schema, {}).setdefault(table, {})[accessor] = [offset, len(data)]
+        entry = {"schema": schema, "table": table, "accessor": accessor, "offset": offset, "length": len(data)}
+        self._index_file.write(json.dumps(entry) + "\n")
+        self._index_file.flush()
+
+    def close(self) -> None:
+        """Close the partial file, keeping it for a later resume."""
+        for f in (self._file, self._index_file):
+            if f is not None:
+                f.close()
+        self._file = None
+        self._index_file = None
+
+    def complete(self) -> bool:
+        """Publish the file and its index once every section has been added.
+
+        Returns:
+            True if the consolidated file was written, False if it was unchanged
+        """
+        self.close()
+        written = True
+        if self.path.exists() and filecmp.cmp(self.partial_path, self.path, shallow=False):
+            self.partial_path.unlink()
+            written = False
+        else:
+            os.replace(self.partial_path, self.path)
+        index = {"file": self.path.name, "tables": self.sections}
+        write_if_changed(get_index_path(self.path), json.dumps(index, indent=1) + "\n")
+        self.partial_index_path.unlink(missing_ok=True)
+        return written
+
+
+class TableOutput:
+    """Writes rendered table docs in the per-table layout: schema=/table=/<accessor>.md."""
+
+    def __init__(self, state: DatabaseSyncState, keep: set[tuple[str, str]] | None = None):
+        self.state = state
+        self.keep = keep or set()
+
+    def start_schema(self, schema: str) -> None:
+        """Prepare the output of a schema whose tables are about to be rendered."""
+        (self.state.db_path / f"schema={schema}").mkdir(parents=True, exist_ok=True)
+
+    def write(self, schema: str, table: str, filename: str, content: str) -> bool:
+        """Write a table's rendered template output.
+
+        Returns:
+            Whether the content was written (False if an identical file was left untouched)
+        """
+        table_path = self.state.db_path / f"schema={schema}" / f"table={table}"
+        table_path.mkdir(parents=True, exist_ok=True)
+        written = write_if_changed(table_path / filename, content)
+        self.state.add_file_write(written)
+        return written
+
+    def write_skipped(self, schema: str, table: str, filename: str, content: str) -> None:
+        """Write a stub for a skipped template, keeping its output from a previous sync if there is one."""
+        output_file = self.state.db_path / f"schema={schema}" / f"table={table}" / filename
+        if not output_file.exists():
+            self.write(schema, table, filename, content)
+
+    def finish_schema(self, schema: str) -> None:
+        """Called once all tables of a schema have been rendered."""
+
+    def close(self) -> None:
+        """Release open files, keeping partial output for a resume."""
+
+    def complete(self) -> None:
+        """Publish the output once the whole database has been rendered."""
+
+
+class ConsolidatedOutput(TableOutput):
+    """Writes rendered table docs into one indexed file per schema, or one for the whole database."""
+
+    def __init__(
+        self,
+        state: DatabaseSyncState,
+        layout: OutputLayout,
+        keep: set[tuple[str, str]] | None = None,
+    ):
+        super().__init__(state, keep)
+        self.layout = layout
+        self._writers: dict[str, ConsolidatedWriter] = {}
+
+    def _writer(self, schema: str) -> ConsolidatedWriter:
+        key = schema if self.layout == "schema" else ""
+        if key not in self._writers:
+            path = consolidated_path(self.layout, self.state.db_path, schema)
+            assert path is not None
+            writer = ConsolidatedWriter(path)
+            writer.open(keep={t for t in self.keep if self.layout == "catalog" or t[0] == schema})
+            self._writers[key] = writer
+        return self._writers[key]
+
+    def start_schema(self, schema: str) -> None:
+        self._writer(schema)
+
+    def write(self, schema: str, table: str, filename: str, content: str) -> bool:
+        self._writer(schema).add(schema, table, _accessor_name(filename), content)
+        return True
+
+    def write_skipped(self, schema: str, table: str, filename: str, content: str) -> None:
+        previous = self._writer(schema).published_section(schema, table, _accessor_name(filename))
+        self.write(schema, table, filename, previous if previous is not None else content)
+
+    def finish_schema(self, schema: str) -> None:
+        if self.layout == "schema" and schema in self._writers:
+            self.state.add_file_write(self._writers.pop(schema).complete())
+
+    def close(self) -> None:
+        for writer in self._writers.values():
+            writer.close()
+
+    def complete(self) -> None:
+        for writer in self._writers.values():
+            self.state.add_file_write(writer.complete())
+        self._writers.clear()
+
+
+def _accessor_name(filename: str) -> str:
+    return filename.replace(".md", "")
+
+
+def create_output(
+    layout: OutputLayout, state: DatabaseSyncState, keep: set[tuple[str, str]] | None = None
+) -> TableOutput:
+    """Create the writer for a database's output layout.
+
+    Args:
+        layout: The database's output_layout
+        state: Sync state of the database (output root and write statistics)
+        keep: Tables done by an interrupted run whose consolidated sections are carried over
+    """
+    if layout == "tables":
+        return TableOutput(state, keep)
+    return ConsolidatedOutput(state, layout, keep)
@@ -0,0 +1,54 @@
+"""Output of `nao sync --plan`."""
+
+import json
+from typing import Any, Literal
+
+from rich.console import Console
+
+PlanFormat = Literal["text", "json"]
+
+
+def format_bytes(size: float) -> str:
+    """Format a byte count with a binary unit (e.g. 1.5 GiB)."""
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if size < 1024 or unit == "TiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} PiB"
+
+
+def print_plan(plans: dict[str, dict[str, Any]], console: Console, fmt: PlanFormat = "text") -> None:
+    """Print the plan of every provider.
+
+    Args:
+        plans: Plan per provider name, as returned by SyncProvider.plan()
+        console: Console to print the text plan to
+        fmt: `text` for a human-readable summary, `json` for raw JSON on stdout
+    """
+    if fmt == "json":
+        print(json.dumps({"providers": plans}, indent=2))
+        return
+
+    console.print("\n[bold cyan]📋 Sync plan[/bold cyan] [dim](nothing will be rendered or written)[/dim]\n")
+    for provider_name, plan in plans.items():
+        if "databases" not in plan:
+            console.print(f"  [dim]{provider_name}:[/dim] {plan['items']} items")
+            continue
+
+        console.print(f"  [dim]{provider_name}:[/dim]")
+        for db in plan["databases"]:
+            line = (
+                f"    [bold]{db['name']}[/bold] [dim]({db['type']})[/dim] — {db['tables']} tables "
+                f"in {len(db['schemas'])} schemas, {db['metadata_queries']} metadata queries, "
+                f"{db['scan_queries']} scan queries"
+            )
+            if db["estimated_bytes_scanned"] is not None:
+                line += f", ~{format_bytes(db['estimated_bytes_scanned'])} scanned"
+            console.print(line)
+            for error in db["errors"]:
+                console.print(f"      [yellow]⚠[/yellow] [dim]{error}[/dim]")
+
+        total = f"{plan['tables']} tables, {plan['metadata_queries'] + plan['scan_queries']} queries"
+        if plan["estimated_bytes_scanned"] is not None:
+            total += f", ~{format_bytes(plan['estimated_bytes_scanned'])} scanned"
+        console.print(f"    [dim]Total:[/dim] {total}")
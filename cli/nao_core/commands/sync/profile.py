@@ -0,0 +1,137 @@
+"""Structured timing profile for sync runs, exportable as JSON or Chrome trace events."""
+
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Literal
+
+ProfileFormat = Literal["json", "chrome"]
+
+
+@dataclass
+class ProfileEvent:
+    """A timed step of a sync run."""
+
+    name: str
+    """What was timed (e.g. connect, list_tables, render, query)"""
+
+    category: str
+    """Grouping for the event (e.g. database, schema, table, provider)"""
+
+    start: float
+    """Seconds since the start of the profile"""
+
+    duration: float
+    """Duration in seconds"""
+
+    args: dict[str, Any] = field(default_factory=dict)
+    """Identifying attributes (database, schema, table, accessor) and measurements (bytes, error)"""
+
+
+class SyncProfiler:
+    """Collects timing events during a sync.
+
+    Events are recorded with time.monotonic() timestamps, the same clock the
+    sync code already uses for its console timings. A disabled profiler
+    accepts the same calls and records nothing.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.events: list[ProfileEvent] = []
+        self._origin = time.monotonic()
+        self._started_at = datetime.now(timezone.utc)
+        self._lock = threading.Lock()
+
+    def record(self, name: str, category: str, start: float, end: float | None = None, **args: Any) -> None:
+        """Record an event from monotonic start/end timestamps.
+
+        Args:
+            name: What was timed
+            category: Grouping for the event
+            start: time.monotonic() when the step started
+            end: time.monotonic() when the step ended (defaults to now)
+            **args: Attributes to attach to the event; None values are dropped
+        """
+        if not self.enabled:
+            return
+        end = time.monotonic() if end is None else end
+        event = ProfileEvent(
+            name=name,
+            category=category,
+            start=start - self._origin,
+            duration=end - start,
+            args={k: v for k, v in args.items() if v is not None},
+        )
+        with self._lock:
+            self.events.append(event)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Build the structured profile: run metadata, flat events and per-database totals."""
+        databases: dict[str, dict[str, Any]] = {}
+        for event in self.events:
+            database = event.args.get("database")
+            if database is None:
+                continue
+            totals = databases.setdefault(
+                database,
+                {
+                    "connect_seconds": 0.0,
+                    "list_seconds": 0.0,
+                    "render_seconds": 0.0,
+                    "query_seconds": 0.0,
+                    "bytes_written": 0,
+                    "errors": 0,
+                },
+            )
+            if event.name == "connect":
+                totals["connect_seconds"] += event.duration
+            elif event.name in ("list_schemas", "list_tables"):
+                totals["list_seconds"] += event.duration
+            elif event.name == "render":
+                totals["render_seconds"] += event.duration
+                totals["bytes_written"] += event.args.get("bytes_written", 0)
+                totals["errors"] += 1 if "error" in event.args else 0
+            elif event.name == "query":
+                totals["query_seconds"] += event.duration
+
+        return {
+            "version": 1,
+            "started_at": self._started_at.isoformat(),
+            "duration_seconds": max((e.start + e.duration for e in self.events), default=0.0),
+            "databases": databases,
+            "events": [asdict(e) for e in self.events],
+        }
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Build a Chrome trace-event document (load in chrome://tracing or Perfetto)."""
+        lanes: dict[str, int] = {}
+        trace_events = []
+        for event in self.events:
+            lane = event.args.get("database") or event.category
+            tid = lanes.setdefault(lane, len(lanes) + 1)
+            label = "/".join(str(event.args[k]) for k in ("schema", "table", "accessor") if k in event.args)
+            trace_events.append(
+                {
+                    "name": f"{event.name} {label}".strip(),
+                    "cat": event.category,
+                    "ph": "X",
+                    "ts": round(event.start * 1_000_000),
+                    "dur": round(event.duration * 1_000_000),
+                    "pid": 1,
+                    "tid": tid,
+                    "args": event.args,
+                }
+            )
+        for lane, tid in lanes.items():
+            trace_events.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": lane}})
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path, fmt: ProfileFormat = "json") -> None:
+        """Write the profile to path in the given format."""
+        document = self.to_chrome_trace() if fmt == "chrome" else self.to_dict()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(document, indent=2, default=str))
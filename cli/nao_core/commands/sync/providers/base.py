@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from nao_core.commands.sync.profile import SyncProfiler
 from nao_core.config import NaoConfig
 
 
@@ -41,6 +42,23 @@ class SyncResult:
         )
 
 
+@dataclass
+class SyncOptions:
+    """Run-wide options passed from the sync command to every provider."""
+
+    resume: bool = False
+    """Continue an interrupted sync from its checkpoint instead of starting over"""
+
+    profiler: SyncProfiler | None = None
+    """Collects timing events for `nao sync --profile`; None when profiling is off"""
+
+    render_only: bool = False
+    """Re-render outputs from previously fetched data without contacting the source"""
+
+    repo_workers: int = 4
+    """Repositories cloned or pulled concurrently (each a git process mostly waiting on the network)"""
+
+
 class SyncProvider(ABC):
     """Abstract base class for sync providers.
 
@@ -48,6 +66,9 @@ class SyncProvider(ABC):
     (e.g., repositories, databases) from the nao configuration to local files.
     """
 
+    supports_render_only: bool = False
+    """Whether the provider can re-render from previously fetched data (`nao sync --render-only`)"""
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -79,19 +100,41 @@ class SyncProvider(ABC):
         ...
 
     @abstractmethod
-    def sync(self, items: list[Any], output_path: Path, project_path: Path | None = None) -> SyncResult:
+    def sync(
+        self,
+        items: list[Any],
+        output_path: Path,
+        project_path: Path | None = None,
+        options: SyncOptions | None = None,
+    ) -> SyncResult:
         """Sync the items to the output path.
 
         Args:
                 items: List of items to sync
                 output_path: Path where synced data should be written
                 project_path: Path to the nao project root (for template resolution)
+                options: Run-wide sync options (defaults to SyncOptions())
 
         Returns:
                 SyncResult with statistics about what was synced
         """
         ...
 
+    def plan(self, items: list[Any], project_path: Path | None = None) -> dict[str, Any]:
+        """Describe what syncing the items would do, without writing anything.
+
+        Used by `nao sync --plan`. Providers that can estimate their work in more
+        detail (e.g. warehouse queries) override this.
+
+        Args:
+                items: List of items that would be synced
+                project_path: Path to the nao project root (for template resolution)
+
+        Returns:
+                JSON-serializable plan, with at least the number of items
+        """
+        return {"items": len(items)}
+
     def should_sync(self, config: NaoConfig) -> bool:
         """Check if this provider has items to sync.
 
@@ -103,11 +146,12 @@ class SyncProvider(ABC):
         """
         return len(self.get_items(config)) > 0
 
-    def pre_sync(self, config: NaoConfig, output_path: Path) -> None:
+    def pre_sync(self, config: NaoConfig, output_path: Path, project_path: Path | None = None) -> None:
         """For preparation before sync.
 
         Args:
             config: The loaded nao configuration.
             output_path: Base directory where the preparation should be applied.
+            project_path: Path to the nao project root (where `.nao/` bookkeeping lives).
         """
         pass
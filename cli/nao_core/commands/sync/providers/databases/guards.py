@@ -0,0 +1,95 @@
+"""Timeout and circuit-breaker guards for per-table template renders."""
+
+import threading
+from typing import Callable, TypeVar
+
+from nao_core.config.databases.base import DatabaseAccessor
+
+T = TypeVar("T")
+
+# How long a timed-out render gets to stop after its query is cancelled before it is abandoned
+CANCEL_GRACE_SECONDS = 5.0
+
+# Accessors that can scan table data (preview rows) or run slow catalog lookups (descriptions).
+# These are the ones skipped once a schema's circuit breaker opens.
+EXPENSIVE_ACCESSORS = frozenset({DatabaseAccessor.PREVIEW.value, DatabaseAccessor.DESCRIPTION.value})
+
+
+class RenderTimeoutError(TimeoutError):
+    """Raised when a render does not finish within the configured timeout."""
+
+    def __init__(self, timeout: float, abandoned: bool = False):
+        super().__init__(f"timed out after {timeout:g}s")
+        self.timeout = timeout
+        self.abandoned = abandoned
+        """Whether the render was still running after the grace period (and may still be using its connection)"""
+
+
+def run_with_timeout(
+    fn: Callable[[], T],
+    timeout: float | None,
+    on_timeout: Callable[[], None] | None = None,
+    grace: float | None = None,
+) -> T:
+    """Run fn, giving up after timeout seconds.
+
+    The call runs in a daemon worker thread. If it does not finish in time,
+    on_timeout is invoked (e.g. to cancel the underlying warehouse query) and
+    the worker gets `grace` seconds to exit before RenderTimeoutError is
+    raised. A worker still running then is abandoned, and the error is marked
+    `abandoned` so the caller stops sharing the connection with it.
+
+    Args:
+        fn: Zero-argument callable to run
+        timeout: Seconds to wait, or None to run inline without a timeout
+        on_timeout: Optional callback invoked when the timeout expires
+        grace: Seconds to wait for the worker to exit after on_timeout (defaults to CANCEL_GRACE_SECONDS)
+
+    Returns:
+        The return value of fn
+    """
+    if timeout is None:
+        return fn()
+
+    results: list[T] = []
+    errors: list[BaseException] = []
+
+    def target() -> None:
+        try:
+            results.append(fn())
+        except BaseException as e:
+            errors.append(e)
+
+    worker = threading.Thread(target=target, daemon=True)
+    worker.start()
+    worker.join(timeout)
+
+    if worker.is_alive():
+        if on_timeout is not None:
+            on_timeout()
+        worker.join(CANCEL_GRACE_SECONDS if grace is None else grace)
+        raise RenderTimeoutError(timeout, abandoned=worker.is_alive())
+    if errors:
+        raise errors[0]
+    return results[0]
+
+
+class CircuitBreaker:
+    """Opens after a number of consecutive failures and stays open.
+
+    One breaker is used per schema: once open, the remaining expensive
+    accessors in that schema are skipped instead of being attempted.
+    """
+
+    def __init__(self, threshold: int | None):
+        self.threshold = threshold
+        self.consecutive_failures = 0
+        self.is_open = False
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        if self.threshold and self.consecutive_failures >= self.threshold:
+            self.is_open = True
@@ -0,0 +1,113 @@
+"""Table enumeration across schemas, pipelined with the per-table sync work."""
+
+import threading
+import time
+from collections.abc import Callable, Generator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+
+from ibis import BaseBackend
+from rich.console import Console
+
+from nao_core.config.databases.base import DatabaseConfig
+from nao_core.config.databases.governor import QueryGovernor
+
+console = Console()
+
+
+@dataclass
+class SchemaListing:
+    """Tables found in one schema (or the error that prevented listing them)."""
+
+    schema: str
+    tables: list[str]
+    start: float
+    end: float
+    error: Exception | None = None
+
+
+def _list_schema(conn: BaseBackend, schema: str, governor: QueryGovernor | None = None) -> SchemaListing:
+    start = time.monotonic()
+    try:
+        if governor is None:
+            tables = conn.list_tables(database=schema)
+        else:
+            tables = governor.run("list_tables", schema, "", partial(conn.list_tables, database=schema))
+    except Exception as e:
+        return SchemaListing(schema, [], start, time.monotonic(), error=e)
+    return SchemaListing(schema, tables, start, time.monotonic())
+
+
+def iter_schema_tables(
+    db_config: DatabaseConfig,
+    conn: BaseBackend,
+    schemas: list[str],
+    current_conn: Callable[[], BaseBackend] | None = None,
+    governor: QueryGovernor | None = None,
+) -> Generator[SchemaListing]:
+    """Yield the tables of each schema, in schema order, as soon as each listing is available.
+
+    Uses the backend's single bulk catalog query when it has one. Otherwise
+    schemas are listed concurrently by up to `db_config.list_concurrency`
+    workers (and no more than `max_concurrent_queries`), each with its own
+    connection, so the caller can start syncing the first schema while the
+    remaining ones are still being listed.
+
+    Args:
+        db_config: The database configuration
+        conn: The main connection (used for bulk and serial listing)
+        schemas: Schemas to list, in the order results should be yielded
+        current_conn: Returns the main connection when it may be replaced between
+            schemas (e.g. after a timed-out render), for serial listing
+        governor: Enforces the database's query limits on the listing queries
+    """
+    if len(schemas) > 1:
+        start = time.monotonic()
+        try:
+            list_bulk = partial(db_config.list_tables_bulk, conn, schemas)
+            bulk = list_bulk() if governor is None else governor.run("list_tables", "", "", list_bulk)
+        except Exception as e:
+            console.print(f"  [yellow]⚠[/yellow] [dim]Bulk table listing failed, listing per schema:[/dim] {e}")
+            bulk = None
+        if bulk is not None:
+            end = time.monotonic()
+            for schema in schemas:
+                yield SchemaListing(schema, bulk.get(schema, []), start, end)
+            return
+
+    workers = min(db_config.list_concurrency, len(schemas), db_config.limits.max_concurrent_queries or len(schemas))
+    if workers <= 1:
+        for schema in schemas:
+            yield _list_schema(current_conn() if current_conn is not None else conn, schema, governor)
+        return
+
+    local = threading.local()
+    worker_conns: list[BaseBackend] = []
+    lock = threading.Lock()
+
+    def list_in_worker(schema: str) -> SchemaListing:
+        worker_conn = getattr(local, "conn", None)
+        if worker_conn is None:
+            try:
+                worker_conn = db_config.connect()
+            except Exception as e:
+                now = time.monotonic()
+                return SchemaListing(schema, [], now, now, error=e)
+            local.conn = worker_conn
+            with lock:
+                worker_conns.append(worker_conn)
+        return _list_schema(worker_conn, schema, governor)
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = [executor.submit(list_in_worker, schema) for schema in schemas]
+        for future in futures:
+            yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        for worker_conn in worker_conns:
+            try:
+                worker_conn.disconnect()
+            except Exception:
+                pass
@@ -0,0 +1,143 @@
+"""Dry-run planning of a database sync: what would be listed, queried and scanned."""
+
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from ibis import BaseBackend
+
+from nao_core.config.databases.base import DatabaseConfig
+from nao_core.config.databases.context import CACHED_ACCESSORS
+from nao_core.templates.engine import TemplateEngine, get_template_engine
+
+from .listing import iter_schema_tables
+
+# Folder of the database templates
+TEMPLATE_PREFIX = "databases"
+
+# Accessors that read table data rather than catalog metadata
+SCAN_ACCESSORS = frozenset({"preview", "row_count"})
+
+
+@dataclass
+class DatabasePlan:
+    """What syncing one database would do, without rendering or writing anything."""
+
+    name: str
+    type: str
+    schemas: dict[str, int] = field(default_factory=dict)
+    """Tables that would be synced per schema (after include/exclude patterns)"""
+
+    tables: int = 0
+    metadata_queries: int = 0
+    """Catalog queries (columns, descriptions, ...) across all tables"""
+
+    scan_queries: int = 0
+    """Queries reading table data (previews, row counts) across all tables"""
+
+    estimated_bytes_scanned: int | None = None
+    """Backend estimate of bytes read by the preview scans; None if the backend can't estimate"""
+
+    errors: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _default_template_calls(template_name: str) -> set[str]:
+    """Return the accessors the built-in template of the same name calls (every cached accessor if unknown)."""
+    default_engine = get_template_engine()
+    calls = default_engine.accessor_calls(template_name) if default_engine.has_template(template_name) else None
+    if calls is None:
+        return set(CACHED_ACCESSORS)
+    return {call.name for call in calls if call.name in CACHED_ACCESSORS}
+
+
+def plan_accessor_calls(db_config: DatabaseConfig) -> set[str]:
+    """Return the DatabaseContext accessors the configured default templates would call per table."""
+    calls: set[str] = set()
+    for accessor in db_config.accessors:
+        calls.update(_default_template_calls(f"{TEMPLATE_PREFIX}/{accessor.value}.md.j2"))
+    return calls
+
+
+def template_accessor_calls(engine: TemplateEngine, templates: list[str]) -> set[str]:
+    """Return the DatabaseContext accessors the templates call per table, found by parsing them.
+
+    Templates are analyzed once per engine. When a template's calls can't be
+    determined statically (e.g. `db` is passed to a macro), the calls of the
+    default template of the same name are assumed, or every cached accessor.
+    Accessors are memoized per table, so each one costs at most one query per
+    table.
+    """
+    calls: set[str] = set()
+    for template_name in templates:
+        template_calls = engine.accessor_calls(template_name)
+        if template_calls is None:
+            calls.update(_default_template_calls(template_name))
+        else:
+            calls.update(call.name for call in template_calls if call.name in CACHED_ACCESSORS)
+    return calls
+
+
+def plan_database(db_config: DatabaseConfig, calls: set[str] | None = None) -> DatabasePlan:
+    """Resolve the schemas and tables a sync would cover and estimate its queries.
+
+    Only catalog listings (and, where supported, scan estimates such as BigQuery
+    dry runs or Trino/Athena EXPLAIN) are run against the database.
+
+    Args:
+        db_config: Database to plan
+        calls: Accessors the templates call per table (see template_accessor_calls);
+            defaults to those of the configured default templates
+    """
+    plan = DatabasePlan(name=db_config.name, type=db_config.type)
+    if calls is None:
+        calls = plan_accessor_calls(db_config)
+    scans_per_table = len(calls & SCAN_ACCESSORS)
+    estimate_scans = "preview" in calls
+
+    try:
+        conn = db_config.connect()
+    except Exception as e:
+        plan.errors.append(f"{type(e).__name__}: {e}")
+        return plan
+    try:
+        _plan_tables(plan, db_config, conn, estimate_scans)
+    finally:
+        try:
+            conn.disconnect()
+        except Exception:
+            pass
+
+    plan.metadata_queries = plan.tables * (len(calls) - scans_per_table)
+    plan.scan_queries = plan.tables * scans_per_table
+    return plan
+
+
+def _plan_tables(plan: DatabasePlan, db_config: DatabaseConfig, conn: BaseBackend, estimate_scans: bool) -> None:
+    """Count the tables a sync would cover, and sum their scan estimates when estimate_scans is set."""
+    try:
+        schemas = db_config.get_schemas(conn)
+    except Exception as e:
+        plan.errors.append(f"{type(e).__name__}: {e}")
+        return
+
+    for listing in iter_schema_tables(db_config, conn, schemas):
+        if listing.error is not None:
+            plan.errors.append(f"{listing.schema}: {type(listing.error).__name__}: {listing.error}")
+            continue
+
+        tables = [t for t in listing.tables if db_config.matches_pattern(listing.schema, t)]
+        plan.schemas[listing.schema] = len(tables)
+        plan.tables += len(tables)
+
+        if not estimate_scans:
+            continue
+        for table in tables:
+            try:
+                estimate = db_config.estimate_scan_bytes(conn, listing.schema, table)
+            except Exception as e:
+                plan.errors.append(f"{listing.schema}.{table}: {type(e).__name__}: {e}")
+                continue
+            if estimate is not None:
+                plan.estimated_bytes_scanned = (plan.estimated_bytes_scanned or 0) + estimate
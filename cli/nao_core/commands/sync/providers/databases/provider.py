@@ -1,6 +1,7 @@
 """Database sync provider implementation."""
 
 import time
+from functools import partial
 from pathlib import Path
 from typing import Any
 
@@ -15,16 +16,45 @@ from rich.progress import (
     TimeElapsedColumn,
 )
 
-from nao_core.commands.sync.cleanup import DatabaseSyncState, cleanup_stale_databases, cleanup_stale_paths
+from nao_core.commands.sync.cleanup import (
+    DatabaseSyncState,
+    cleanup_stale_databases,
+    cleanup_stale_paths,
+    get_trash_dir,
+    mark_manifest_incomplete,
+)
+from nao_core.commands.sync.journal import (
+    JOURNAL_FILENAME,
+    SyncJournal,
+    get_database_state_dir,
+)
+from nao_core.commands.sync.layout import TableOutput, create_output
+from nao_core.commands.sync.profile import SyncProfiler
 from nao_core.config import AnyDatabaseConfig, NaoConfig
 from nao_core.config.databases.base import DatabaseConfig
+from nao_core.config.databases.context import DatabaseContext
+from nao_core.config.databases.governor import QueryBudgetExceededError, QueryGovernor
+from nao_core.config.databases.retry import RetryPolicy, call_with_retry
 from nao_core.templates.engine import get_template_engine
 
-from ..base import SyncProvider, SyncResult
+from ..base import SyncOptions, SyncProvider, SyncResult
+from .guards import (
+    EXPENSIVE_ACCESSORS,
+    CircuitBreaker,
+    RenderTimeoutError,
+    run_with_timeout,
+)
+from .listing import iter_schema_tables
+from .plan import TEMPLATE_PREFIX, plan_database, template_accessor_calls
+from .snapshot import SNAPSHOT_FILENAME, SnapshotDatabaseContext, SnapshotWriter, load_snapshot
 
 console = Console()
 
-TEMPLATE_PREFIX = "databases"
+# Renders slower than this are reported inline as they happen
+SLOW_RENDER_WARNING_SECONDS = 5
+
+# Renders slower than this are listed in the end-of-sync slowest objects report
+SLOW_RENDER_REPORT_SECONDS = 1
 
 
 def _filter_templates_by_accessor(templates: list[str], db_config: DatabaseConfig) -> list[str]:
@@ -44,29 +74,74 @@ def _fmt_duration(seconds: float) -> str:
     return f"{minutes}m{secs:.0f}s"
 
 
+def _describe_error(error: BaseException) -> str:
+    """Format an exception as a short cause for profiles."""
+    return f"{type(error).__name__}: {error}"
+
+
 def sync_database(
     db_config: DatabaseConfig,
     base_path: Path,
     progress: Progress,
     project_path: Path | None = None,
+    resume: bool = False,
+    profiler: SyncProfiler | None = None,
 ) -> DatabaseSyncState:
-    """Sync a single database by rendering all database templates for each table."""
+    """Sync a single database by rendering all database templates for each table.
+
+    Completed tables are checkpointed to a journal so that an interrupted sync
+    can be continued with `resume=True` instead of starting from zero.
+    Timings are recorded on `profiler` when one is given.
+    """
+    profiler = profiler or SyncProfiler(enabled=False)
     engine = get_template_engine(project_path)
     templates = _filter_templates_by_accessor(engine.list_templates(TEMPLATE_PREFIX), db_config)
 
     t_connect = time.monotonic()
     conn = db_config.connect()
+    profiler.record("connect", "database", t_connect, database=db_config.name)
     console.print(
         f"  [dim]Connected to[/dim] [bold]{db_config.name}[/bold] "
         f"[dim]({_fmt_duration(time.monotonic() - t_connect)})[/dim]"
     )
 
+    governor = None
+    if db_config.limits.enabled:
+        # Reads `conn` at call time, as it is replaced when a timed-out render keeps the old one busy
+        governor = QueryGovernor(
+            db_config.limits,
+            estimate_scan_bytes=lambda schema, table: db_config.estimate_scan_bytes(conn, schema, table),
+        )
+
+    retry_policy = RetryPolicy(max_retries=db_config.max_retries)
+    # Accessors the templates actually call, so batch prefetching skips everything else
+    template_calls = template_accessor_calls(engine, templates)
+
     db_name = db_config.get_database_name()
     db_path = base_path / f"type={db_config.type}" / f"database={db_name}"
-    state = DatabaseSyncState(db_path=db_path)
+    state_dir = get_database_state_dir(db_path, base_path, project_path)
+    state = DatabaseSyncState(
+        db_path=db_path,
+        state_dir=state_dir,
+        trash_dir=get_trash_dir(base_path, project_path),
+        output_layout=db_config.output_layout,
+    )
+
+    # Until this sync completes, its tables are only on disk, not in the manifest
+    mark_manifest_incomplete(state)
+    journal = SyncJournal(state_dir / JOURNAL_FILENAME, templates)
+    already_synced = journal.open(resume=resume)
+    output = create_output(db_config.output_layout, state, keep=already_synced)
+    snapshot = SnapshotWriter(state_dir / SNAPSHOT_FILENAME)
+    snapshot.open(keep=already_synced)
+    if already_synced:
+        console.print(
+            f"  [dim]Resuming from checkpoint:[/dim] [bold]{len(already_synced)}[/bold] [dim]tables done[/dim]"
+        )
 
     t_schemas = time.monotonic()
     schemas = db_config.get_schemas(conn)
+    profiler.record("list_schemas", "database", t_schemas, database=db_config.name, schemas=len(schemas))
     console.print(
         f"  [dim]Found[/dim] [bold]{len(schemas)}[/bold] "
         f"[dim]schemas ({_fmt_duration(time.monotonic() - t_schemas)})[/dim]"
@@ -79,101 +154,357 @@ def sync_database(
 
     total_errors = 0
 
-    for schema in schemas:
-        try:
-            t_list = time.monotonic()
-            all_tables = conn.list_tables(database=schema)
-        except Exception as e:
-            console.print(f"  [yellow]⚠[/yellow] [dim]Skipping schema[/dim] {schema}: {e}")
-            progress.update(schema_task, advance=1)
-            continue
+    try:
+        for listing in iter_schema_tables(db_config, conn, schemas, current_conn=lambda: conn, governor=governor):
+            schema = listing.schema
+            if listing.error is not None:
+                profiler.record(
+                    "list_tables",
+                    "schema",
+                    listing.start,
+                    listing.end,
+                    database=db_config.name,
+                    schema=schema,
+                    error=_describe_error(listing.error),
+                )
+                console.print(f"  [yellow]⚠[/yellow] [dim]Skipping schema[/dim] {schema}: {listing.error}")
+                progress.update(schema_task, advance=1)
+                continue
+
+            profiler.record("list_tables", "schema", listing.start, listing.end, database=db_config.name, schema=schema)
+            all_tables = listing.tables
+            tables = [t for t in all_tables if db_config.matches_pattern(schema, t)]
+
+            if not tables:
+                progress.update(schema_task, advance=1)
+                continue
+
+            list_dur = _fmt_duration(listing.end - listing.start)
+            console.print(
+                f"  [cyan]▸ {schema}[/cyan] [dim]— {len(tables)} tables "
+                f"(of {len(all_tables)} total, listed in {list_dur})[/dim]"
+            )
+
+            output.start_schema(schema)
+            state.add_schema(schema)
 
-        tables = [t for t in all_tables if db_config.matches_pattern(schema, t)]
+            table_task = progress.add_task(
+                f"    [cyan]{schema}[/cyan]",
+                total=len(tables),
+            )
+
+            schema_errors = 0
+            schema_start = time.monotonic()
+            breaker = CircuitBreaker(db_config.max_consecutive_failures)
+            prefetched = _prefetch_schema(
+                db_config,
+                conn,
+                schema,
+                [t for t in tables if (schema, t) not in already_synced],
+                template_calls,
+                governor,
+            )
+
+            for table in tables:
+                if (schema, table) in already_synced:
+                    state.add_resumed_table(schema, table)
+                    progress.update(table_task, advance=1)
+                    continue
+
+                progress.update(
+                    table_task,
+                    description=f"    [cyan]{schema}[/cyan] [dim]→ {table}[/dim]",
+                )
+
+                ctx = _create_table_context(
+                    db_config, conn, schema, table, governor, retry_policy, prefetched.get(table, {})
+                )
+
+                table_skipped = False
+                for template_name in templates:
+                    output_filename = Path(template_name).stem
+                    accessor_name = output_filename.replace(".md", "")
+
+                    budget_exhausted = governor is not None and governor.budget_exhausted
+                    if accessor_name in EXPENSIVE_ACCESSORS and (breaker.is_open or budget_exhausted):
+                        table_skipped = True
+                        reason = (
+                            f"too many consecutive failures in schema {schema}"
+                            if breaker.is_open
+                            else "max_bytes_scanned budget reached"
+                        )
+                        _write_skipped(output, schema, table, output_filename, reason)
+                        continue
+
+                    t_render = time.monotonic()
+                    error = None
+                    try:
+                        content = run_with_timeout(
+                            partial(engine.render, template_name, db=ctx, table_name=table, dataset=schema),
+                            db_config.query_timeout,
+                            on_timeout=ctx.cancel,
+                        )
+                        render_dur = time.monotonic() - t_render
+                        breaker.record_success()
+                        if render_dur > SLOW_RENDER_WARNING_SECONDS:
+                            console.print(
+                                f"    [yellow]⏱[/yellow] [dim]{schema}.{table}[/dim] "
+                                f"[yellow]{accessor_name}[/yellow] [dim]took {_fmt_duration(render_dur)}[/dim]"
+                            )
+                    except QueryBudgetExceededError as e:
+                        table_skipped = True
+                        console.print(
+                            f"    [yellow]⚠[/yellow] [dim]{schema}.{table} {accessor_name} skipped:[/dim] {e}"
+                        )
+                        _write_skipped(output, schema, table, output_filename, "max_bytes_scanned budget reached")
+                        continue
+                    except Exception as e:
+                        render_dur = time.monotonic() - t_render
+                        error = _describe_error(e)
+                        schema_errors += 1
+                        total_errors += 1
+                        if isinstance(e, RenderTimeoutError):
+                            state.timeouts += 1
+                            if e.abandoned:
+                                # The render is still running on the connection, which is not safe to share:
+                                # leave both to it and continue on a new connection
+                                console.print(
+                                    f"    [yellow]⚠[/yellow] [dim]{schema}.{table} {accessor_name} did not stop "
+                                    "after its query was cancelled, reconnecting[/dim]"
+                                )
+                                conn = db_config.connect()
+                            # The cancelled context refuses further queries; the table's next templates get a new one
+                            state.add_cache_stats(ctx.cache_hits, ctx.cache_misses)
+                            state.query_retries += ctx.retries
+                            ctx = _create_table_context(
+                                db_config, conn, schema, table, governor, retry_policy, prefetched.get(table, {})
+                            )
+                        console.print(
+                            f"    [bold red]✗[/bold red] [dim]{schema}.{table}[/dim] "
+                            f"[red]{accessor_name}[/red] [dim]failed after "
+                            f"{_fmt_duration(render_dur)}:[/dim] {e}"
+                        )
+                        content = f"# {table}\n\nError generating content: {e}"
+
+                        was_open = breaker.is_open
+                        breaker.record_failure()
+                        if breaker.is_open and not was_open:
+                            console.print(
+                                f"    [yellow]⚠[/yellow] [dim]{breaker.consecutive_failures} consecutive failures "
+                                f"in[/dim] {schema}[dim], skipping {', '.join(sorted(EXPENSIVE_ACCESSORS))} "
+                                f"for its remaining tables[/dim]"
+                            )
+
+                    state.add_render_timing(schema, table, accessor_name, render_dur)
+                    written = output.write(schema, table, output_filename, content)
+                    profiler.record(
+                        "render",
+                        "table",
+                        t_render,
+                        t_render + render_dur,
+                        database=db_config.name,
+                        schema=schema,
+                        table=table,
+                        accessor=accessor_name,
+                        bytes_written=len(content.encode("utf-8")) if written else 0,
+                        error=error,
+                    )
+
+                if table_skipped:
+                    state.add_skipped_table(schema, table)
+                for query_name, q_start, q_end in ctx.query_timings:
+                    profiler.record(
+                        "query",
+                        "table",
+                        q_start,
+                        q_end,
+                        database=db_config.name,
+                        schema=schema,
+                        table=table,
+                        accessor=query_name,
+                    )
+
+                snapshot.record(schema, table, ctx.fetched)
+                journal.record(schema, table)
+                state.add_table(schema, table)
+                state.add_cache_stats(ctx.cache_hits, ctx.cache_misses)
+                state.query_retries += ctx.retries
+                progress.update(table_task, advance=1)
+
+            output.finish_schema(schema)
+            progress.update(
+                table_task,
+                description=f"    [cyan]{schema}[/cyan]",
+            )
+            schema_dur = _fmt_duration(time.monotonic() - schema_start)
+            error_suffix = f" [red]({schema_errors} errors)[/red]" if schema_errors else ""
+            console.print(
+                f"  [green]✓ {schema}[/green] [dim]— {len(tables)} tables synced in {schema_dur}{error_suffix}[/dim]"
+            )
 
-        if not tables:
             progress.update(schema_task, advance=1)
-            continue
+    finally:
+        output.close()
+        snapshot.close()
+        journal.close()
+
+    output.complete()
+    snapshot.complete()
+    journal.complete()
+    state.completed = True
+    if governor is not None:
+        state.throttled_queries = governor.throttled
+        state.bytes_scanned = governor.bytes_scanned
+        budget = db_config.limits.max_bytes_scanned
+        budget_note = f", ~{state.bytes_scanned:,} of {budget:,} bytes scanned" if budget else ""
+        console.print(f"  [dim]Query limits: {governor.throttled} throttled queries retried{budget_note}[/dim]")
 
-        list_dur = _fmt_duration(time.monotonic() - t_list)
+    if total_errors:
+        console.print(f"  [yellow]⚠ {total_errors} total errors during sync[/yellow]")
+
+    if state.query_retries:
+        console.print(f"  [dim]Retried {state.query_retries} queries after transient errors[/dim]")
+
+    if state.cache_hits or state.cache_misses:
         console.print(
-            f"  [cyan]▸ {schema}[/cyan] [dim]— {len(tables)} tables "
-            f"(of {len(all_tables)} total, listed in {list_dur})[/dim]"
+            f"  [dim]Accessor cache: {state.cache_misses} queries, {state.cache_hits} served from cache[/dim]"
         )
 
-        schema_path = db_path / f"schema={schema}"
-        schema_path.mkdir(parents=True, exist_ok=True)
-        state.add_schema(schema)
+    _print_slow_objects(state)
 
-        table_task = progress.add_task(
-            f"    [cyan]{schema}[/cyan]",
-            total=len(tables),
-        )
+    return state
 
-        schema_errors = 0
-        schema_start = time.monotonic()
 
-        for table in tables:
-            table_path = schema_path / f"table={table}"
-            table_path.mkdir(parents=True, exist_ok=True)
+def render_database_snapshot(
+    db_config: DatabaseConfig,
+    base_path: Path,
+    progress: Progress,
+    project_path: Path | None = None,
+) -> DatabaseSyncState:
+    """Re-render a database's templates from the metadata snapshot of its last sync.
 
-            progress.update(
-                table_task,
-                description=f"    [cyan]{schema}[/cyan] [dim]→ {table}[/dim]",
-            )
+    No connection is made: every accessor call is answered from the snapshot,
+    so template changes can be applied in seconds. Accessor calls the snapshot
+    has no result for render as errors.
+    """
+    engine = get_template_engine(project_path)
+    templates = _filter_templates_by_accessor(engine.list_templates(TEMPLATE_PREFIX), db_config)
 
-            ctx = db_config.create_context(conn, schema, table)
+    db_path = base_path / f"type={db_config.type}" / f"database={db_config.get_database_name()}"
+    state_dir = get_database_state_dir(db_path, base_path, project_path)
+    state = DatabaseSyncState(db_path=db_path, state_dir=state_dir)
+    snapshot_path = state_dir / SNAPSHOT_FILENAME
+    if not snapshot_path.exists():
+        raise FileNotFoundError(f"No metadata snapshot for {db_config.name}; run `nao sync` first")
+
+    tables = {key: results for key, results in load_snapshot(snapshot_path).items() if db_config.matches_pattern(*key)}
+    task = progress.add_task(f"[dim]{db_config.name}[/dim] [dim](from snapshot)[/dim]", total=len(tables))
+    output = create_output(db_config.output_layout, state)
+    errors = 0
+    current_schema: str | None = None
+
+    try:
+        for (schema, table), results in sorted(tables.items()):
+            if schema != current_schema:
+                if current_schema is not None:
+                    output.finish_schema(current_schema)
+                output.start_schema(schema)
+                state.add_schema(schema)
+                current_schema = schema
+            ctx = SnapshotDatabaseContext(schema, table, results)
 
             for template_name in templates:
-                output_filename = Path(template_name).stem
-                accessor_name = output_filename.replace(".md", "")
-
-                t_render = time.monotonic()
                 try:
                     content = engine.render(template_name, db=ctx, table_name=table, dataset=schema)
-                    render_dur = time.monotonic() - t_render
-                    if render_dur > 5:
-                        console.print(
-                            f"    [yellow]⏱[/yellow] [dim]{schema}.{table}[/dim] "
-                            f"[yellow]{accessor_name}[/yellow] [dim]took {_fmt_duration(render_dur)}[/dim]"
-                        )
                 except Exception as e:
-                    render_dur = time.monotonic() - t_render
-                    schema_errors += 1
-                    total_errors += 1
-                    console.print(
-                        f"    [bold red]✗[/bold red] [dim]{schema}.{table}[/dim] "
-                        f"[red]{accessor_name}[/red] [dim]failed after "
-                        f"{_fmt_duration(render_dur)}:[/dim] {e}"
-                    )
+                    errors += 1
                     content = f"# {table}\n\nError generating content: {e}"
-
-                output_file = table_path / output_filename
-                output_file.write_text(content)
+                output.write(schema, table, Path(template_name).stem, content)
 
             state.add_table(schema, table)
-            progress.update(table_task, advance=1)
+            progress.update(task, advance=1)
+        if current_schema is not None:
+            output.finish_schema(current_schema)
+    finally:
+        output.close()
+    output.complete()
+
+    if errors:
+        console.print(f"  [yellow]⚠ {errors} templates could not be rendered from the snapshot[/yellow]")
+    return state
 
-        progress.update(
-            table_task,
-            description=f"    [cyan]{schema}[/cyan]",
-        )
-        schema_dur = _fmt_duration(time.monotonic() - schema_start)
-        error_suffix = f" [red]({schema_errors} errors)[/red]" if schema_errors else ""
-        console.print(
-            f"  [green]✓ {schema}[/green] [dim]— {len(tables)} tables synced in {schema_dur}{error_suffix}[/dim]"
+
+def _create_table_context(
+    db_config: DatabaseConfig,
+    conn: Any,
+    schema: str,
+    table: str,
+    governor: QueryGovernor | None,
+    retry_policy: RetryPolicy,
+    prefetched: dict[str, Any],
+) -> DatabaseContext:
+    """Create a table's template context, seeded with its batch-prefetched accessor results."""
+    ctx = db_config.create_context(conn, schema, table)
+    ctx.preview_max_columns = db_config.preview_max_columns
+    ctx.preview_max_chars = db_config.preview_max_chars
+    ctx.governor = governor
+    ctx.retry_policy = retry_policy
+    for accessor, result in prefetched.items():
+        ctx.seed(accessor, result)
+    return ctx
+
+
+def _prefetch_schema(
+    db_config: DatabaseConfig,
+    conn: Any,
+    schema: str,
+    tables: list[str],
+    accessors: set[str],
+    governor: QueryGovernor | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Batch-fetch the accessor results of a schema's tables, falling back to per-table queries on failure."""
+    if not tables or not accessors:
+        return {}
+    prefetch = partial(db_config.prefetch_schema, conn, schema, tables, accessors)
+    if governor is not None:
+        prefetch = partial(governor.run, "prefetch", schema, "", prefetch)
+    try:
+        # The governor retries throttled queries itself; only transient errors are retried here
+        return call_with_retry(
+            prefetch, RetryPolicy(max_retries=db_config.max_retries), retry_throttling=governor is None
         )
+    except Exception as e:
+        console.print(f"  [yellow]⚠[/yellow] [dim]Batch metadata query failed for[/dim] {schema}: {e}")
+        return {}
 
-        progress.update(schema_task, advance=1)
 
-    if total_errors:
-        console.print(f"  [yellow]⚠ {total_errors} total errors during sync[/yellow]")
+def _write_skipped(output: TableOutput, schema: str, table: str, filename: str, reason: str) -> None:
+    """Write a stub for a skipped accessor, keeping content from a previous sync if there is one."""
+    output.write_skipped(schema, table, filename, f"# {table}\n\nSkipped: {reason}\n")
 
-    return state
+
+def _print_slow_objects(state: DatabaseSyncState) -> None:
+    """Print the slowest renders and the tables skipped by the circuit breaker."""
+    slowest = [entry for entry in sorted(state.slowest_renders, reverse=True) if entry[0] >= SLOW_RENDER_REPORT_SECONDS]
+    if slowest:
+        console.print("  [dim]Slowest objects:[/dim]")
+        for seconds, name, accessor in slowest:
+            console.print(f"    [dim]{_fmt_duration(seconds):>6}[/dim] {name} [dim]({accessor})[/dim]")
+
+    if state.skipped_tables:
+        console.print(
+            f"  [yellow]⚠ {len(state.skipped_tables)} tables had expensive accessors skipped.[/yellow] "
+            "[dim]Add them to `exclude` in nao_config.yaml to skip them permanently:[/dim]"
+        )
+        for name in state.skipped_tables:
+            console.print(f"    [dim]-[/dim] {name}")
 
 
 class DatabaseSyncProvider(SyncProvider):
     """Provider for syncing database schemas to markdown documentation."""
 
+    supports_render_only = True
+
     @property
     def name(self) -> str:
         return "Databases"
@@ -186,13 +517,37 @@ class DatabaseSyncProvider(SyncProvider):
     def default_output_dir(self) -> str:
         return "databases"
 
-    def pre_sync(self, config: NaoConfig, output_path: Path) -> None:
-        cleanup_stale_databases(config.databases, output_path, verbose=True)
+    def pre_sync(self, config: NaoConfig, output_path: Path, project_path: Path | None = None) -> None:
+        trash_dir = get_trash_dir(output_path, project_path)
+        cleanup_stale_databases(config.databases, output_path, verbose=True, trash_dir=trash_dir)
 
     def get_items(self, config: NaoConfig) -> list[AnyDatabaseConfig]:
         return config.databases
 
-    def sync(self, items: list[Any], output_path: Path, project_path: Path | None = None) -> SyncResult:
+    def plan(self, items: list[Any], project_path: Path | None = None) -> dict[str, Any]:
+        engine = get_template_engine(project_path)
+        plans = []
+        for db in items:
+            templates = _filter_templates_by_accessor(engine.list_templates(TEMPLATE_PREFIX), db)
+            plans.append(plan_database(db, template_accessor_calls(engine, templates)))
+        estimates = [p.estimated_bytes_scanned for p in plans if p.estimated_bytes_scanned is not None]
+        return {
+            "items": len(items),
+            "tables": sum(p.tables for p in plans),
+            "metadata_queries": sum(p.metadata_queries for p in plans),
+            "scan_queries": sum(p.scan_queries for p in plans),
+            "estimated_bytes_scanned": sum(estimates) if estimates else None,
+            "databases": [p.to_dict() for p in plans],
+        }
+
+    def sync(
+        self,
+        items: list[Any],
+        output_path: Path,
+        project_path: Path | None = None,
+        options: SyncOptions | None = None,
+    ) -> SyncResult:
+        options = options or SyncOptions()
         if not items:
             console.print("\n[dim]No databases configured[/dim]")
             return SyncResult(provider_name=self.name, items_synced=0)
@@ -200,6 +555,15 @@ class DatabaseSyncProvider(SyncProvider):
         total_datasets = 0
         total_tables = 0
         total_removed = 0
+        total_written = 0
+        total_unchanged = 0
+        total_resumed = 0
+        total_timeouts = 0
+        total_throttled = 0
+        total_retries = 0
+        skipped_tables: list[str] = []
+        total_cache_hits = 0
+        total_cache_misses = 0
         sync_states: list[DatabaseSyncState] = []
 
         console.print(f"\n[bold cyan]{self.emoji}  Syncing {self.name}[/bold cyan]")
@@ -224,19 +588,47 @@ class DatabaseSyncProvider(SyncProvider):
         ) as progress:
             for db in items:
                 try:
-                    state = sync_database(db, output_path, progress, project_path)
+                    if options.render_only:
+                        state = render_database_snapshot(db, output_path, progress, project_path)
+                    else:
+                        state = sync_database(
+                            db,
+                            output_path,
+                            progress,
+                            project_path,
+                            resume=options.resume,
+                            profiler=options.profiler,
+                        )
                     sync_states.append(state)
                     total_datasets += state.schemas_synced
                     total_tables += state.tables_synced
+                    total_resumed += state.tables_resumed
+                    total_timeouts += state.timeouts
+                    total_throttled += state.throttled_queries
+                    total_retries += state.query_retries
+                    skipped_tables.extend(state.skipped_tables)
+                    total_written += state.files_written
+                    total_unchanged += state.files_unchanged
+                    total_cache_hits += state.cache_hits
+                    total_cache_misses += state.cache_misses
                 except Exception as e:
                     console.print(f"[bold red]✗[/bold red] Failed to sync {db.name}: {e}")
 
+        # Only prune stale paths for databases that synced fully; partial runs keep their journal
         for state in sync_states:
+            if not state.completed:
+                continue
             removed = cleanup_stale_paths(state, verbose=True)
             total_removed += removed
 
         total_dur = _fmt_duration(time.monotonic() - sync_start)
         summary = f"{total_tables} tables across {total_datasets} datasets in {total_dur}"
+        if options.render_only:
+            summary += " (rendered from snapshot)"
+        if total_resumed > 0:
+            summary += f" ({total_resumed} resumed from checkpoint)"
+        if total_unchanged > 0:
+            summary += f", {total_written} files written ({total_unchanged} unchanged)"
         if total_removed > 0:
             summary += f", {total_removed} stale removed"
 
@@ -246,7 +638,16 @@ class DatabaseSyncProvider(SyncProvider):
             details={
                 "datasets": total_datasets,
                 "tables": total_tables,
+                "resumed": total_resumed,
+                "written": total_written,
+                "unchanged": total_unchanged,
                 "removed": total_removed,
+                "cache_hits": total_cache_hits,
+                "cache_misses": total_cache_misses,
+                "timeouts": total_timeouts,
+                "throttled": total_throttled,
+                "retries": total_retries,
+                "skipped": skipped_tables,
             },
             summary=summary,
         )
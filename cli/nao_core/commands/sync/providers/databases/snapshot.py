@@ -0,0 +1,122 @@
+"""On-disk snapshot of fetched table metadata, for re-rendering without the warehouse."""
+
+import json
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any
+
+from nao_core.config.databases.context import DatabaseContext
+
+SNAPSHOT_FILENAME = "snapshot.jsonl"
+
+
+class SnapshotMissError(LookupError):
+    """Raised when a template calls an accessor the snapshot has no result for."""
+
+
+def _json_default(value: Any) -> Any:
+    # numpy scalars (e.g. row counts) expose .item(); anything else is stored as text
+    item = getattr(value, "item", None)
+    if callable(item):
+        return item()
+    return str(value)
+
+
+def _encode(schema: str, table: str, fetched: dict[tuple[str, tuple], Any]) -> str:
+    calls = [{"accessor": accessor, "args": dict(args), "value": value} for (accessor, args), value in fetched.items()]
+    return json.dumps({"schema": schema, "table": table, "calls": calls}, default=_json_default) + "\n"
+
+
+def _read_entries(path: Path) -> Iterator[dict[str, Any]]:
+    with path.open() as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # Last line may be truncated if a previous run was killed mid-write
+                continue
+
+
+class SnapshotWriter:
+    """Writes one JSON line of accessor results per synced table.
+
+    Lines go to a `.partial` file that replaces the snapshot once the sync
+    completes, so an interrupted sync never leaves a half-written snapshot
+    behind (and a resumed one keeps the entries of the tables already done).
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.partial_path = path.with_name(path.name + ".partial")
+        self._file: IO[str] | None = None
+
+    def open(self, keep: set[tuple[str, str]] | None = None) -> None:
+        """Start a new snapshot, carrying over the entries of the `keep` tables from an interrupted run."""
+        kept: list[str] = []
+        if keep and self.partial_path.exists():
+            for entry in _read_entries(self.partial_path):
+                if (entry["schema"], entry["table"]) in keep:
+                    kept.append(json.dumps(entry) + "\n")
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.partial_path.open("w")
+        self._file.writelines(kept)
+        self._file.flush()
+
+    def record(self, schema: str, table: str, fetched: dict[tuple[str, tuple], Any]) -> None:
+        """Append the accessor results fetched for a table."""
+        if self._file is None:
+            raise RuntimeError("Snapshot is not open")
+        self._file.write(_encode(schema, table, fetched))
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the partial snapshot, keeping it for a later resume."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def complete(self) -> None:
+        """Close and publish the snapshot once the sync has finished."""
+        self.close()
+        if self.partial_path.exists():
+            os.replace(self.partial_path, self.path)
+
+
+def load_snapshot(path: Path) -> dict[tuple[str, str], dict[tuple[str, tuple], Any]]:
+    """Load a snapshot as {(schema, table): {(accessor, args): value}}.
+
+    Raises:
+        FileNotFoundError: If no snapshot has been written yet
+    """
+    tables: dict[tuple[str, str], dict[tuple[str, tuple], Any]] = {}
+    for entry in _read_entries(path):
+        tables[(entry["schema"], entry["table"])] = {
+            (call["accessor"], tuple(call["args"].items())): call["value"] for call in entry["calls"]
+        }
+    return tables
+
+
+class SnapshotDatabaseContext(DatabaseContext):
+    """DatabaseContext that answers accessor calls from a snapshot instead of the warehouse."""
+
+    def __init__(self, schema: str, table_name: str, results: dict[tuple[str, tuple], Any]):
+        super().__init__(None, schema, table_name)  # type: ignore
+        self._results = results
+
+    def _run_query(self, accessor: str, args: tuple, query: Any) -> Any:
+        try:
+            return self._results[(accessor, args)]
+        except KeyError:
+            call = f"{accessor}({', '.join(f'{name}={value!r}' for name, value in args)})"
+            raise SnapshotMissError(
+                f"{call} is not in the metadata snapshot; run `nao sync` without --render-only to fetch it"
+            ) from None
+
+    @property
+    def table(self):
+        raise SnapshotMissError("the table object is not available when rendering from a snapshot")
+
+    def cancel(self) -> None:
+        pass
@@ -0,0 +1,152 @@
+"""On-disk cache of exported Notion pages, shared by the sync and template rendering."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+from nao_core.commands.sync.writer import write_if_changed
+
+from .client import NotionSession
+from .manifest import EDIT_TIME_PRECISION, parse_notion_time, utc_now
+
+# Pages younger than this are used without asking Notion whether they changed
+DEFAULT_PAGE_CACHE_TTL = 3600
+
+
+def get_notion_cache_dir(project_path: Path) -> Path:
+    """Get the directory of the Notion page cache (under the project's `.nao/`)."""
+    return project_path / ".nao" / "cache" / "notion"
+
+
+@dataclass
+class CachedPage:
+    """An exported page."""
+
+    id: str
+    title: str
+
+    content: str
+    """Page content as markdown (images stripped, without frontmatter)"""
+
+    last_edited_time: str
+    """Notion's last_edited_time of the page when it was exported"""
+
+    exported_at: str
+    """When the content was exported"""
+
+    checked_at: str
+    """When the page was last confirmed unchanged (or exported)"""
+
+    links: list[str] | None = None
+    """Child pages and databases of the page (None if not recorded)"""
+
+    def is_current(self, last_edited_time: str | None) -> bool:
+        """Check whether the page, last edited at `last_edited_time`, still has this content.
+
+        The export must have happened long enough after the edit for the
+        minute-precision timestamp to rule out later edits.
+        """
+        if not last_edited_time or last_edited_time != self.last_edited_time:
+            return False
+        try:
+            return parse_notion_time(self.exported_at) - parse_notion_time(last_edited_time) >= EDIT_TIME_PRECISION
+        except ValueError:
+            return False
+
+
+class NotionPageCache:
+    """Exported pages by page ID, one JSON file each.
+
+    Entries checked within `ttl` seconds are served as is. Older ones are
+    revalidated with a metadata call and only exported again when the page
+    was edited.
+    """
+
+    def __init__(self, directory: Path, ttl: float = DEFAULT_PAGE_CACHE_TTL):
+        self.directory = directory
+        self.ttl = ttl
+
+    def _path(self, page_id: str) -> Path:
+        return self.directory / f"{page_id}.json"
+
+    def get(self, page_id: str) -> CachedPage | None:
+        """Get a cached page, however old."""
+        try:
+            return CachedPage(**json.loads(self._path(page_id).read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def put(self, page: CachedPage) -> None:
+        """Store a page."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_if_changed(self._path(page.id), json.dumps(asdict(page), indent=1) + "\n")
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        """Check whether a page was checked recently enough to be used without revalidation."""
+        try:
+            age = datetime.now(timezone.utc) - parse_notion_time(page.checked_at)
+        except ValueError:
+            return False
+        return age < timedelta(seconds=self.ttl)
+
+    def revalidate(self, page_id: str, last_edited_time: str | None) -> CachedPage | None:
+        """Return the cached page if it is still current, marking it as checked now."""
+        page = self.get(page_id)
+        if page is None or not page.is_current(last_edited_time):
+            return None
+        page.checked_at = utc_now()
+        self.put(page)
+        return page
+
+    def store(
+        self,
+        page_id: str,
+        title: str,
+        content: str,
+        last_edited_time: str,
+        exported_at: str,
+        links: list[str] | None = None,
+    ) -> CachedPage:
+        """Store a freshly exported page."""
+        page = CachedPage(
+            id=page_id,
+            title=title,
+            content=content,
+            last_edited_time=last_edited_time,
+            exported_at=exported_at,
+            checked_at=exported_at,
+            links=links,
+        )
+        self.put(page)
+        return page
+
+
+def load_page(session: NotionSession, page_id: str, cache: NotionPageCache | None = None) -> CachedPage:
+    """Get a page's title and markdown, from the cache when possible.
+
+    A fresh cache entry costs no API call, a stale but unedited one a single
+    metadata call; otherwise the page is exported (and cached).
+    """
+    from .provider import export_page
+
+    if cache is not None:
+        cached = cache.get(page_id)
+        if cached is not None and cache.is_fresh(cached):
+            return cached
+
+    exported_at = utc_now()
+    page: dict[str, Any] = session.retrieve_page(page_id)
+    last_edited_time = page.get("last_edited_time", "")
+    if cache is not None:
+        cached = cache.revalidate(page_id, last_edited_time)
+        if cached is not None:
+            return cached
+
+    title, markdown, links = export_page(session, page_id, page)
+    if cache is None:
+        return CachedPage(page_id, title, markdown, last_edited_time, exported_at, exported_at, links)
+    return cache.store(page_id, title, markdown, last_edited_time, exported_at, links)
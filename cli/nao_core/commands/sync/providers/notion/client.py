@@ -0,0 +1,202 @@
+"""Rate-limited Notion API access shared by the pages of a sync."""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import fields
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, Callable, TypeVar, cast
+
+from notion_client import Client
+from notion_client.client import ClientOptions
+from notion_client.errors import HTTPResponseError
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+T = TypeVar("T")
+
+# Notion allows an average of 3 requests per second per integration, with some bursts
+NOTION_REQUESTS_PER_SECOND = 3.0
+NOTION_BURST = 3
+
+MAX_RATE_LIMIT_RETRIES = 5
+# Wait after a 429 that has no (valid) Retry-After header, doubled on each retry
+RATE_LIMIT_BACKOFF_SECONDS = 1.0
+MAX_RATE_LIMIT_BACKOFF_SECONDS = 60.0
+
+# Results per request of list and query endpoints (the API maximum)
+LIST_PAGE_SIZE = 100
+# Guards against cursors that never end (10,000 results)
+MAX_LIST_PAGES = 100
+
+
+class TokenBucket:
+    """Thread-safe token bucket spacing out requests to a rate, with bursts of up to `capacity`.
+
+    A rate-limited response pauses the whole bucket, so every thread waits
+    out the server's Retry-After rather than each running into it.
+    """
+
+    def __init__(
+        self,
+        rate: float = NOTION_REQUESTS_PER_SECOND,
+        capacity: int = NOTION_BURST,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self._sleep = sleep
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request for `seconds` (e.g. a 429's Retry-After) and drop the accumulated burst."""
+        with self._lock:
+            now = self._clock()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0.0
+            self._updated = now
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds to wait."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    """Check whether an exception is a Notion 429 response."""
+    return isinstance(error, HTTPResponseError) and error.status == 429
+
+
+class NotionSession:
+    """One Notion client, and so one HTTP connection pool, shared by all the pages of a sync.
+
+    Every request goes through a token bucket matching Notion's rate limit;
+    429 responses pause the bucket for their Retry-After and are retried.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str | None = None,
+        limiter: TokenBucket | None = None,
+    ):
+        options: dict[str, Any] = {"auth": api_key}
+        if base_url:
+            options["base_url"] = base_url
+        if "retry" in {f.name for f in fields(ClientOptions)}:
+            # Retries are scheduled here, across threads, instead of by each request
+            options["retry"] = False
+        self.client = Client(**options)
+        self.limiter = limiter or TokenBucket()
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        """Requests sent, including retries"""
+
+        self.rate_limited = 0
+        """Requests rejected with a 429"""
+
+    def call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Send one API request under the rate limit, retrying it when rate-limited."""
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            with self._lock:
+                self.requests += 1
+            try:
+                return fn(*args, **kwargs)
+            except HTTPResponseError as e:
+                if not is_rate_limited(e) or attempt >= MAX_RATE_LIMIT_RETRIES:
+                    raise
+                with self._lock:
+                    self.rate_limited += 1
+                delay = parse_retry_after(e.headers.get("retry-after"))
+                if delay is None:
+                    delay = min(RATE_LIMIT_BACKOFF_SECONDS * 2**attempt, MAX_RATE_LIMIT_BACKOFF_SECONDS)
+                self.limiter.pause(delay)
+                attempt += 1
+
+    def retrieve_page(self, page_id: str) -> dict[str, Any]:
+        """Retrieve a page object (properties, timestamps, ...)."""
+        return cast(dict[str, Any], self.call(self.client.pages.retrieve, page_id=page_id))
+
+    def _paginate(self, fn: Callable[..., Any], **kwargs: Any) -> list[dict[str, Any]]:
+        """Collect the results of a paginated list or query endpoint."""
+        results: list[dict[str, Any]] = []
+        start_cursor = None
+        for _ in range(MAX_LIST_PAGES):
+            response = cast(
+                dict[str, Any],
+                self.call(fn, start_cursor=start_cursor, page_size=LIST_PAGE_SIZE, **kwargs),
+            )
+            results.extend(response["results"])
+            start_cursor = response["next_cursor"] if response["has_more"] else None
+            if start_cursor is None:
+                return results
+        raise RuntimeError(f"Notion list has more than {MAX_LIST_PAGES * LIST_PAGE_SIZE} results")
+
+    def get_children(self, parent_id: str) -> list[dict[str, Any]]:
+        """List all the child blocks of a block or page.
+
+        Also makes the session usable as the client of notion2md's block convertor.
+        """
+        return self._paginate(self.client.blocks.children.list, block_id=parent_id)
+
+    def query_database(self, database_id: str) -> list[dict[str, Any]]:
+        """List the pages (rows) of a database.
+
+        Since API version 2025-09-03 rows belong to the database's data
+        sources, which are queried in turn.
+        """
+        data_sources = getattr(self.client, "data_sources", None)
+        if data_sources is None:
+            # Older clients query the database itself (an endpoint newer client versions don't declare)
+            return self._paginate(cast(Any, self.client.databases).query, database_id=database_id)
+        database = cast(dict[str, Any], self.call(self.client.databases.retrieve, database_id=database_id))
+        return [
+            row
+            for source in database.get("data_sources", [])
+            for row in self._paginate(data_sources.query, data_source_id=source["id"])
+        ]
+
+    def close(self) -> None:
+        """Close the HTTP connections."""
+        self.client.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
@@ -0,0 +1,135 @@
+"""Bounded parallel crawl of Notion page trees and databases."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Literal, TypeVar
+
+from .client import NotionSession
+
+T = TypeVar("T")
+
+NodeKind = Literal["page", "database"]
+
+
+def normalize_id(notion_id: str) -> str:
+    """Notion API objects carry dashed UUIDs; pages are identified by the 32 hex digits."""
+    return notion_id.replace("-", "")
+
+
+def format_link(kind: NodeKind, notion_id: str) -> str:
+    """Encode a child page or database as stored in the manifest and page cache (e.g. 'page:<id>')."""
+    return f"{kind}:{notion_id}"
+
+
+def parse_link(link: str) -> tuple[NodeKind, str]:
+    kind, _, notion_id = link.partition(":")
+    return ("database" if kind == "database" else "page"), notion_id
+
+
+@dataclass(frozen=True)
+class CrawlNode:
+    """A page or database to visit."""
+
+    kind: NodeKind
+    id: str
+    depth: int
+    """Levels of child pages/databases below the configured root"""
+
+    order: tuple[int, ...] = ()
+    """Position in the tree, for reporting pages in a stable order"""
+
+    page: dict[str, Any] | None = field(default=None, compare=False, hash=False)
+    """Page object already returned by a database query (saves retrieving it)"""
+
+
+class BlockTree:
+    """The block children of one page, fetched once and shared.
+
+    Used as the client of notion2md's block convertor, it records every child
+    list fetched while converting the page, so the child pages and databases
+    it links to are found without fetching the tree again.
+    """
+
+    def __init__(self, session: NotionSession):
+        self._session = session
+        self._children: dict[str, list[dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get_children(self, parent_id: str) -> list[dict[str, Any]]:
+        with self._lock:
+            if parent_id in self._children:
+                return self._children[parent_id]
+        children = self._session.get_children(parent_id)
+        with self._lock:
+            return self._children.setdefault(parent_id, children)
+
+    def links(self) -> list[str]:
+        """Child pages and databases found in the fetched blocks, in document order."""
+        links: list[str] = []
+        with self._lock:
+            blocks = [block for children in self._children.values() for block in children]
+        for block in blocks:
+            if block.get("type") == "child_page":
+                link = format_link("page", normalize_id(block["id"]))
+            elif block.get("type") == "child_database":
+                link = format_link("database", normalize_id(block["id"]))
+            else:
+                continue
+            if link not in links:
+                links.append(link)
+        return links
+
+
+def crawl(
+    roots: list[CrawlNode],
+    visit: Callable[[CrawlNode], tuple[T, list[CrawlNode]]],
+    max_depth: int,
+    max_workers: int,
+) -> Iterator[tuple[CrawlNode, T | Exception]]:
+    """Visit pages and databases from the roots down to max_depth, max_workers at a time.
+
+    Nodes wait in a frontier queue and are handed to a bounded worker pool;
+    each page or database is visited once, however many parents link to it.
+
+    Args:
+        roots: Configured pages and databases
+        visit: Visits a node, returning its result and the nodes it links to
+        max_depth: Deepest level visited (0 visits the roots only)
+        max_workers: Nodes visited concurrently
+
+    Yields:
+        (node, result or the exception its visit raised), as visits complete
+    """
+    seen: set[str] = set()
+    frontier: deque[CrawlNode] = deque()
+
+    def enqueue(node: CrawlNode) -> None:
+        if node.id not in seen and node.depth <= max_depth:
+            seen.add(node.id)
+            frontier.append(node)
+
+    for root in roots:
+        enqueue(root)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        running: dict[Future[tuple[T, list[CrawlNode]]], CrawlNode] = {}
+        while frontier or running:
+            while frontier and len(running) < max_workers:
+                node = frontier.popleft()
+                running[executor.submit(visit, node)] = node
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                node = running.pop(future)
+                try:
+                    result, children = future.result()
+                except Exception as e:
+                    yield node, e
+                    continue
+                for child in children:
+                    enqueue(child)
+                yield node, result
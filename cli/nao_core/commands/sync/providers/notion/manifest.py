@@ -0,0 +1,123 @@
+"""Manifest of synced Notion pages, for incremental syncs and cleanup."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from nao_core.commands.sync.writer import write_if_changed
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Notion rounds last_edited_time down to the minute, so an edit made within a
+# minute before an export can carry the same timestamp as the export saw
+EDIT_TIME_PRECISION = timedelta(minutes=1)
+
+
+def get_notion_state_dir(output_path: Path, project_path: Path | None = None) -> Path:
+    """Get the directory holding the Notion sync bookkeeping (under the project's `.nao/sync/`).
+
+    Args:
+        output_path: Output path of the Notion provider (e.g. docs/notion)
+        project_path: Path to the nao project root (defaults to the parent of output_path)
+    """
+    root = project_path if project_path is not None else output_path.parent
+    return root / ".nao" / "sync" / output_path.name
+
+
+def parse_notion_time(value: str) -> datetime:
+    """Parse a Notion ISO 8601 timestamp (e.g. 2024-05-01T09:30:00.000Z)."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def utc_now() -> str:
+    """Current time as a Notion-style ISO 8601 timestamp."""
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def hash_markdown(content: str) -> str:
+    """Hash the markdown written for a page."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class PageEntry:
+    """A page as of its last successful sync."""
+
+    file: str
+    """Markdown file in the output directory"""
+
+    title: str
+
+    last_edited_time: str
+    """Notion's last_edited_time of the page when it was exported"""
+
+    content_hash: str
+    """Hash of the markdown written to `file`"""
+
+    exported_at: str
+    """When the page was exported"""
+
+    links: list[str] | None = None
+    """Child pages and databases of the page (None if not recorded)"""
+
+
+class NotionManifest:
+    """Synced pages by page ID, and database rows by database ID, persisted between runs."""
+
+    def __init__(
+        self, path: Path, pages: dict[str, PageEntry] | None = None, databases: dict[str, list[str]] | None = None
+    ):
+        self.path = path
+        self.pages = pages or {}
+        self.databases = databases or {}
+        """Row page IDs of each database, as of its last successful query"""
+
+    @classmethod
+    def load(cls, path: Path) -> NotionManifest | None:
+        """Load the manifest of the last sync, or None if there is no readable one."""
+        try:
+            data = json.loads(path.read_text())
+            if data.get("version") != MANIFEST_VERSION:
+                return None
+            pages = {page_id: PageEntry(**entry) for page_id, entry in data["pages"].items()}
+            databases = {database_id: list(rows) for database_id, rows in data.get("databases", {}).items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return cls(path, pages, databases)
+
+    def save(self) -> None:
+        """Persist the manifest for the next sync."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "pages": {page_id: asdict(entry) for page_id, entry in sorted(self.pages.items())},
+            "databases": dict(sorted(self.databases.items())),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(self.path, json.dumps(data, indent=1) + "\n")
+
+    def is_unchanged(self, page_id: str, last_edited_time: str | None, output_path: Path) -> bool:
+        """Check whether a page's export can be skipped.
+
+        The page must not have been edited since its last export (which must
+        have happened long enough after the edit for the timestamp to tell),
+        and the file written then must still be there with the same content.
+        """
+        entry = self.pages.get(page_id)
+        if entry is None or not last_edited_time or entry.last_edited_time != last_edited_time:
+            return False
+        try:
+            if parse_notion_time(entry.exported_at) - parse_notion_time(last_edited_time) < EDIT_TIME_PRECISION:
+                return False
+            return hash_markdown((output_path / entry.file).read_text()) == entry.content_hash
+        except (OSError, UnicodeDecodeError, ValueError):
+            return False
+
+    @property
+    def files(self) -> set[str]:
+        """Markdown files of the recorded pages."""
+        return {entry.file for entry in self.pages.values()}
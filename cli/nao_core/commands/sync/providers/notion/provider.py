@@ -1,30 +1,55 @@
 import re
+import threading
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, cast
+from typing import Any, NamedTuple, cast
 
-from notion2md.exporter.block import StringExporter
-from notion_client import Client
+from notion2md.config import Config as ExportConfig
+from notion2md.convertor.block import BlockConvertor
 from rich.console import Console
 from rich.progress import BarColumn, Progress, SpinnerColumn, TaskProgressColumn, TextColumn
 
+from nao_core.commands.sync.writer import write_if_changed
 from nao_core.config.base import NaoConfig
 from nao_core.config.notion import NotionConfig
 
-from ..base import SyncProvider, SyncResult
+from ..base import SyncOptions, SyncProvider, SyncResult
+from .cache import NotionPageCache, get_notion_cache_dir
+from .client import NotionSession
+from .crawl import BlockTree, CrawlNode, crawl, normalize_id, parse_link
+from .manifest import (
+    MANIFEST_FILENAME,
+    NotionManifest,
+    PageEntry,
+    get_notion_state_dir,
+    hash_markdown,
+    utc_now,
+)
 
 console = Console()
 
+# Pages (and databases) visited concurrently; requests are still spaced out by the session's rate limit
+DEFAULT_PAGE_WORKERS = 4
+
 # Notion page IDs are 32-character hex strings (UUID without dashes)
 NOTION_PAGE_ID_PATTERN = re.compile(r"[a-f0-9]{32}")
 
 
-def cleanup_stale_pages(synced_files: set[str], output_path: Path, verbose: bool = False) -> int:
+def cleanup_stale_pages(
+    synced_files: set[str],
+    output_path: Path,
+    verbose: bool = False,
+    previous_files: set[str] | None = None,
+) -> int:
     """Remove markdown files that were not synced.
 
     Args:
-        synced_files: Set of filenames that were synced in this run.
+        synced_files: Set of filenames that were synced (or kept unchanged) in this run.
         output_path: Path where synced markdown files are stored.
         verbose: Whether to print cleanup messages.
+        previous_files: Files recorded in the manifest of the previous sync. Only
+            those are candidates for removal; without a manifest, every markdown
+            file in output_path is.
 
     Returns:
         Number of stale files removed.
@@ -35,6 +60,8 @@ def cleanup_stale_pages(synced_files: set[str], output_path: Path, verbose: bool
     removed_count = 0
     for file_path in output_path.iterdir():
         if file_path.is_file() and file_path.suffix == ".md":
+            if previous_files is not None and file_path.name not in previous_files:
+                continue
             if file_path.name not in synced_files:
                 file_path.unlink()
                 removed_count += 1
@@ -67,9 +94,13 @@ def extract_page_id(page_url: str) -> str:
     raise ValueError(f"Could not extract Notion page ID from: {page_url}")
 
 
-def get_page_title(client: Client, page_id: str) -> str:
+def get_page_title(session: NotionSession, page_id: str) -> str:
     """Get the title of a Notion page."""
-    page = cast(dict[str, Any], client.pages.retrieve(page_id=page_id))
+    return page_title(session.retrieve_page(page_id), page_id)
+
+
+def page_title(page: dict[str, Any], page_id: str) -> str:
+    """Get the title of a retrieved Notion page object."""
     properties = page.get("properties", {})
 
     # Try common title property names
@@ -85,26 +116,63 @@ def get_page_title(client: Client, page_id: str) -> str:
     return page_id
 
 
-def get_page_as_markdown(page_url: str, api_key: str) -> tuple[str, str]:
+class PageExport(NamedTuple):
+    """A page exported as markdown."""
+
+    title: str
+    markdown: str
+    links: list[str]
+    """Child pages and databases found in the page (e.g. 'page:<id>')"""
+
+
+def export_page(session: NotionSession, page_id: str, page: dict[str, Any] | None = None) -> PageExport:
+    """Fetch a Notion page's title and its content as markdown (images stripped).
+
+    The block tree is fetched once, both for the markdown conversion and to
+    find the child pages and databases to crawl.
+
+    Args:
+        session: Notion session.
+        page_id: ID of the page.
+        page: The page object, if already retrieved.
+    """
+    title = page_title(page, page_id) if page is not None else get_page_title(session, page_id)
+
+    # Convert the page blocks with notion2md, fetching them through the shared session
+    # (the block tree stands in for notion2md's client, which its annotations don't allow for)
+    tree = BlockTree(session)
+    convertor = BlockConvertor(ExportConfig(block_id=page_id), cast(Any, tree))
+    markdown = convertor.to_string(cast(Any, tree.get_children(page_id)))
+
+    # Strip images since we can't read them
+    return PageExport(title, strip_images(markdown), tree.links())
+
+
+def get_page_as_markdown(page_url: str, api_key: str, session: NotionSession | None = None) -> tuple[str, str]:
     """Fetch a Notion page and convert it to markdown.
 
+    Args:
+        page_url: Page URL or ID.
+        api_key: Notion API key, used when no session is given.
+        session: Session shared by the pages of a sync.
+
     Returns:
         Tuple of (title, markdown_content)
     """
     page_id = extract_page_id(page_url)
 
-    # Get page title for the filename
-    client = Client(auth=api_key)
-    title = get_page_title(client, page_id)
+    if session is None:
+        with NotionSession(api_key) as own_session:
+            title, markdown, _ = export_page(own_session, page_id)
+    else:
+        title, markdown, _ = export_page(session, page_id)
 
-    # Export to markdown string using notion2md
-    md_exporter = StringExporter(block_id=page_id, token=api_key)
-    markdown = md_exporter.export()
+    return title, format_page(title, page_id, markdown)
 
-    # Strip images since we can't read them
-    markdown = strip_images(markdown)
 
-    content = f"""---
+def format_page(title: str, page_id: str, markdown: str) -> str:
+    """Build the synced markdown file of a page, with its frontmatter."""
+    return f"""---
 title: {title}
 id: {page_id}
 ---
@@ -112,7 +180,32 @@ id: {page_id}
 {markdown}
 """
 
-    return title, content
+
+def page_filename(title: str, page_id: str | None = None) -> str:
+    """Get the markdown filename of a page from its title.
+
+    Args:
+        title: Page title.
+        page_id: Appended to the filename, for pages whose title collides with another page's.
+    """
+    safe_title = re.sub(r"[^\w\s-]", "", title).strip().replace(" ", "-").lower()
+    if page_id is not None:
+        return f"{safe_title}-{page_id}.md"
+    return f"{safe_title}.md"
+
+
+@dataclass
+class PageSyncResult:
+    """Outcome of syncing one page."""
+
+    entry: PageEntry | None
+    """The page's manifest entry"""
+
+    markdown: str | None = None
+    """Content to write, None when the page is unchanged since the last sync"""
+
+    error: Exception | None = None
+    """Why the page failed to sync (`entry` is then its last synced version, if any)"""
 
 
 class NotionSyncProvider(SyncProvider):
@@ -133,13 +226,20 @@ class NotionSyncProvider(SyncProvider):
     def get_items(self, config: NaoConfig) -> list[NotionConfig]:
         return [config.notion] if config.notion else []
 
-    def sync(self, items: list[NotionConfig], output_path: Path, project_path: Path | None = None) -> SyncResult:
+    def sync(
+        self,
+        items: list[NotionConfig],
+        output_path: Path,
+        project_path: Path | None = None,
+        options: SyncOptions | None = None,
+    ) -> SyncResult:
         """Sync Notion pages to local filesystem as markdown files.
 
         Args:
             items: Notion configuration with pages to sync.
             output_path: Path where synced markdown files should be written.
             project_path: Path to the nao project root.
+            options: Run-wide sync options.
 
         Returns:
             SyncResult with statistics about what was synced.
@@ -151,55 +251,191 @@ class NotionSyncProvider(SyncProvider):
         notion_config = items[0]
         output_path.mkdir(parents=True, exist_ok=True)
         pages_synced = 0
-        synced_pages: list[str] = []
+        pages_unchanged = 0
+        synced_pages: list[tuple[tuple[int, ...], str]] = []
         synced_files: set[str] = set()
 
+        # Pages whose last_edited_time and output are unchanged since the last sync are not exported again
+        manifest_path = get_notion_state_dir(output_path, project_path) / MANIFEST_FILENAME
+        previous = NotionManifest.load(manifest_path)
+        manifest = NotionManifest(manifest_path)
+        # Exported pages are also cached for `nao.notion.page(...)` in templates
+        cache = NotionPageCache(
+            get_notion_cache_dir(project_path if project_path is not None else output_path.parent),
+            ttl=notion_config.cache_ttl,
+        )
+
         console.print(f"\n[bold cyan]{self.emoji}  Syncing {self.name}[/bold cyan]")
         console.print(f"[dim]Location:[/dim] {output_path.absolute()}\n")
 
         api_key = notion_config.api_key
-        total_pages = len(notion_config.pages)
-
-        with Progress(
-            SpinnerColumn(style="dim"),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(bar_width=30, style="dim", complete_style="cyan", finished_style="green"),
-            TaskProgressColumn(),
-            console=console,
-            transient=False,
-        ) as progress:
-            task = progress.add_task("Syncing pages", total=total_pages)
-
-            for page_url in notion_config.pages:
+        # Child pages are only known once their parents are fetched
+        follow_links = notion_config.crawl_depth > 0
+        crawling = follow_links or bool(notion_config.databases)
+
+        with (
+            NotionSession(api_key) as session,
+            Progress(
+                SpinnerColumn(style="dim"),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(bar_width=30, style="dim", complete_style="cyan", finished_style="green"),
+                TaskProgressColumn(),
+                console=console,
+                transient=False,
+            ) as progress,
+        ):
+            task = progress.add_task("Syncing pages", total=None if crawling else len(notion_config.pages))
+
+            roots: list[CrawlNode] = []
+            for i, page_url in enumerate(notion_config.pages):
                 try:
-                    title, markdown = get_page_as_markdown(page_url, api_key)
-
-                    # Sanitize title for filename
-                    safe_title = re.sub(r"[^\w\s-]", "", title).strip().replace(" ", "-").lower()
-                    filename = f"{safe_title}.md"
-
-                    with open(output_path / filename, "w") as f:
-                        f.write(markdown)
-
-                    pages_synced += 1
-                    synced_pages.append(title)
-                    synced_files.add(filename)
-                    progress.update(task, advance=1, description=f"Synced: {title}")
-                except Exception as e:
+                    roots.append(CrawlNode("page", extract_page_id(page_url), 0, (i,)))
+                except ValueError as e:
                     console.print(f"[bold red]✗[/bold red] Failed to sync page {page_url}: {e}")
                     progress.update(task, advance=1)
+            for i, database_url in enumerate(notion_config.databases, start=len(notion_config.pages)):
+                try:
+                    roots.append(CrawlNode("database", extract_page_id(database_url), 0, (i,)))
+                except ValueError as e:
+                    console.print(f"[bold red]✗[/bold red] Failed to sync database {database_url}: {e}")
+
+            def child_nodes(node: CrawlNode, links: list[str] | None) -> list[CrawlNode]:
+                children = []
+                for i, link in enumerate(links or []):
+                    kind, notion_id = parse_link(link)
+                    children.append(CrawlNode(kind, notion_id, node.depth + 1, node.order + (i,)))
+                return children
+
+            # Pages with the same title share a filename; pages after the first get their ID appended.
+            # Files of the last sync stay with their pages, so colliding titles don't swap files between runs.
+            file_owners = {entry.file: page_id for page_id, entry in previous.pages.items()} if previous else {}
+            file_owners_lock = threading.Lock()
+
+            def claim_file(page_id: str, title: str) -> str:
+                filename = page_filename(title)
+                with file_owners_lock:
+                    if file_owners.setdefault(filename, page_id) != page_id:
+                        filename = page_filename(title, page_id)
+                        file_owners[filename] = page_id
+                return filename
+
+            def visit(node: CrawlNode) -> tuple[PageSyncResult | None, list[CrawlNode]]:
+                """Sync a page, or list the rows of a database."""
+                if node.kind == "database":
+                    try:
+                        rows = session.query_database(node.id)
+                    except Exception as e:
+                        previous_rows = previous.databases.get(node.id) if previous is not None else None
+                        if previous_rows is None:
+                            raise
+                        # Visit the rows of the last successful query, so they are kept rather than cleaned up
+                        manifest.databases[node.id] = previous_rows
+                        return PageSyncResult(None, error=e), [
+                            CrawlNode("page", row_id, node.depth, node.order + (i,))
+                            for i, row_id in enumerate(previous_rows)
+                        ]
+                    manifest.databases[node.id] = [normalize_id(row["id"]) for row in rows]
+                    # A database's rows are at its own level
+                    return None, [
+                        CrawlNode("page", normalize_id(row["id"]), node.depth, node.order + (i,), page=row)
+                        for i, row in enumerate(rows)
+                    ]
+
+                previous_entry = previous.pages.get(node.id) if previous is not None else None
+                try:
+                    exported_at = utc_now()
+                    # Cheap metadata call (unless a database query returned the page); the blocks
+                    # are only fetched for edited pages
+                    page = node.page if node.page is not None else session.retrieve_page(node.id)
+                    last_edited_time = page.get("last_edited_time", "")
+                    if (
+                        previous is not None
+                        and previous_entry is not None
+                        and previous.is_unchanged(node.id, last_edited_time, output_path)
+                        and (previous_entry.links is not None or not follow_links)
+                        and claim_file(node.id, previous_entry.title) == previous_entry.file
+                    ):
+                        cache.revalidate(node.id, last_edited_time)
+                        return PageSyncResult(previous_entry), child_nodes(node, previous_entry.links)
+
+                    cached = cache.revalidate(node.id, last_edited_time)
+                    if cached is not None and (cached.links is not None or not follow_links):
+                        export = PageExport(cached.title, cached.content, cached.links or [])
+                        exported_at = cached.exported_at
+                    else:
+                        export = export_page(session, node.id, page)
+                        cache.store(node.id, export.title, export.markdown, last_edited_time, exported_at, export.links)
+
+                    markdown = format_page(export.title, node.id, export.markdown)
+                    entry = PageEntry(
+                        file=claim_file(node.id, export.title),
+                        title=export.title,
+                        last_edited_time=last_edited_time,
+                        content_hash=hash_markdown(markdown),
+                        exported_at=exported_at,
+                        links=export.links,
+                    )
+                    return PageSyncResult(entry, markdown), child_nodes(node, export.links)
+                except Exception as e:
+                    # Keep the last synced version of the page, and crawl on into its last known children
+                    return PageSyncResult(previous_entry, error=e), child_nodes(
+                        node, previous_entry.links if previous_entry else None
+                    )
+
+            # Pages are visited concurrently, each written as soon as it is exported
+            max_depth = notion_config.crawl_depth
+            for node, outcome in crawl(roots, visit, max_depth, DEFAULT_PAGE_WORKERS):
+                if isinstance(outcome, Exception):
+                    console.print(f"[bold red]✗[/bold red] Failed to sync {node.kind} {node.id}: {outcome}")
+                    continue
+                if outcome is None:
+                    continue
+
+                entry = outcome.entry
+                if outcome.error is not None:
+                    console.print(f"[bold red]✗[/bold red] Failed to sync {node.kind} {node.id}: {outcome.error}")
+                    if node.kind == "page":
+                        progress.update(task, advance=1)
+                    if entry is not None:
+                        manifest.pages[node.id] = entry
+                        synced_files.add(entry.file)
+                    continue
+
+                assert entry is not None
+                if outcome.markdown is None:
+                    pages_unchanged += 1
+                else:
+                    write_if_changed(output_path / entry.file, outcome.markdown)
+
+                manifest.pages[node.id] = entry
+                pages_synced += 1
+                synced_pages.append((node.order, entry.title))
+                synced_files.add(entry.file)
+                progress.update(task, advance=1, description=f"Synced: {entry.title}")
 
         # Clean up stale pages
-        removed_count = cleanup_stale_pages(synced_files, output_path, verbose=True)
+        removed_count = cleanup_stale_pages(
+            synced_files,
+            output_path,
+            verbose=True,
+            previous_files=previous.files if previous is not None else None,
+        )
+        manifest.save()
 
         # Build summary
         summary = f"{pages_synced} pages synced as markdown"
+        if pages_unchanged > 0:
+            summary += f" ({pages_unchanged} unchanged)"
         if removed_count > 0:
             summary += f", {removed_count} stale removed"
 
         return SyncResult(
             provider_name=self.name,
             items_synced=pages_synced,
-            details={"pages": synced_pages, "removed": removed_count},
+            details={
+                "pages": [title for _, title in sorted(synced_pages)],
+                "unchanged": pages_unchanged,
+                "removed": removed_count,
+            },
             summary=summary,
         )
@@ -1,8 +1,12 @@
 """Repository sync provider implementation."""
 
+import os
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 from rich.console import Console
 
@@ -10,75 +14,94 @@ from nao_core.commands.sync.cleanup import cleanup_stale_repos
 from nao_core.config import NaoConfig
 from nao_core.config.repos import RepoConfig
 
-from ..base import SyncProvider, SyncResult
+from ..base import SyncOptions, SyncProvider, SyncResult
 
 console = Console()
 
 
-def clone_or_pull_repo(repo: RepoConfig, base_path: Path) -> bool:
+@dataclass
+class RepoSyncOutcome:
+    """Result of cloning or pulling one repository."""
+
+    name: str
+    action: Literal["clone", "pull"]
+
+    seconds: float
+    """Wall-clock time of the git commands"""
+
+    error: str | None = None
+    """Why the clone or pull failed (None on success)"""
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+def _run_git(args: list[str], cwd: Path | None = None) -> subprocess.CompletedProcess[str]:
+    # Repositories are synced concurrently with output captured, so git must fail rather than prompt for credentials
+    env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=False, env=env)
+
+
+def sync_repo(repo: RepoConfig, base_path: Path) -> RepoSyncOutcome:
     """Clone a repository if it doesn't exist, or pull latest changes if it does.
 
+    Prints nothing, so repositories can be synced concurrently and reported in order.
+
     Args:
             repo: Repository configuration
             base_path: Base path where repositories are stored
 
     Returns:
-            True if successful, False otherwise
+            The outcome, with the git error if the clone or pull failed
     """
     repo_path = base_path / repo.name
+    action: Literal["clone", "pull"] = "pull" if repo_path.exists() else "clone"
+    start = time.monotonic()
 
-    try:
-        if repo_path.exists():
-            # Repository exists - pull latest changes
-            console.print(f"  [dim]Pulling latest changes for[/dim] {repo.name}")
-
-            result = subprocess.run(
-                ["git", "pull"],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=False,
-            )
+    def outcome(error: str | None = None) -> RepoSyncOutcome:
+        return RepoSyncOutcome(repo.name, action, time.monotonic() - start, error)
 
+    try:
+        if action == "pull":
+            result = _run_git(["pull"], cwd=repo_path)
             if result.returncode != 0:
-                console.print(f"  [yellow]⚠[/yellow] Failed to pull {repo.name}: {result.stderr.strip()}")
-                return False
+                return outcome(f"Failed to pull {repo.name}: {result.stderr.strip()}")
 
             # If branch is specified, checkout that branch
             if repo.branch:
-                subprocess.run(
-                    ["git", "checkout", repo.branch],
-                    cwd=repo_path,
-                    capture_output=True,
-                    text=True,
-                    check=False,
-                )
+                _run_git(["checkout", repo.branch], cwd=repo_path)
 
         else:
-            # Repository doesn't exist - clone it
-            console.print(f"  [dim]Cloning[/dim] {repo.name}")
-
-            cmd = ["git", "clone"]
+            cmd = ["clone"]
             if repo.branch:
                 cmd.extend(["-b", repo.branch])
             cmd.extend([repo.url, str(repo_path)])
 
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-
+            result = _run_git(cmd)
             if result.returncode != 0:
-                console.print(f"  [yellow]⚠[/yellow] Failed to clone {repo.name}: {result.stderr.strip()}")
-                return False
+                return outcome(f"Failed to clone {repo.name}: {result.stderr.strip()}")
 
-        return True
+        return outcome()
 
     except Exception as e:
-        console.print(f"  [yellow]⚠[/yellow] Error syncing {repo.name}: {e}")
-        return False
+        return outcome(f"Error syncing {repo.name}: {e}")
+
+
+def clone_or_pull_repo(repo: RepoConfig, base_path: Path) -> bool:
+    """Clone a repository if it doesn't exist, or pull latest changes if it does.
+
+    Args:
+            repo: Repository configuration
+            base_path: Base path where repositories are stored
+
+    Returns:
+            True if successful, False otherwise
+    """
+    result = sync_repo(repo, base_path)
+    if result.error:
+        console.print(f"  [yellow]⚠[/yellow] {result.error}")
+    return result.success
 
 
 class RepositorySyncProvider(SyncProvider):
@@ -96,7 +119,7 @@ class RepositorySyncProvider(SyncProvider):
     def default_output_dir(self) -> str:
         return "repos"
 
-    def pre_sync(self, config: NaoConfig, output_path: Path) -> None:
+    def pre_sync(self, config: NaoConfig, output_path: Path, project_path: Path | None = None) -> None:
         """
         Always run before syncing.
         """
@@ -106,13 +129,20 @@ class RepositorySyncProvider(SyncProvider):
     def get_items(self, config: NaoConfig) -> list[RepoConfig]:
         return config.repos
 
-    def sync(self, items: list[Any], output_path: Path, project_path: Path | None = None) -> SyncResult:
+    def sync(
+        self,
+        items: list[Any],
+        output_path: Path,
+        project_path: Path | None = None,
+        options: SyncOptions | None = None,
+    ) -> SyncResult:
         """Sync all configured repositories.
 
         Args:
                 items: List of repository configurations
                 output_path: Base path where repositories are stored
                 project_path: Path to the nao project root (unused for repos)
+                options: Run-wide sync options
 
         Returns:
                 SyncResult with number of successfully synced repositories
@@ -120,15 +150,41 @@ class RepositorySyncProvider(SyncProvider):
         if not items:
             return SyncResult(provider_name=self.name, items_synced=0)
 
+        options = options or SyncOptions()
         output_path.mkdir(parents=True, exist_ok=True)
-        success_count = 0
 
         console.print(f"\n[bold cyan]{self.emoji} Syncing {self.name}[/bold cyan]")
         console.print(f"[dim]Location:[/dim] {output_path.absolute()}\n")
 
-        for repo in items:
-            if clone_or_pull_repo(repo, output_path):
-                success_count += 1
-                console.print(f"  [green]✓[/green] {repo.name}")
-
-        return SyncResult(provider_name=self.name, items_synced=success_count)
+        profiler = options.profiler
+
+        def sync_one(repo: RepoConfig) -> RepoSyncOutcome:
+            t_repo = time.monotonic()
+            outcome = sync_repo(repo, output_path)
+            if profiler:
+                profiler.record(outcome.action, "repository", t_repo, repository=repo.name, error=outcome.error)
+            return outcome
+
+        workers = max(1, min(options.repo_workers, len(items)))
+        outcomes: list[RepoSyncOutcome] = []
+        # Repositories are synced concurrently and reported in config order
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for outcome in executor.map(sync_one, items):
+                outcomes.append(outcome)
+                if outcome.error:
+                    console.print(f"  [yellow]⚠[/yellow] {outcome.error}")
+                else:
+                    verb = "cloned" if outcome.action == "clone" else "pulled"
+                    console.print(f"  [green]✓[/green] {outcome.name} [dim]({verb} in {outcome.seconds:.1f}s)[/dim]")
+
+        success_count = sum(outcome.success for outcome in outcomes)
+        errors = {outcome.name: outcome.error for outcome in outcomes if outcome.error}
+        failed_count = len(errors)
+        summary = f"{success_count} synced" + (f" ({failed_count} failed)" if failed_count else "")
+
+        return SyncResult(
+            provider_name=self.name,
+            items_synced=success_count,
+            details={"repos": [asdict(outcome) for outcome in outcomes], "errors": errors},
+            summary=summary,
+        )
@@ -0,0 +1,62 @@
+"""File writing utilities for sync outputs."""
+
+import hashlib
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+
+def _current_umask() -> int:
+    # The umask can only be read by setting it; done once at import, before any sync threads start
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+_UMASK = _current_umask()
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write content to path atomically, skipping the write if the file is unchanged.
+
+    The existing file is compared by size and then by content hash, so unchanged
+    files keep their mtime. Changed files are written to a temporary file in the
+    same directory and renamed over the target, so concurrent readers never see
+    a partially written file. The file keeps the mode of the file it replaces
+    (or gets the umask-based mode of a regular new file), not the temporary
+    file's private 0600.
+
+    Args:
+        path: Destination file path
+        content: Text content to write
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    data = content.encode("utf-8")
+
+    try:
+        existing = path.stat()
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    else:
+        if existing.st_size == len(data) and _digest(path.read_bytes()) == _digest(data):
+            return False
+        mode = stat.S_IMODE(existing.st_mode)
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+    return True
@@ -6,7 +6,7 @@ from pydantic import Field
 
 from nao_core.ui import ask_select, ask_text
 
-from .base import DatabaseConfig
+from .base import DatabaseConfig, explain_scan_bytes, quote_identifier
 
 
 class AthenaConfig(DatabaseConfig):
@@ -84,7 +84,10 @@ class AthenaConfig(DatabaseConfig):
     def get_database_name(self) -> str:
         return self.schema_name or "default"
 
-    def get_schemas(self, conn: BaseBackend) -> list[str]:
+    def estimate_scan_bytes(self, conn: BaseBackend, schema: str, table_name: str) -> int | None:
+        return explain_scan_bytes(conn, f"SELECT * FROM {quote_identifier(schema, table_name)}")
+
+    def list_schemas(self, conn: BaseBackend) -> list[str]:
         """Return the list of schemas to sync."""
         if self.schema_name:
             return [self.schema_name]
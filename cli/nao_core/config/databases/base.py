@@ -1,14 +1,18 @@
 from __future__ import annotations
 
-import fnmatch
+import json
+import math
 from abc import ABC, abstractmethod
 from enum import Enum
+from typing import Any, ClassVar, Literal
 
 import pandas as pd
 import questionary
 from ibis import BaseBackend
 from pydantic import BaseModel, Field
 
+from .matcher import PatternMatcher, compile_matcher
+
 
 class DatabaseType(str, Enum):
     """Supported database types."""
@@ -37,6 +41,83 @@ class DatabaseAccessor(str, Enum):
     PREVIEW = "preview"
 
 
+# How rendered table docs are laid out on disk: one file per table accessor, one
+# consolidated file per schema, or a single catalog file for the whole database
+OutputLayout = Literal["tables", "schema", "catalog"]
+
+
+def group_tables_by_schema(rows: list[tuple[str, str]], schemas: list[str]) -> dict[str, list[str]]:
+    """Group (schema, table) rows from a catalog query into sorted table lists for the given schemas."""
+    grouped: dict[str, list[str]] = {schema: [] for schema in schemas}
+    for schema, table in rows:
+        if schema in grouped:
+            grouped[schema].append(table)
+    return {schema: sorted(set(tables)) for schema, tables in grouped.items()}
+
+
+class QueryLimits(BaseModel):
+    """Per-database limits on the queries issued during sync."""
+
+    max_queries_per_second: float | None = Field(
+        default=None,
+        gt=0,
+        description="Maximum number of metadata/preview queries started per second. "
+        "Lowered automatically when the warehouse throttles.",
+    )
+    max_concurrent_queries: int | None = Field(
+        default=None,
+        ge=1,
+        description="Maximum number of queries running at once, across schema listing (which also caps "
+        "list_concurrency), batch metadata queries and table renders.",
+    )
+    max_bytes_scanned: int | None = Field(
+        default=None,
+        ge=1,
+        description="Maximum estimated bytes scanned by previews and row counts per sync "
+        "(enforced on backends that can estimate scans: BigQuery, Athena, Trino).",
+    )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any limit is set."""
+        return any(
+            value is not None
+            for value in (self.max_queries_per_second, self.max_concurrent_queries, self.max_bytes_scanned)
+        )
+
+
+def quote_identifier(*parts: str) -> str:
+    """Quote a dotted SQL identifier with double quotes (e.g. "schema"."table")."""
+    return ".".join('"' + part.replace('"', '""') + '"' for part in parts)
+
+
+def explain_scan_bytes(conn: BaseBackend, sql: str) -> int | None:
+    """Estimate the bytes a query would read with Trino-style `EXPLAIN (TYPE IO, FORMAT JSON)`.
+
+    Returns None when the engine provides no size estimate for the query's inputs.
+    """
+    rows = conn.raw_sql(f"EXPLAIN (TYPE IO, FORMAT JSON) {sql}").fetchall()  # type: ignore
+    if not rows:
+        return None
+    plan = json.loads(rows[0][0])
+    sizes = [info.get("estimate", {}).get("outputSizeInBytes") for info in plan.get("inputTableColumnInfos", [])]
+    known = [size for size in sizes if isinstance(size, (int, float)) and not math.isnan(size)]
+    return int(sum(known)) if known else None
+
+
+def pg_table_descriptions(conn: BaseBackend, schema: str) -> dict[str, str | None]:
+    """Fetch the comment of every table in a schema from pg_catalog (Postgres and Redshift)."""
+    query = f"""
+        SELECT c.relname, d.description
+        FROM pg_catalog.pg_class c
+        JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_catalog.pg_description d ON d.objoid = c.oid AND d.objsubid = 0
+        WHERE n.nspname = '{schema}'
+    """
+    rows = conn.raw_sql(query).fetchall()  # type: ignore
+    return {row[0]: (str(row[1]).strip() or None) if row[1] else None for row in rows}
+
+
 class DatabaseConfig(BaseModel, ABC):
     """Base configuration for all database backends."""
 
@@ -55,6 +136,54 @@ class DatabaseConfig(BaseModel, ABC):
         default_factory=lambda: list(DatabaseAccessor),
         description="Which default templates to render per table (e.g., ['columns', 'description']). Defaults to all.",
     )
+    output_layout: OutputLayout = Field(
+        default="tables",
+        description="Output layout: 'tables' writes one file per table and accessor, 'schema' one consolidated "
+        "file per schema, 'catalog' a single file for the database. Consolidated files come with a "
+        "<name>.index.json of byte offsets to address one table's section directly.",
+    )
+    list_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Number of schemas whose tables are listed concurrently during sync "
+        "(for backends without a bulk listing query).",
+    )
+    query_timeout: float | None = Field(
+        default=None,
+        gt=0,
+        description="Seconds after which a table's template render is abandoned and its running query cancelled. "
+        "Unset means no timeout.",
+    )
+    max_consecutive_failures: int | None = Field(
+        default=3,
+        ge=1,
+        description="Consecutive failures or timeouts within a schema after which expensive accessors "
+        "(preview, description) are skipped for the rest of that schema. Unset disables the breaker.",
+    )
+    preview_max_columns: int | None = Field(
+        default=None,
+        ge=1,
+        description="Maximum number of columns selected for table previews. Unset selects all columns.",
+    )
+    preview_max_chars: int | None = Field(
+        default=None,
+        ge=1,
+        description="Truncate string/JSON preview values to this many characters in the query itself, "
+        "so oversized cells are never transferred. Unset keeps full values.",
+    )
+    max_retries: int = Field(
+        default=3,
+        ge=0,
+        description="Retries (with exponential backoff) for metadata/preview queries failing with a transient error "
+        "such as a rate limit, dropped connection or resuming warehouse. Auth and syntax errors are never retried.",
+    )
+    limits: QueryLimits = Field(
+        default_factory=QueryLimits,
+        description="Query rate and scan budget limits applied during sync.",
+    )
+
+    # Whether include/exclude patterns match identifiers case-sensitively
+    case_sensitive_patterns: ClassVar[bool] = True
 
     @classmethod
     @abstractmethod
@@ -80,6 +209,11 @@ class DatabaseConfig(BaseModel, ABC):
         columns: list[str] = [desc[0] for desc in cursor.description]
         return pd.DataFrame(cursor.fetchall(), columns=columns)  # type: ignore[arg-type]
 
+    @property
+    def pattern_matcher(self) -> PatternMatcher:
+        """The include/exclude patterns compiled for this backend's identifier case rules."""
+        return compile_matcher(tuple(self.include), tuple(self.exclude), self.case_sensitive_patterns)
+
     def matches_pattern(self, schema: str, table: str) -> bool:
         """Check if a schema.table matches the include/exclude patterns.
 
@@ -90,21 +224,7 @@ class DatabaseConfig(BaseModel, ABC):
         Returns:
             True if the table should be included, False if excluded
         """
-        full_name = f"{schema}.{table}"
-
-        # If include patterns exist, table must match at least one
-        if self.include:
-            included = any(fnmatch.fnmatch(full_name, pattern) for pattern in self.include)
-            if not included:
-                return False
-
-        # If exclude patterns exist, table must not match any
-        if self.exclude:
-            excluded = any(fnmatch.fnmatch(full_name, pattern) for pattern in self.exclude)
-            if excluded:
-                return False
-
-        return True
+        return self.pattern_matcher.matches(schema, table)
 
     @abstractmethod
     def get_database_name(self) -> str:
@@ -112,12 +232,47 @@ class DatabaseConfig(BaseModel, ABC):
         ...
 
     def get_schemas(self, conn: BaseBackend) -> list[str]:
-        """Return the list of schemas to sync. Override in subclasses for custom behavior."""
+        """Return the schemas to sync, skipping those the include/exclude patterns rule out entirely."""
+        matcher = self.pattern_matcher
+        return [schema for schema in self.list_schemas(conn) if matcher.schema_may_match(schema)]
+
+    def list_schemas(self, conn: BaseBackend) -> list[str]:
+        """Return all candidate schemas before pattern pruning. Override in subclasses for custom behavior."""
         list_databases = getattr(conn, "list_databases", None)
         if list_databases:
             return list_databases()
         return []
 
+    def list_tables_bulk(self, conn: BaseBackend, schemas: list[str]) -> dict[str, list[str]] | None:
+        """List the tables of many schemas with a single query.
+
+        Override in subclasses whose catalog can be queried across schemas at once
+        (e.g. INFORMATION_SCHEMA.TABLES). Returns None when bulk listing is not
+        supported, in which case schemas are listed one by one.
+        """
+        return None
+
+    def estimate_scan_bytes(self, conn: BaseBackend, schema: str, table_name: str) -> int | None:
+        """Estimate the bytes a full scan of the table would read, without running it.
+
+        Used by `nao sync --plan`. Override in backends that can estimate query
+        cost (dry runs, EXPLAIN). Returns None when no estimate is available.
+        """
+        return None
+
+    def prefetch_schema(
+        self, conn: BaseBackend, schema: str, tables: list[str], accessors: set[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch accessor results for many tables of a schema with batched catalog queries.
+
+        Override in backends whose per-table accessors (e.g. description) can be
+        answered for a whole schema at once. Only accessors in `accessors` (those
+        the templates call) should be fetched. Returns {table: {accessor: result}}
+        for argument-less accessors; tables or accessors left out are queried per
+        table as usual.
+        """
+        return {}
+
     def create_context(self, conn: BaseBackend, schema: str, table_name: str):
         """Create a DatabaseContext for this table. Override in subclasses for custom metadata."""
         from nao_core.config.databases.context import DatabaseContext
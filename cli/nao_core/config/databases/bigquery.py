@@ -190,7 +190,17 @@ class BigQueryConfig(DatabaseConfig):
         """Get the database name for BigQuery."""
         return self.project_id
 
-    def get_schemas(self, conn: BaseBackend) -> list[str]:
+    def estimate_scan_bytes(self, conn: BaseBackend, schema: str, table_name: str) -> int | None:
+        """Estimate bytes processed with a free BigQuery dry run."""
+        from google.cloud import bigquery
+
+        job_config = bigquery.QueryJobConfig(dry_run=True, use_query_cache=False)
+        job = conn.client.query(  # type: ignore
+            f"SELECT * FROM `{self.project_id}.{schema}.{table_name}`", job_config=job_config
+        )
+        return job.total_bytes_processed
+
+    def list_schemas(self, conn: BaseBackend) -> list[str]:
         if self.dataset_id:
             return [self.dataset_id]
         list_databases = getattr(conn, "list_databases", None)
@@ -1,9 +1,120 @@
 """Base database context exposing methods available in templates during sync."""
 
-from typing import Any
+import copy
+import functools
+import inspect
+import logging
+import time
+from types import FunctionType
+from typing import TYPE_CHECKING, Any, Callable
 
+import pandas as pd
 from ibis import BaseBackend
 
+from .retry import RetryPolicy, call_with_retry
+
+if TYPE_CHECKING:
+    from .governor import QueryGovernor
+
+logger = logging.getLogger(__name__)
+
+# Accessors whose results are memoized per context (i.e. per table).
+CACHED_ACCESSORS = ("columns", "preview", "row_count", "column_count", "partition_columns", "description")
+
+
+# Value types that templates (and to_json) render as-is; anything else is stringified.
+NATIVE_PREVIEW_TYPES = (str, int, float, bool, list, dict)
+
+
+def _normalize_column(series: pd.Series) -> list[Any]:
+    """Convert one DataFrame column to template-friendly Python values, with nulls as None."""
+    nulls = series.isna()
+    kind = series.dtype.kind
+    if kind in "biuf":
+        # numpy/extension numbers become Python numbers in a single cast
+        values = series.astype(object)
+    elif kind == "O":
+        values = series
+        if not all(issubclass(t, NATIVE_PREVIEW_TYPES) for t in set(map(type, series[~nulls]))):
+            values = series.map(lambda v: v if isinstance(v, NATIVE_PREVIEW_TYPES) else str(v))
+    else:
+        # datetimes, timedeltas, categoricals, ...
+        values = series.astype(object).map(str)
+    result = values.tolist()
+    for i in nulls.to_numpy().nonzero()[0]:
+        result[i] = None
+    return result
+
+
+def preview_rows(df: pd.DataFrame) -> list[dict[str, Any]]:
+    """Convert a preview DataFrame to a list of row dicts, normalizing column by column."""
+    names = [str(name) for name in df.columns]
+    columns = [_normalize_column(df.iloc[:, i]) for i in range(len(names))]
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+class QueryCancelledError(RuntimeError):
+    """Raised instead of sending a query on a context that was cancelled (e.g. after a render timeout)."""
+
+
+def _bound_args(signature: inspect.Signature, self: Any, args: tuple, kwargs: dict[str, Any]) -> tuple:
+    """Bind an accessor call's arguments (with defaults applied) as (name, value) pairs, excluding self."""
+    bound = signature.bind(self, *args, **kwargs)
+    bound.apply_defaults()
+    return tuple(list(bound.arguments.items())[1:])
+
+
+def _copy_result(result: Any) -> Any:
+    """Copy a cached list/dict result, so a caller mutating it doesn't change it for later calls."""
+    return copy.deepcopy(result) if isinstance(result, (list, dict)) else result
+
+
+def _memoized(func: FunctionType) -> Callable[..., Any]:
+    """Memoize an accessor on its DatabaseContext instance, keyed by its bound arguments.
+
+    Each call gets its own copy of a list/dict result.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(self: "DatabaseContext", *call_args: Any, **kwargs: Any) -> Any:
+        args = _bound_args(signature, self, call_args, kwargs)
+        key = (func.__qualname__, args)
+        outermost = self._accessor_depth == 0
+
+        try:
+            if key in self._cache:
+                if outermost:
+                    self.cache_hits += 1
+                return _copy_result(self._cache[key])
+        except TypeError:
+            # Unhashable arguments: compute without caching
+            key = None
+
+        if outermost:
+            self.cache_misses += 1
+        self._accessor_depth += 1
+        start = time.monotonic()
+        try:
+            if outermost:
+                result = self._run_query(func.__name__, args, lambda: func(self, *call_args, **kwargs))
+            else:
+                result = func(self, *call_args, **kwargs)
+        finally:
+            self._accessor_depth -= 1
+            if outermost:
+                self.query_timings.append((func.__name__, start, time.monotonic()))
+
+        if key is None:
+            return result
+        self._cache[key] = result
+        if outermost:
+            self.fetched[(func.__name__, args)] = result
+        return _copy_result(result)
+
+    setattr(wrapper, "__memoized__", True)
+    return wrapper
+
 
 class DatabaseContext:
     """Context object passed to Jinja2 templates during database sync.
@@ -13,6 +124,13 @@ class DatabaseContext:
 
     Subclasses override description(), columns(), and partition_columns()
     to fetch warehouse-specific metadata (e.g. BigQuery partition info).
+
+    Accessors listed in CACHED_ACCESSORS are memoized per instance, so each
+    one hits the warehouse at most once per table no matter how many templates
+    (or other accessors) call it. Subclass overrides are wrapped automatically.
+    Uncached calls are timed in query_timings as (accessor, start, end), run
+    through `governor` when the database has query limits, and retried per
+    `retry_policy` when they fail with a transient error.
     """
 
     def __init__(self, conn: BaseBackend, schema: str, table_name: str):
@@ -20,6 +138,64 @@ class DatabaseContext:
         self._schema = schema
         self._table_name = table_name
         self._table_ref = None
+        self._cache: dict[tuple, Any] = {}
+        self._accessor_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.query_timings: list[tuple[str, float, float]] = []
+        # Results of top-level accessor calls, keyed by (accessor, arguments), for the metadata snapshot
+        self.fetched: dict[tuple[str, tuple], Any] = {}
+        # Preview limits applied in the SQL projection (set from the database config)
+        self.preview_max_columns: int | None = None
+        self.preview_max_chars: int | None = None
+        # Enforces the database's query limits on uncached accessor calls (None means unlimited)
+        self.governor: QueryGovernor | None = None
+        # Retries transient query errors (None fails on the first error)
+        self.retry_policy: RetryPolicy | None = None
+        self.retries = 0
+        # Set by cancel(); a timed-out render must not send further queries or retries
+        self.cancelled = False
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        for name in CACHED_ACCESSORS:
+            method = cls.__dict__.get(name)
+            if callable(method) and not getattr(method, "__memoized__", False):
+                setattr(cls, name, _memoized(method))
+
+    def seed(self, accessor: str, result: Any, *args: Any, **kwargs: Any) -> None:
+        """Store the result of an accessor call fetched elsewhere (e.g. by a per-schema batch
+        query), so the call is answered from the cache instead of querying the table."""
+        func = getattr(type(self), accessor).__wrapped__
+        bound = _bound_args(inspect.signature(func), self, args, kwargs)
+        self._cache[(func.__qualname__, bound)] = result
+        self.fetched[(accessor, bound)] = result
+
+    def _run_query(self, accessor: str, args: tuple, query: Callable[[], Any]) -> Any:
+        """Run an uncached top-level accessor under the query limits, retrying transient errors.
+
+        Args:
+            accessor: Accessor name (e.g. "preview")
+            args: The call's bound arguments as (name, value) pairs
+            query: Runs the accessor against the warehouse
+        """
+
+        def attempt() -> Any:
+            if self.cancelled:
+                raise QueryCancelledError(f"Query for {self._schema}.{self._table_name} was cancelled")
+            return query()
+
+        run = attempt
+        if self.governor is not None:
+            run = functools.partial(self.governor.run, accessor, self._schema, self._table_name, attempt)
+        if self.retry_policy is None:
+            return run()
+        # The governor retries throttled queries itself; only transient errors are retried here
+        return call_with_retry(run, self.retry_policy, on_retry=self._on_retry, retry_throttling=self.governor is None)
+
+    def _on_retry(self, error: BaseException) -> None:
+        self.retries += 1
+        logger.debug("Retrying query for %s.%s after transient error: %s", self._schema, self._table_name, error)
 
     @property
     def table(self):
@@ -27,6 +203,25 @@ class DatabaseContext:
             self._table_ref = self._conn.table(self._table_name, database=self._schema)
         return self._table_ref
 
+    def cancel(self) -> None:
+        """Best-effort cancellation of a query running on this context's connection.
+
+        Called from another thread when a render times out. Uses the DB-API
+        connection's interrupt()/cancel() when the driver provides one, and
+        stops the context from sending any further query or retry.
+        """
+        self.cancelled = True
+        raw_conn = getattr(self._conn, "con", None)
+        for method_name in ("interrupt", "cancel"):
+            method = getattr(raw_conn, method_name, None)
+            if callable(method):
+                try:
+                    method()
+                except Exception:
+                    logger.debug("Failed to cancel query for %s.%s", self._schema, self._table_name)
+                return
+
+    @_memoized
     def columns(self) -> list[dict[str, Any]]:
         """Return column metadata: name, type, nullable, description."""
         schema = self.table.schema()
@@ -48,30 +243,51 @@ class DatabaseContext:
             return f"{raw[1:]} NOT NULL"
         return raw
 
+    @_memoized
     def preview(self, limit: int = 10) -> list[dict[str, Any]]:
-        """Return the first N rows as a list of dictionaries."""
-        df = self.table.limit(limit).execute()
-        rows = []
-        for _, row in df.iterrows():
-            row_dict = row.to_dict()
-            for key, val in row_dict.items():
-                if val is not None and not isinstance(val, (str, int, float, bool, list, dict)):
-                    row_dict[key] = str(val)
-            rows.append(row_dict)
-        return rows
+        """Return the first N rows as a list of dictionaries.
+
+        Only the first `preview_max_columns` columns are selected, and string/JSON
+        values are cut to `preview_max_chars` by the database so oversized cells
+        are never transferred.
+        """
+        table = self.table
+        if self.preview_max_columns is None and self.preview_max_chars is None:
+            df = table.limit(limit).execute()
+        else:
+            schema = table.schema()
+            names = list(schema.names)[: self.preview_max_columns]
+            projection = [self._truncated_column(table, name, schema[name]) for name in names]
+            df = table.select(projection).limit(limit).execute()
+        return preview_rows(df)
+
+    def _truncated_column(self, table, name: str, dtype):
+        """Select a column, truncating string and JSON values to preview_max_chars."""
+        column = table[name]
+        if self.preview_max_chars is None:
+            return column
+        if dtype.is_json():
+            column = column.cast("string")
+        elif not dtype.is_string():
+            return column
+        return column.substr(0, self.preview_max_chars).name(name)
 
+    @_memoized
     def row_count(self) -> int:
         """Return the total number of rows in the table."""
         return self.table.count().execute()
 
+    @_memoized
     def column_count(self) -> int:
         """Return the number of columns in the table."""
         return len(self.table.schema())
 
+    @_memoized
     def partition_columns(self) -> list[str]:
         """Return partition/clustering column names if available."""
         return []
 
+    @_memoized
     def description(self) -> str | None:
         """Return the table description if available."""
         return None
@@ -127,7 +127,7 @@ class DatabricksConfig(DatabaseConfig):
         """Get the database name for Databricks."""
         return self.catalog or "main"
 
-    def get_schemas(self, conn: BaseBackend) -> list[str]:
+    def list_schemas(self, conn: BaseBackend) -> list[str]:
         if self.schema_name:
             return [self.schema_name]
         list_databases = getattr(conn, "list_databases", None)
@@ -0,0 +1,209 @@
+"""Query rate and scan budget enforcement for database sync."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, TypeVar
+
+if TYPE_CHECKING:
+    from .base import QueryLimits
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Accessors that read table data; their scan cost is charged against max_bytes_scanned.
+SCAN_QUERY_ACCESSORS = frozenset({"preview", "row_count"})
+
+# Exception types drivers raise when a query is rejected for rate/quota reasons
+# (google-api-core for BigQuery, botocore error codes for Athena)
+THROTTLING_ERROR_TYPES = frozenset(
+    {"TooManyRequests", "ResourceExhausted", "ThrottlingException", "TooManyRequestsException"}
+)
+
+# Driver error codes for rate/quota rejections: HTTP 429, BigQuery error reasons,
+# botocore error codes, Trino error names and Postgres/Redshift SQLSTATEs
+THROTTLING_ERROR_CODES = frozenset(
+    {
+        "429",
+        "rateLimitExceeded",
+        "quotaExceeded",
+        "jobRateLimitExceeded",
+        "ThrottlingException",
+        "TooManyRequestsException",
+        "SlowDown",
+        "QUERY_QUEUE_FULL",
+        "53300",
+    }
+)
+
+MAX_THROTTLE_RETRIES = 5
+THROTTLE_BACKOFF_SECONDS = 1.0
+MAX_THROTTLE_BACKOFF_SECONDS = 30.0
+
+
+class QueryBudgetExceededError(RuntimeError):
+    """Raised when a scan would exceed the sync's max_bytes_scanned budget."""
+
+
+def error_codes(error: BaseException) -> set[str]:
+    """Collect the status/error codes a driver attached to an exception."""
+    codes: set[str] = set()
+    for attr in ("code", "status_code", "pgcode", "sqlstate", "error_name"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            codes.add(str(int(value)))
+        elif isinstance(value, str):
+            codes.add(value)
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        codes.add(str(response.get("Error", {}).get("Code")))
+    elif response is not None:
+        codes.add(str(getattr(response, "status_code", None)))
+    details = getattr(error, "errors", None)
+    if isinstance(details, list):
+        codes.update(str(detail.get("reason")) for detail in details if isinstance(detail, dict))
+    return codes
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    """Check whether a driver rejected a query for rate/quota reasons.
+
+    Matches exception types and error codes rather than message text, so an
+    ordinary error that merely mentions a number like 429 is not retried.
+    """
+    seen: set[int] = set()
+    current: BaseException | None = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if any(cls.__name__ in THROTTLING_ERROR_TYPES for cls in type(current).__mro__):
+            return True
+        if error_codes(current) & THROTTLING_ERROR_CODES:
+            return True
+        current = current.__cause__ or current.__context__
+    return False
+
+
+class QueryGovernor:
+    """Enforces a database's QueryLimits on the queries issued during sync.
+
+    Accessor queries, schema listing and batch metadata queries all run
+    through `run`. Queries wait for a rate-limit slot, and for one of the
+    max_concurrent_queries slots, before running. The rate adapts AIMD-style:
+    it is halved when a query is throttled (which is then retried after a
+    backoff) and grows back additively while queries succeed.
+
+    Scan accessors are charged the backend's estimate of the table scan
+    (where one is available) against max_bytes_scanned.
+    """
+
+    def __init__(
+        self,
+        limits: QueryLimits,
+        estimate_scan_bytes: Callable[[str, str], int | None] | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limits = limits
+        self._estimate_scan_bytes = estimate_scan_bytes
+        self._sleep = sleep
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+        self._charged: set[tuple[str, str]] = set()
+        self._slots = (
+            threading.BoundedSemaphore(limits.max_concurrent_queries) if limits.max_concurrent_queries else None
+        )
+
+        self.rate = limits.max_queries_per_second or 0.0
+        """Current queries-per-second limit (0 when the rate is not limited)"""
+
+        self.bytes_scanned = 0
+        """Estimated bytes charged against max_bytes_scanned"""
+
+        self.throttled = 0
+        """Count of queries rejected by the warehouse for rate/quota reasons"""
+
+        self.budget_exhausted = False
+        """Whether a scan was refused because the bytes budget ran out"""
+
+    def run(self, accessor: str, schema: str, table: str, fn: Callable[[], T]) -> T:
+        """Run one query under the limits, retrying it when throttled.
+
+        Args:
+            accessor: The accessor (or other query kind, e.g. "list_tables") issuing the query
+            schema: The schema queried
+            table: The table queried ("" for schema-level queries)
+            fn: Runs the query
+        """
+        if accessor in SCAN_QUERY_ACCESSORS:
+            self._charge_scan(schema, table)
+
+        attempt = 0
+        while True:
+            self._acquire()
+            try:
+                if self._slots is None:
+                    result = fn()
+                else:
+                    with self._slots:
+                        result = fn()
+            except Exception as e:
+                if not is_throttling_error(e) or attempt >= MAX_THROTTLE_RETRIES:
+                    raise
+                self._on_throttled()
+                self._sleep(min(THROTTLE_BACKOFF_SECONDS * 2**attempt, MAX_THROTTLE_BACKOFF_SECONDS))
+                attempt += 1
+                continue
+            self._on_success()
+            return result
+
+    def _charge_scan(self, schema: str, table: str) -> None:
+        """Charge a table's scan estimate once, refusing it if it would exceed the budget."""
+        budget = self.limits.max_bytes_scanned
+        if budget is None or self._estimate_scan_bytes is None:
+            return
+        with self._lock:
+            if (schema, table) in self._charged:
+                return
+        try:
+            estimate = self._estimate_scan_bytes(schema, table) or 0
+        except Exception as e:
+            # The estimate only gates the scan; an unknown estimate neither charges nor refuses it
+            logger.debug("Could not estimate the scan of %s.%s: %s", schema, table, e)
+            return
+        with self._lock:
+            if (schema, table) in self._charged:
+                return
+            if self.bytes_scanned + estimate > budget:
+                self.budget_exhausted = True
+                raise QueryBudgetExceededError(
+                    f"scanning {schema}.{table} (~{estimate:,} bytes) would exceed max_bytes_scanned ({budget:,})"
+                )
+            self._charged.add((schema, table))
+            self.bytes_scanned += estimate
+
+    def _acquire(self) -> None:
+        if not self.rate:
+            return
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next_start)
+            self._next_start = start + 1 / self.rate
+        if start > now:
+            self._sleep(start - now)
+
+    def _on_success(self) -> None:
+        with self._lock:
+            if self.rate:
+                max_rate = self.limits.max_queries_per_second or self.rate
+                self.rate = min(max_rate, self.rate + max_rate / 10)
+
+    def _on_throttled(self) -> None:
+        with self._lock:
+            self.throttled += 1
+            if self.rate:
+                max_rate = self.limits.max_queries_per_second or self.rate
+                self.rate = max(max_rate / 100, self.rate / 2)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import re
+from fnmatch import translate
+from functools import lru_cache
+
+
+def _compile(patterns: list[str], flags: int) -> re.Pattern[str] | None:
+    """Combine glob patterns into a single alternation regex, or None when there are none."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{translate(pattern)})" for pattern in patterns), flags)
+
+
+class PatternMatcher:
+    """Include/exclude glob patterns compiled once into combined regexes.
+
+    Patterns use fnmatch syntax against ``schema.table`` names. Schema-level
+    pruning is derived from the same patterns so whole schemas can be skipped
+    before their tables are listed.
+    """
+
+    def __init__(self, include: list[str], exclude: list[str], case_sensitive: bool = True):
+        flags = 0 if case_sensitive else re.IGNORECASE
+        self._include = _compile(include, flags)
+        self._exclude = _compile(exclude, flags)
+
+        # A dotless include pattern (e.g. '*users') may match any schema, so it disables include pruning
+        schema_includes = [p.split(".", 1)[0] for p in include]
+        self._schema_include = None if any("." not in p for p in include) else _compile(schema_includes, flags)
+        # Only 'schema.*' excludes rule out every table of a schema
+        self._schema_exclude = _compile([p[:-2] for p in exclude if p.endswith(".*") and "." not in p[:-2]], flags)
+
+    def matches(self, schema: str, table: str) -> bool:
+        """Check if schema.table is included and not excluded."""
+        full_name = f"{schema}.{table}"
+        if self._include is not None and not self._include.match(full_name):
+            return False
+        if self._exclude is not None and self._exclude.match(full_name):
+            return False
+        return True
+
+    def schema_may_match(self, schema: str) -> bool:
+        """Check if any table of the schema could match; False means the schema can be skipped entirely."""
+        if self._schema_include is not None and not self._schema_include.match(schema):
+            return False
+        if self._schema_exclude is not None and self._schema_exclude.match(schema):
+            return False
+        return True
+
+
+@lru_cache(maxsize=32)
+def compile_matcher(include: tuple[str, ...], exclude: tuple[str, ...], case_sensitive: bool = True) -> PatternMatcher:
+    """Return a compiled matcher, reusing it across calls with the same patterns."""
+    return PatternMatcher(list(include), list(exclude), case_sensitive)
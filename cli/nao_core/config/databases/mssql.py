@@ -106,7 +106,7 @@ class MssqlConfig(DatabaseConfig):
         """Get the database name for MSSQL."""
         return self.database
 
-    def get_schemas(self, conn: BaseBackend) -> list[str]:
+    def list_schemas(self, conn: BaseBackend) -> list[str]:
         if self.schema_name:
             return [self.schema_name]
         list_databases = getattr(conn, "list_databases", None)
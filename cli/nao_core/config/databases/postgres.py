@@ -7,7 +7,7 @@ from pydantic import Field
 from nao_core.config.exceptions import InitError
 from nao_core.ui import ask_text
 
-from .base import DatabaseConfig
+from .base import DatabaseConfig, group_tables_by_schema, pg_table_descriptions
 from .context import DatabaseContext
 
 
@@ -112,7 +112,7 @@ class PostgresConfig(DatabaseConfig):
         """Get the database name for Postgres."""
         return self.database
 
-    def get_schemas(self, conn: BaseBackend) -> list[str]:
+    def list_schemas(self, conn: BaseBackend) -> list[str]:
         if self.schema_name:
             return [self.schema_name]
         list_databases = getattr(conn, "list_databases", None)
@@ -122,6 +122,24 @@ class PostgresConfig(DatabaseConfig):
             return [s for s in schemas if s not in ("pg_catalog", "information_schema") and not s.startswith("pg_")]
         return []
 
+    def list_tables_bulk(self, conn: BaseBackend, schemas: list[str]) -> dict[str, list[str]] | None:
+        query = """
+            SELECT table_schema, table_name
+            FROM information_schema.tables
+            WHERE table_schema NOT IN ('pg_catalog', 'information_schema')
+        """
+        rows = conn.raw_sql(query).fetchall()  # type: ignore
+        return group_tables_by_schema(rows, schemas)
+
+    def prefetch_schema(
+        self, conn: BaseBackend, schema: str, tables: list[str], accessors: set[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch the descriptions of all tables in the schema with one pg_catalog query."""
+        if "description" not in accessors:
+            return {}
+        descriptions = pg_table_descriptions(conn, schema)
+        return {table: {"description": descriptions.get(table)} for table in tables}
+
     def create_context(self, conn: BaseBackend, schema: str, table_name: str) -> PostgresDatabaseContext:
         return PostgresDatabaseContext(conn, schema, table_name)
 
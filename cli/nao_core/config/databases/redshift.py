@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Any, Literal
 
 import ibis
+import pandas as pd
 from ibis import BaseBackend
 from pydantic import BaseModel, Field
 from sshtunnel import SSHTunnelForwarder
@@ -9,31 +10,41 @@ from sshtunnel import SSHTunnelForwarder
 from nao_core.config.exceptions import InitError
 from nao_core.ui import ask_confirm, ask_text
 
-from .base import DatabaseConfig
-from .context import DatabaseContext
+from .base import DatabaseConfig, group_tables_by_schema, pg_table_descriptions
+from .context import DatabaseContext, preview_rows
+
+# Redshift data types LEFT() can truncate in preview projections
+CHARACTER_TYPES = ("character varying", "character", "text")
 
 
 class RedshiftDatabaseContext(DatabaseContext):
     """Redshift-specific context that bypasses Ibis's problematic pg_enum queries."""
 
+    _information_schema_rows: list[tuple] | None = None
+
+    def _column_rows(self) -> list[tuple]:
+        """Rows of information_schema.columns for the table, queried once per context."""
+        if self._information_schema_rows is None:
+            query = f"""
+                SELECT 
+                    column_name,
+                    data_type,
+                    is_nullable,
+                    character_maximum_length,
+                    numeric_precision,
+                    numeric_scale
+                FROM information_schema.columns
+                WHERE table_schema = '{self._schema}'
+                  AND table_name = '{self._table_name}'
+                ORDER BY ordinal_position
+            """
+            self._information_schema_rows = self._conn.raw_sql(query).fetchall()  # type: ignore[union-attr]
+        return self._information_schema_rows
+
     def columns(self) -> list[dict[str, Any]]:
         """Return column metadata by querying information_schema directly."""
         col_descs = self._fetch_column_descriptions()
-
-        query = f"""
-            SELECT 
-                column_name,
-                data_type,
-                is_nullable,
-                character_maximum_length,
-                numeric_precision,
-                numeric_scale
-            FROM information_schema.columns
-            WHERE table_schema = '{self._schema}'
-              AND table_name = '{self._table_name}'
-            ORDER BY ordinal_position
-        """
-        result = self._conn.raw_sql(query).fetchall()  # type: ignore[union-attr]
+        result = self._column_rows()
 
         columns = []
         for row in result:
@@ -92,24 +103,30 @@ class RedshiftDatabaseContext(DatabaseContext):
     def preview(self, limit: int = 10) -> list[dict[str, Any]]:
         """Return the first N rows as a list of dictionaries."""
         # Use raw SQL to avoid Ibis's pg_enum queries
-        query = f'SELECT * FROM "{self._schema}"."{self._table_name}" LIMIT {limit}'
-        result = self._conn.raw_sql(query).fetchall()  # type: ignore[union-attr]
+        if self.preview_max_columns is None and self.preview_max_chars is None:
+            projection = "*"
+        else:
+            data_types = {row[0]: row[1] for row in self._column_rows()}
+            projection = ", ".join(
+                self._preview_column(col["name"], data_types.get(col["name"], ""))
+                for col in self.columns()[: self.preview_max_columns]
+            )
+        query = f'SELECT {projection} FROM "{self._schema}"."{self._table_name}" LIMIT {limit}'
+        cursor = self._conn.raw_sql(query)  # type: ignore[union-attr]
+        col_names = [desc[0] for desc in cursor.description]
+        # dtype=object keeps the driver's Python values (no int -> float upcasting on NULLs)
+        return preview_rows(pd.DataFrame(cursor.fetchall(), columns=col_names, dtype=object))
 
-        # Get column names from the columns metadata
-        columns = self.columns()
-        col_names = [col["name"] for col in columns]
+    def _preview_column(self, name: str, data_type: str) -> str:
+        """Quote a column for the preview projection, truncating character columns to preview_max_chars.
 
-        rows = []
-        for row in result:
-            row_dict = {}
-            for i, col_name in enumerate(col_names):
-                val = row[i] if i < len(row) else None
-                if val is not None and not isinstance(val, (str, int, float, bool, list, dict)):
-                    row_dict[col_name] = str(val)
-                else:
-                    row_dict[col_name] = val
-            rows.append(row_dict)
-        return rows
+        Checks the raw Redshift data_type: columns() reports every unmapped type
+        (numeric, super, varbyte, ...) as "string", and LEFT() fails on those.
+        """
+        quoted = '"' + name.replace('"', '""') + '"'
+        if self.preview_max_chars is not None and data_type in CHARACTER_TYPES:
+            return f"LEFT({quoted}, {self.preview_max_chars}) AS {quoted}"
+        return quoted
 
     def row_count(self) -> int:
         """Return the total number of rows in the table."""
@@ -275,7 +292,7 @@ class RedshiftConfig(DatabaseConfig):
         """Get the database name for Redshift."""
         return self.database
 
-    def get_schemas(self, conn: BaseBackend) -> list[str]:
+    def list_schemas(self, conn: BaseBackend) -> list[str]:
         """Get all schemas in the current database."""
         if self.schema_name:
             return [self.schema_name]
@@ -296,6 +313,24 @@ class RedshiftConfig(DatabaseConfig):
             list_databases = getattr(conn, "list_databases", None)
             return list_databases() if list_databases else ["public"]
 
+    def list_tables_bulk(self, conn: BaseBackend, schemas: list[str]) -> dict[str, list[str]] | None:
+        query = """
+            SELECT table_schema, table_name
+            FROM information_schema.tables
+            WHERE table_schema NOT IN ('pg_catalog', 'information_schema')
+        """
+        rows = conn.raw_sql(query).fetchall()  # type: ignore
+        return group_tables_by_schema(rows, schemas)
+
+    def prefetch_schema(
+        self, conn: BaseBackend, schema: str, tables: list[str], accessors: set[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch the descriptions of all tables in the schema with one pg_catalog query."""
+        if "description" not in accessors:
+            return {}
+        descriptions = pg_table_descriptions(conn, schema)
+        return {table: {"description": descriptions.get(table)} for table in tables}
+
     def create_context(self, conn: BaseBackend, schema: str, table_name: str) -> RedshiftDatabaseContext:
         """Create a Redshift-specific database context that avoids pg_enum queries."""
         return RedshiftDatabaseContext(conn, schema, table_name)
@@ -0,0 +1,127 @@
+"""Classified retry with exponential backoff for warehouse queries."""
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, TypeVar
+
+from .governor import error_codes, is_throttling_error
+
+T = TypeVar("T")
+
+# Errors that will fail again no matter how often they are retried. Checked first.
+# Whole phrases, so table or column names (e.g. "author") do not match.
+FATAL_MARKERS = (
+    "authentication failed",
+    "authentication error",
+    "invalid credentials",
+    "incorrect username or password",
+    "permission denied",
+    "access denied",
+    "insufficient privileges",
+    "not authorized",
+    "unauthorized",
+    "forbidden",
+    "syntax error",
+    "parse error",
+    "does not exist",
+    "not found",
+    "invalid identifier",
+)
+
+# HTTP statuses for rejected credentials or permissions
+FATAL_ERROR_CODES = frozenset({"401", "403"})
+
+# Transient conditions: dropped connections, unavailable services, warehouses resuming.
+# Whole phrases, so numbers or words in table names and quoted SQL do not match.
+TRANSIENT_MARKERS = (
+    "service unavailable",
+    "bad gateway",
+    "gateway timeout",
+    "temporarily unavailable",
+    "connection reset",
+    "connection aborted",
+    "connection refused",
+    "connection closed",
+    "broken pipe",
+    "connection timed out",
+    "read timed out",
+    "request timed out",
+    "deadlock detected",
+    "is resuming",
+    "is starting",
+    "please try again",
+)
+
+# Driver error codes for transient conditions: HTTP 502/503/504 and Postgres/Redshift
+# SQLSTATEs for dropped connections (08xxx), deadlocks and administrator restarts
+TRANSIENT_ERROR_CODES = frozenset({"502", "503", "504", "08000", "08003", "08006", "40P01", "57P01"})
+
+
+def is_retryable_error(error: BaseException, retry_throttling: bool = True) -> bool:
+    """Classify an exception from a warehouse query as transient (retry) or permanent (fail fast).
+
+    Args:
+        error: The exception raised by the query
+        retry_throttling: Whether rate/quota rejections count as transient. False when a
+            QueryGovernor already retries them, so throttled queries are not retried twice.
+    """
+    if is_throttling_error(error):
+        return retry_throttling
+    message = f"{type(error).__name__}: {error}".lower()
+    codes = error_codes(error)
+    if any(marker in message for marker in FATAL_MARKERS) or codes & FATAL_ERROR_CODES:
+        return False
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return bool(codes & TRANSIENT_ERROR_CODES) or any(marker in message for marker in TRANSIENT_MARKERS)
+
+
+@dataclass
+class RetryPolicy:
+    """How transient query errors are retried."""
+
+    max_retries: int = 3
+    """Retries after the first attempt (0 disables retrying)"""
+
+    base_delay: float = 0.5
+    """Backoff before the first retry, doubled for each subsequent one"""
+
+    max_delay: float = 30.0
+    """Upper bound on a single backoff"""
+
+    def backoff(self, retry: int) -> float:
+        """Delay before the given retry (0-based), with full jitter."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+
+def call_with_retry(
+    fn: Callable[[], T],
+    policy: RetryPolicy,
+    on_retry: Callable[[BaseException], None] | None = None,
+    sleep: Callable[[float], None] = time.sleep,
+    retry_throttling: bool = True,
+) -> T:
+    """Call fn, retrying retryable errors with exponential backoff and jitter.
+
+    Args:
+        fn: Zero-argument callable issuing the query
+        policy: Retry limits and backoff
+        on_retry: Called with the error before each retry (e.g. to count retries)
+        sleep: Sleep function (injectable for tests)
+        retry_throttling: Whether to retry rate/quota rejections (see is_retryable_error)
+
+    Returns:
+        The return value of fn
+    """
+    retry = 0
+    while True:
+        try:
+            return fn()
+        except Exception as e:
+            if retry >= policy.max_retries or not is_retryable_error(e, retry_throttling):
+                raise
+            if on_retry is not None:
+                on_retry(e)
+            sleep(policy.backoff(retry))
+            retry += 1
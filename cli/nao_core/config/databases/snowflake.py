@@ -1,7 +1,7 @@
 import logging
 import os
 import re
-from typing import Any, Literal
+from typing import Any, ClassVar, Literal
 
 import ibis
 from cryptography.hazmat.backends import default_backend
@@ -12,7 +12,7 @@ from pydantic import Field
 from nao_core.config.exceptions import InitError
 from nao_core.ui import UI, ask_confirm, ask_text
 
-from .base import DatabaseConfig
+from .base import DatabaseConfig, group_tables_by_schema
 from .context import DatabaseContext
 
 logger = logging.getLogger(__name__)
@@ -41,6 +41,13 @@ class SnowflakeDatabaseContext(DatabaseContext):
             pass
         return None
 
+    def cancel(self) -> None:
+        self.cancelled = True
+        try:
+            self._conn.raw_sql("SELECT SYSTEM$CANCEL_ALL_QUERIES(CURRENT_SESSION())")  # type: ignore
+        except Exception:
+            logger.debug("Failed to cancel queries for %s.%s", self._schema, self._table_name)
+
     def columns(self) -> list[dict[str, Any]]:
         cols = super().columns()
         try:
@@ -108,6 +115,9 @@ class SnowflakeConfig(DatabaseConfig):
         description="Authentication method (e.g., 'externalbrowser' for SSO)",
     )
 
+    # Unquoted Snowflake identifiers are case-insensitive (stored upper case)
+    case_sensitive_patterns: ClassVar[bool] = False
+
     @classmethod
     def promptConfig(cls) -> "SnowflakeConfig":
         """Interactively prompt the user for Snowflake configuration."""
@@ -188,55 +198,21 @@ class SnowflakeConfig(DatabaseConfig):
         """Get the database name for Snowflake."""
         return self.database
 
-    def matches_pattern(self, schema: str, table: str) -> bool:
-        """Check if a schema.table matches the include/exclude patterns.
-
-        Snowflake identifier matching is case-insensitive.
-        """
-        from fnmatch import fnmatch
-
-        full_name = f"{schema}.{table}"
-        full_name_lower = full_name.lower()
-
-        # If include patterns exist, table must match at least one
-        if self.include:
-            included = any(fnmatch(full_name_lower, pattern.lower()) for pattern in self.include)
-            if not included:
-                return False
-
-        # If exclude patterns exist, table must not match any
-        if self.exclude:
-            excluded = any(fnmatch(full_name_lower, pattern.lower()) for pattern in self.exclude)
-            if excluded:
-                return False
-
-        return True
-
-    def _schema_matches(self, schema: str) -> bool:
-        """Check if a schema could have any matching tables based on include/exclude patterns."""
-        from fnmatch import fnmatch
-
-        schema_lower = schema.lower()
-
-        if self.include:
-            included = any(fnmatch(schema_lower, p.split(".")[0].lower()) for p in self.include)
-            if not included:
-                return False
-
-        if self.exclude:
-            excluded = any(fnmatch(schema_lower, p.split(".")[0].lower()) for p in self.exclude if p.endswith(".*"))
-            if excluded:
-                return False
-
-        return True
-
-    def get_schemas(self, conn: BaseBackend) -> list[str]:
+    def list_schemas(self, conn: BaseBackend) -> list[str]:
         if self.schema_name:
             return [self.schema_name.upper()]
         list_databases = getattr(conn, "list_databases", None)
         schemas = list_databases() if list_databases else []
-        schemas = [s for s in schemas if s != "INFORMATION_SCHEMA"]
-        return [s for s in schemas if self._schema_matches(s)]
+        return [s for s in schemas if s != "INFORMATION_SCHEMA"]
+
+    def list_tables_bulk(self, conn: BaseBackend, schemas: list[str]) -> dict[str, list[str]] | None:
+        """List tables and views of all schemas in one INFORMATION_SCHEMA query instead of SHOW per schema."""
+        query = """
+            SELECT TABLE_SCHEMA, TABLE_NAME FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA != 'INFORMATION_SCHEMA'
+        """
+        rows = conn.raw_sql(query).fetchall()  # type: ignore
+        return group_tables_by_schema(rows, schemas)
 
     def create_context(self, conn: BaseBackend, schema: str, table_name: str) -> SnowflakeDatabaseContext:
         return SnowflakeDatabaseContext(conn, schema, table_name)
@@ -7,7 +7,7 @@ from pydantic import Field
 from nao_core.config.exceptions import InitError
 from nao_core.ui import ask_text
 
-from .base import DatabaseConfig
+from .base import DatabaseConfig, explain_scan_bytes, quote_identifier
 
 EXCLUDED_SCHEMAS = {"information_schema", "default", "sys", "pg_catalog", "test"}
 
@@ -81,7 +81,10 @@ class TrinoConfig(DatabaseConfig):
         """Get the database name for Trino."""
         return self.catalog
 
-    def get_schemas(self, conn: BaseBackend) -> list[str]:
+    def estimate_scan_bytes(self, conn: BaseBackend, schema: str, table_name: str) -> int | None:
+        return explain_scan_bytes(conn, f"SELECT * FROM {quote_identifier(self.catalog, schema, table_name)}")
+
+    def list_schemas(self, conn: BaseBackend) -> list[str]:
         if self.schema_name:
             return [self.schema_name]
 
@@ -8,6 +8,16 @@ class NotionConfig(BaseModel):
 
     api_key: str = Field(description="The API key to use")
     pages: list[str] = Field(description="The pages to sync")
+    databases: list[str] = Field(default_factory=list, description="The databases whose pages to sync")
+    crawl_depth: int = Field(
+        default=0,
+        ge=0,
+        description="Levels of child pages and databases synced below the configured pages and databases",
+    )
+    cache_ttl: int = Field(
+        default=3600,
+        description="Seconds a cached page is used as is before checking with Notion whether it changed",
+    )
 
     @classmethod
     def promptConfig(cls) -> "NotionConfig":
@@ -19,6 +19,7 @@ from .context import NaoContext, NotionPage, NotionProvider, create_nao_context
 from .engine import TemplateEngine, get_template_engine
 from .render import (
     TemplateRenderResult,
+    create_render_environment,
     discover_templates,
     render_all_templates,
     render_template,
@@ -35,6 +36,7 @@ __all__ = [
     "create_nao_context",
     # Render
     "TemplateRenderResult",
+    "create_render_environment",
     "discover_templates",
     "render_template",
     "render_all_templates",
@@ -0,0 +1,89 @@
+"""Static analysis of the context methods a Jinja2 template calls."""
+
+from typing import Any, NamedTuple
+
+from jinja2 import Environment, meta, nodes
+
+
+class AccessorCall(NamedTuple):
+    """A `<variable>.<name>(...)` call found in a template."""
+
+    name: str
+    args: tuple[Any, ...] = ()
+    kwargs: tuple[tuple[str, Any], ...] = ()
+    dynamic: bool = False
+    """Whether some argument is only known at render time (args/kwargs then omit it)"""
+
+
+class TemplateCalls(NamedTuple):
+    """Result of analyzing one template."""
+
+    calls: frozenset[AccessorCall]
+    includes: tuple[str, ...]
+    """Templates pulled in through include/import/extends, which share the render context"""
+
+    opaque: bool
+    """Whether the variable is used other than through method calls (passed to a macro,
+    aliased, ...) so that `calls` may be incomplete"""
+
+
+def _const(node: nodes.Expr, eval_ctx: nodes.EvalContext) -> tuple[bool, Any]:
+    try:
+        return True, node.as_const(eval_ctx)
+    except nodes.Impossible:
+        return False, None
+
+
+def analyze_template(env: Environment, source: str, variable: str, name: str | None = None) -> TemplateCalls:
+    """Find the `<variable>.<method>(...)` calls in a template source.
+
+    Args:
+        env: Environment the template is parsed with
+        source: Template source
+        variable: Name of the context variable to track (e.g. "db")
+        name: Template name, used in syntax errors
+    """
+    ast = env.parse(source, name)
+    eval_ctx = nodes.EvalContext(env, name)
+
+    calls: set[AccessorCall] = set()
+    method_targets: set[int] = set()
+    for call in ast.find_all(nodes.Call):
+        target = call.node
+        if not (isinstance(target, nodes.Getattr) and isinstance(target.node, nodes.Name)):
+            continue
+        if target.node.name != variable:
+            continue
+        method_targets.add(id(target.node))
+
+        dynamic = bool(call.dyn_args or call.dyn_kwargs)
+        args = []
+        for arg in call.args:
+            known, value = _const(arg, eval_ctx)
+            if not known:
+                dynamic = True
+                break
+            args.append(value)
+        kwargs = []
+        for keyword in call.kwargs:
+            known, value = _const(keyword.value, eval_ctx)
+            if not known:
+                dynamic = True
+                continue
+            kwargs.append((keyword.key, value))
+        calls.add(AccessorCall(target.attr, tuple(args), tuple(sorted(kwargs)), dynamic))
+
+    opaque = any(
+        node.name == variable and node.ctx == "load" and id(node) not in method_targets
+        for node in ast.find_all(nodes.Name)
+    )
+
+    includes: list[str] = []
+    for included in meta.find_referenced_templates(ast):
+        if included is None:
+            # Template name computed at render time
+            opaque = True
+        else:
+            includes.append(included)
+
+    return TemplateCalls(frozenset(calls), tuple(includes), opaque)
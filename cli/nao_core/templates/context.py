@@ -10,47 +10,67 @@ Example template usage:
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from functools import cached_property
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from .dependencies import hash_content, record_input
+
 if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from nao_core.commands.sync.providers.notion.cache import NotionPageCache
+    from nao_core.commands.sync.providers.notion.client import NotionSession
     from nao_core.config.base import NaoConfig
 
+# Input key of a Notion page read by a template, for incremental rendering
+NOTION_PAGE_INPUT = "notion.page"
+
 
 @dataclass
 class NotionPage:
-    """Represents a Notion page with lazy-loaded content."""
+    """Represents a Notion page with lazy-loaded content.
+
+    Loading is guarded by a lock, so templates rendered concurrently that
+    reference the same page fetch it only once. With a page cache, pages
+    exported by the sync (or a previous render) are served from disk.
+    """
 
     page_url_or_id: str
     api_key: str
     _data: dict[str, Any] | None = None
+    session: NotionSession | None = field(default=None, repr=False, compare=False)
+    cache: NotionPageCache | None = field(default=None, repr=False, compare=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
 
     def _load(self) -> dict[str, Any]:
-        """Lazily load page data from Notion API."""
-        if self._data is None:
-            from notion2md.exporter.block import StringExporter
-            from notion_client import Client
-
-            from nao_core.commands.sync.providers.notion.provider import (
-                extract_page_id,
-                get_page_title,
-                strip_images,
-            )
+        """Lazily load page data from Notion API, recording it as an input of the rendering template."""
+        data = self._fetch()
+        record_input(f"{NOTION_PAGE_INPUT}:{self.page_url_or_id}", data)
+        return data
+
+    def _fetch(self) -> dict[str, Any]:
+        if self._data is not None:
+            return self._data
+        with self._lock:
+            if self._data is not None:
+                return self._data
+            from nao_core.commands.sync.providers.notion.cache import load_page
+            from nao_core.commands.sync.providers.notion.client import NotionSession
+            from nao_core.commands.sync.providers.notion.provider import extract_page_id
 
             page_id = extract_page_id(self.page_url_or_id)
-            client = Client(auth=self.api_key)
-            title = get_page_title(client, page_id)
-
-            # Export to markdown
-            md_exporter = StringExporter(block_id=page_id, token=self.api_key)
-            markdown = md_exporter.export()
-            markdown = strip_images(markdown)
+            if self.session is None:
+                with NotionSession(self.api_key) as session:
+                    page = load_page(session, page_id, self.cache)
+            else:
+                page = load_page(self.session, page_id, self.cache)
 
             self._data = {
                 "id": page_id,
-                "title": title,
-                "content": markdown,
+                "title": page.title,
+                "content": page.content,
                 "url": f"https://notion.so/{page_id}",
             }
         return self._data
@@ -81,11 +101,24 @@ class NotionPage:
 
 
 class NotionProvider:
-    """Provider interface for accessing Notion data in templates."""
+    """Provider interface for accessing Notion data in templates.
+
+    Pages are cached for the lifetime of the provider, which is shared by all
+    templates of a render run; the cache is safe to use from worker threads.
+    Given a project path, exported pages are also cached on disk (in
+    `.nao/cache/notion/`, shared with `nao sync`) across runs.
+    """
 
-    def __init__(self, config: NaoConfig):
+    def __init__(self, config: NaoConfig, project_path: Path | None = None):
         self._config = config
         self._page_cache: dict[str, NotionPage] = {}
+        self._sessions: dict[str, NotionSession] = {}
+        self._lock = threading.Lock()
+        self._disk_cache: NotionPageCache | None = None
+        if project_path is not None and config.notion is not None:
+            from nao_core.commands.sync.providers.notion.cache import NotionPageCache, get_notion_cache_dir
+
+            self._disk_cache = NotionPageCache(get_notion_cache_dir(project_path), ttl=config.notion.cache_ttl)
 
     def _get_api_key_for_page(self, page_url_or_id: str) -> str:
         """Find the API key that can access a given page.
@@ -127,13 +160,29 @@ class NotionProvider:
             {{ nao.notion.page('https://notion.so/My-Page-abc123').content }}
             {{ nao.notion.page('abc123def456...').title }}
         """
-        if page_url_or_id not in self._page_cache:
-            api_key = self._get_api_key_for_page(page_url_or_id)
-            self._page_cache[page_url_or_id] = NotionPage(
-                page_url_or_id=page_url_or_id,
-                api_key=api_key,
-            )
-        return self._page_cache[page_url_or_id]
+        with self._lock:
+            if page_url_or_id not in self._page_cache:
+                from nao_core.commands.sync.providers.notion.client import NotionSession
+
+                api_key = self._get_api_key_for_page(page_url_or_id)
+                if api_key not in self._sessions:
+                    # One rate-limited client for all the pages read with this key
+                    self._sessions[api_key] = NotionSession(api_key)
+                self._page_cache[page_url_or_id] = NotionPage(
+                    page_url_or_id=page_url_or_id,
+                    api_key=api_key,
+                    session=self._sessions[api_key],
+                    cache=self._disk_cache,
+                )
+            return self._page_cache[page_url_or_id]
+
+    def close(self) -> None:
+        """Close the Notion sessions opened for the pages read."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
 
 
 class NaoContext:
@@ -148,17 +197,23 @@ class NaoContext:
         {{ nao.config.project_name }}
     """
 
-    def __init__(self, config: NaoConfig):
+    def __init__(self, config: NaoConfig, project_path: Path | None = None):
         self._config = config
+        self._project_path = project_path
+        self._notion: NotionProvider | None = None
+        self._lock = threading.Lock()
 
-    @cached_property
+    @property
     def notion(self) -> NotionProvider:
         """Access Notion pages and databases.
 
         Example:
             {{ nao.notion.page('https://notion.so/...').content }}
         """
-        return NotionProvider(self._config)
+        with self._lock:
+            if self._notion is None:
+                self._notion = NotionProvider(self._config, self._project_path)
+            return self._notion
 
     @property
     def config(self) -> NaoConfig:
@@ -169,6 +224,33 @@ class NaoContext:
         """
         return self._config
 
+    def close(self) -> None:
+        """Release the providers' connections (e.g. Notion sessions) once rendering is done."""
+        with self._lock:
+            notion, self._notion = self._notion, None
+        if notion is not None:
+            notion.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def input_hash(self, key: str) -> str | None:
+        """Return the current content hash of an input recorded while rendering a template.
+
+        Used to decide whether a template can skip re-rendering. Returns None
+        for inputs that can't be resolved anymore (the template is re-rendered).
+        """
+        kind, _, ref = key.partition(":")
+        try:
+            if kind == NOTION_PAGE_INPUT:
+                return hash_content(self.notion.page(ref)._fetch())
+        except Exception:
+            return None
+        return None
+
     # Future providers can be added here:
     # @cached_property
     # def database(self) -> DatabaseProvider:
@@ -181,13 +263,16 @@ class NaoContext:
     #     return RepoProvider(self._config)
 
 
-def create_nao_context(config: NaoConfig) -> NaoContext:
+def create_nao_context(config: NaoConfig, project_path: Path | None = None) -> NaoContext:
     """Create a NaoContext for template rendering.
 
     Args:
         config: The nao configuration.
+        project_path: Path to the nao project root, whose `.nao/` holds the
+            Notion page cache (no cache if omitted).
 
     Returns:
-        A NaoContext instance to be used as `nao` in templates.
+        A NaoContext instance to be used as `nao` in templates. Close it (or use
+        it as a context manager) to release its connections.
     """
-    return NaoContext(config)
+    return NaoContext(config, project_path)
@@ -0,0 +1,172 @@
+"""Dependency tracking for incremental rendering of user templates.
+
+While a template renders, the `nao.*` data it reads (e.g. Notion pages) is
+recorded with a content hash. Together with the hashes of the template, the
+templates it includes and the config, this decides whether the next run can
+skip the template.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from jinja2 import Environment, TemplateNotFound, meta
+
+RENDER_STATE_VERSION = 1
+
+# Source hash recorded for a referenced template that does not exist (e.g. an
+# `{% include ... ignore missing %}` or an unused fallback), so creating it triggers a render
+MISSING_TEMPLATE_HASH = "missing"
+
+# Inputs read by the template currently rendering in this thread: {input key: content hash}
+_recorded_inputs: ContextVar[dict[str, str] | None] = ContextVar("nao_recorded_inputs", default=None)
+
+
+def get_render_state_path(project_path: Path) -> Path:
+    """Get the file persisting template dependencies between runs (under the project's `.nao/`)."""
+    return project_path / ".nao" / "render" / "templates.json"
+
+
+def hash_content(value: Any) -> str:
+    """Hash text, or any JSON-serializable value, for change detection."""
+    if not isinstance(value, (str, bytes)):
+        value = json.dumps(value, sort_keys=True, default=str)
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    return hashlib.sha256(value).hexdigest()
+
+
+def hash_config(config: Any) -> str:
+    """Hash the nao configuration, which every template can read through `nao.config`."""
+    return hash_content(config.model_dump_json())
+
+
+def record_input(key: str, value: Any) -> None:
+    """Record that the rendering template read `value` through the input `key` (e.g. 'notion.page:<id>')."""
+    inputs = _recorded_inputs.get()
+    if inputs is not None and key not in inputs:
+        inputs[key] = hash_content(value)
+
+
+@contextmanager
+def recording_inputs() -> Generator[dict[str, str]]:
+    """Record the inputs read while rendering a template in this thread."""
+    inputs: dict[str, str] = {}
+    token = _recorded_inputs.set(inputs)
+    try:
+        yield inputs
+    finally:
+        _recorded_inputs.reset(token)
+
+
+def template_sources(env: Environment, template_name: str) -> dict[str, str] | None:
+    """Hash a template's source and those of the templates it includes, imports or extends.
+
+    Referenced templates that do not exist are recorded as MISSING_TEMPLATE_HASH.
+
+    Returns:
+        {template name: source hash}, or None when an included template name is
+        only known at render time (such templates are always re-rendered)
+    """
+    assert env.loader is not None
+    sources: dict[str, str] = {}
+    pending = [template_name]
+    while pending:
+        name = pending.pop()
+        if name in sources:
+            continue
+        try:
+            source, _, _ = env.loader.get_source(env, name)
+        except TemplateNotFound:
+            sources[name] = MISSING_TEMPLATE_HASH
+            continue
+        sources[name] = hash_content(source)
+        for referenced in meta.find_referenced_templates(env.parse(source, name)):
+            if referenced is None:
+                return None
+            pending.append(referenced)
+    return sources
+
+
+@dataclass
+class TemplateDependencies:
+    """What a template's last render depended on."""
+
+    sources: dict[str, str]
+    """Source hash of the template and of every template it pulls in"""
+
+    config: str
+    """Hash of the nao configuration"""
+
+    inputs: dict[str, str] = field(default_factory=dict)
+    """Content hash of every `nao.*` input read while rendering"""
+
+    output: str = ""
+    """Hash of the rendered output (a changed or deleted output is rendered again)"""
+
+
+class RenderState:
+    """Template dependencies of the last render run, persisted in `.nao/`."""
+
+    def __init__(self, path: Path, templates: dict[str, TemplateDependencies] | None = None):
+        self.path = path
+        self.templates = templates or {}
+
+    @classmethod
+    def load(cls, path: Path) -> RenderState:
+        """Load the state, starting empty if there is none (or it is from another version)."""
+        try:
+            data = json.loads(path.read_text())
+            if data.get("version") != RENDER_STATE_VERSION:
+                return cls(path)
+            templates = {name: TemplateDependencies(**deps) for name, deps in data["templates"].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return cls(path)
+        return cls(path, templates)
+
+    def save(self) -> None:
+        """Persist the state for the next run."""
+        data = {
+            "version": RENDER_STATE_VERSION,
+            "templates": {name: asdict(deps) for name, deps in sorted(self.templates.items())},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        tmp_path.write_text(json.dumps(data, indent=1) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def is_up_to_date(
+        self,
+        template_name: str,
+        sources: dict[str, str] | None,
+        config_hash: str,
+        output_path: Path,
+        input_hash: Callable[[str], str | None],
+    ) -> bool:
+        """Check whether a template's last render is still valid.
+
+        Args:
+            template_name: Template path relative to the project
+            sources: Current source hashes (see template_sources)
+            config_hash: Current config hash
+            output_path: The template's rendered output file
+            input_hash: Returns the current content hash of a recorded input key
+                (None if the input can no longer be resolved)
+        """
+        deps = self.templates.get(template_name)
+        if deps is None or sources is None or deps.sources != sources or deps.config != config_hash:
+            return False
+        try:
+            if hash_content(output_path.read_bytes()) != deps.output:
+                return False
+        except OSError:
+            return False
+        return all(input_hash(key) == digest for key, digest in deps.inputs.items())
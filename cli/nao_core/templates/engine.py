@@ -1,13 +1,57 @@
 """Template engine for rendering Jinja2 templates with user overrides."""
 
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+import jinja2
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from jinja2.bccache import Bucket
+
+from .analysis import AccessorCall, TemplateCalls, analyze_template
 
 # Path to the default templates shipped with nao
 DEFAULT_TEMPLATES_DIR = Path(__file__).parent / "defaults"
 
+# Engines kept by get_template_engine, least recently used evicted first
+DEFAULT_MAX_ENGINES = 8
+
+
+def get_bytecode_cache_dir(project_path: Path) -> Path:
+    """Get the directory compiled templates are cached in.
+
+    Bytecode is only valid for the Jinja version that compiled it, so each
+    version gets its own directory.
+    """
+    return project_path / ".nao" / "cache" / "jinja" / jinja2.__version__
+
+
+class ProjectBytecodeCache(FileSystemBytecodeCache):
+    """Persistent cache of compiled templates in the project's `.nao/` folder.
+
+    Entries are keyed by template name and file, and hold the checksum of the
+    source they were compiled from: an edited template is compiled again.
+    An unusable cache directory (e.g. a read-only checkout) is not an error.
+    """
+
+    def __init__(self, project_path: Path):
+        super().__init__(str(get_bytecode_cache_dir(project_path)), "%s.cache")
+
+    def load_bytecode(self, bucket: Bucket) -> None:
+        try:
+            super().load_bytecode(bucket)
+        except OSError:
+            pass
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            super().dump_bytecode(bucket)
+        except OSError:
+            pass
+
 
 class TemplateEngine:
     """Jinja2 template engine with support for user overrides.
@@ -40,6 +84,7 @@ class TemplateEngine:
         if self.user_templates_dir and self.user_templates_dir.exists():
             loader_paths.append(self.user_templates_dir)
         loader_paths.append(DEFAULT_TEMPLATES_DIR)
+        self._templates_signature = self._compute_templates_signature()
 
         self.env = Environment(
             loader=FileSystemLoader([str(p) for p in loader_paths]),
@@ -47,11 +92,34 @@ class TemplateEngine:
             trim_blocks=True,
             lstrip_blocks=True,
             keep_trailing_newline=True,
+            bytecode_cache=ProjectBytecodeCache(project_path) if project_path else None,
         )
 
+        # Results of analyze(), per (template name, variable)
+        self._analyses: dict[tuple[str, str], TemplateCalls] = {}
+
         # Register custom filters
         self._register_filters()
 
+    def _compute_templates_signature(self) -> tuple:
+        """Snapshot the template files (and their mtimes) the engine was built from."""
+        files: list[tuple[str, int]] = []
+        for templates_dir in (self.user_templates_dir, DEFAULT_TEMPLATES_DIR):
+            if templates_dir is None:
+                continue
+            for root, _, filenames in os.walk(templates_dir):
+                for filename in filenames:
+                    path = os.path.join(root, filename)
+                    try:
+                        files.append((path, os.stat(path).st_mtime_ns))
+                    except OSError:
+                        continue
+        return (bool(self.user_templates_dir and self.user_templates_dir.is_dir()), tuple(sorted(files)))
+
+    def is_stale(self) -> bool:
+        """Check whether template files were added, removed or modified since the engine was created."""
+        return self._compute_templates_signature() != self._templates_signature
+
     def _register_filters(self) -> None:
         """Register custom Jinja2 filters for templates."""
         import json
@@ -84,6 +152,43 @@ class TemplateEngine:
         template = self.env.get_template(template_name)
         return template.render(**context)
 
+    def analyze(self, template_name: str, variable: str) -> TemplateCalls:
+        """Parse a template once and find the calls it makes on a context variable.
+
+        Args:
+            template_name: Name of the template file
+            variable: Name of the context variable (e.g. 'db')
+        """
+        key = (template_name, variable)
+        if key not in self._analyses:
+            assert self.env.loader is not None
+            source, _, _ = self.env.loader.get_source(self.env, template_name)
+            self._analyses[key] = analyze_template(self.env, source, variable, template_name)
+        return self._analyses[key]
+
+    def accessor_calls(self, template_name: str, variable: str = "db") -> frozenset[AccessorCall] | None:
+        """Return the `<variable>.<method>(...)` calls a template makes, including those of
+        the templates it includes.
+
+        Returns:
+            The calls, or None when they cannot be determined statically (the
+            variable is passed around, or an included template name is dynamic)
+        """
+        calls: set[AccessorCall] = set()
+        pending = [template_name]
+        seen: set[str] = set()
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            analysis = self.analyze(name, variable)
+            if analysis.opaque:
+                return None
+            calls.update(analysis.calls)
+            pending.extend(analysis.includes)
+        return frozenset(calls)
+
     def has_template(self, template_name: str) -> bool:
         """Check if a template exists.
 
@@ -136,20 +241,56 @@ class TemplateEngine:
         return user_template.exists()
 
 
-# Global template engine instance (lazily initialized)
-_engine: TemplateEngine | None = None
+class TemplateEngineRegistry:
+    """Thread-safe registry of template engines, one per project.
+
+    Engines are reused across calls (and threads) for the same project, and
+    rebuilt when the project's template files change on disk. The least
+    recently used engines are evicted beyond `max_size` projects.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_ENGINES):
+        self.max_size = max_size
+        self._engines: OrderedDict[Path | None, TemplateEngine] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, project_path: Path | None = None) -> TemplateEngine:
+        """Get the engine of a project, creating or reloading it as needed."""
+        key = project_path.resolve() if project_path else None
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is not None and not engine.is_stale():
+                self._engines.move_to_end(key)
+                return engine
+
+            engine = TemplateEngine(project_path)
+            self._engines[key] = engine
+            self._engines.move_to_end(key)
+            while len(self._engines) > self.max_size:
+                self._engines.popitem(last=False)
+            return engine
+
+    def clear(self) -> None:
+        """Drop all engines."""
+        with self._lock:
+            self._engines.clear()
+
+    def __len__(self) -> int:
+        return len(self._engines)
+
+
+# Engines shared by the whole process
+_registry = TemplateEngineRegistry()
 
 
 def get_template_engine(project_path: Path | None = None) -> TemplateEngine:
-    """Get or create the template engine.
+    """Get or create the template engine of a project.
 
     Args:
         project_path: Path to the nao project root.
 
     Returns:
-        The template engine instance
+        The template engine instance, shared by every caller for this project
+        until its template files change
     """
-    global _engine
-    if _engine is None or (project_path and _engine.project_path != project_path):
-        _engine = TemplateEngine(project_path)
-    return _engine
+    return _registry.get(project_path)
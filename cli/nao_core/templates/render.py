@@ -5,23 +5,64 @@ making the `nao` object available for accessing provider data.
 
 Template files are rendered to the same location without the `.j2` extension.
 For example: `docs/report.md.j2` → `docs/report.md`
+
+A render run shares one Jinja environment (so compiled templates are reused)
+and one `nao` context (so provider data such as Notion pages is fetched once)
+across all templates, which are rendered concurrently.
+
+Renders are incremental: the inputs of each template (its source, the
+templates it includes, the config and the `nao.*` data it read) are recorded
+in `.nao/`, and a template whose inputs haven't changed is skipped.
 """
 
 from __future__ import annotations
 
+import json
+import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from fnmatch import fnmatchcase
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 from jinja2 import Environment, FileSystemLoader, TemplateError
 
-from .context import create_nao_context
+from .context import NaoContext, create_nao_context
+from .dependencies import (
+    RenderState,
+    TemplateDependencies,
+    get_render_state_path,
+    hash_config,
+    hash_content,
+    recording_inputs,
+    template_sources,
+)
+from .engine import ProjectBytecodeCache
 
 if TYPE_CHECKING:
     from rich.console import Console
 
     from nao_core.config.base import NaoConfig
 
+# Templates rendered concurrently; rendering mostly waits on provider APIs
+DEFAULT_RENDER_WORKERS = 8
+
+# Directory names never searched for templates, at any depth
+DEFAULT_EXCLUDE_DIRS = frozenset(
+    {
+        "templates",  # Don't process accessor template overrides
+        ".git",
+        ".venv",
+        "venv",
+        "node_modules",
+        "__pycache__",
+        ".nao",
+    }
+)
+
+NAOIGNORE_FILENAME = ".naoignore"
+
 
 @dataclass
 class TemplateRenderResult:
@@ -31,61 +72,132 @@ class TemplateRenderResult:
     templates_failed: int
     rendered_files: list[str]
     errors: list[str]
+    templates_skipped: int = 0
 
     def get_summary(self) -> str:
         """Get a human-readable summary of the render result."""
-        if self.templates_rendered == 0 and self.templates_failed == 0:
+        if self.templates_rendered == 0 and self.templates_failed == 0 and self.templates_skipped == 0:
             return "No templates found"
 
         parts = []
         if self.templates_rendered > 0:
             parts.append(f"{self.templates_rendered} rendered")
+        if self.templates_skipped > 0:
+            parts.append(f"{self.templates_skipped} unchanged")
         if self.templates_failed > 0:
             parts.append(f"{self.templates_failed} failed")
         return ", ".join(parts)
 
 
+def load_ignored_dirs(project_path: Path) -> list[str]:
+    """Read the directory patterns (lines ending in `/`) of the project's `.naoignore`.
+
+    File patterns (such as `*.j2`, which hides template sources from the agent)
+    are not applied to template discovery.
+    """
+    try:
+        lines = (project_path / NAOIGNORE_FILENAME).read_text().splitlines()
+    except OSError:
+        return []
+    return [line.strip() for line in lines if line.strip().endswith("/") and not line.startswith(("#", "!"))]
+
+
+def _ignores_dir(pattern: str, name: str, rel_path: str) -> bool:
+    """Match a gitignore-style directory pattern against a directory."""
+    pattern = pattern.rstrip("/")
+    if pattern.startswith("/") or "/" in pattern:
+        # Anchored at the project root
+        return fnmatchcase(rel_path, pattern.lstrip("/"))
+    return fnmatchcase(name, pattern)
+
+
+def _provider_output_dirs() -> set[str]:
+    from nao_core.commands.sync.providers import DEFAULT_PROVIDERS
+
+    return {provider.default_output_dir for provider in DEFAULT_PROVIDERS}
+
+
 def discover_templates(
     project_path: Path,
     exclude_dirs: set[str] | None = None,
+    exclude_paths: Iterable[str] | None = None,
 ) -> list[Path]:
     """Discover all `.j2` template files in the project.
 
+    The project is walked with `os.scandir`, never descending into excluded
+    directories, so large synced trees (repository checkouts, database docs)
+    cost nothing.
+
     Args:
         project_path: Path to the nao project root.
         exclude_dirs: Directory names to exclude (default: templates, .git, node_modules, etc.)
+        exclude_paths: Directories to exclude, relative to project_path (default:
+            the sync providers' output directories). Directory patterns from
+            `.naoignore` are excluded as well.
 
     Returns:
         List of paths to `.j2` files relative to project_path.
     """
     if exclude_dirs is None:
-        exclude_dirs = {
-            "templates",  # Don't process accessor template overrides
-            ".git",
-            ".venv",
-            "venv",
-            "node_modules",
-            "__pycache__",
-            ".nao",
-        }
+        exclude_dirs = set(DEFAULT_EXCLUDE_DIRS)
+    if exclude_paths is None:
+        exclude_paths = _provider_output_dirs()
+    excluded_paths = {Path(p).as_posix().strip("/") for p in exclude_paths}
+    ignore_patterns = load_ignored_dirs(project_path)
 
     templates: list[Path] = []
-
-    for path in project_path.rglob("*.j2"):
-        # Skip excluded directories
-        if any(excluded in path.parts for excluded in exclude_dirs):
+    pending = [(str(project_path), "")]
+    while pending:
+        directory, rel_dir = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
             continue
-
-        # Store relative path
-        templates.append(path.relative_to(project_path))
+        with entries:
+            for entry in entries:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if (
+                        entry.name in exclude_dirs
+                        or rel_path in excluded_paths
+                        or any(_ignores_dir(pattern, entry.name, rel_path) for pattern in ignore_patterns)
+                    ):
+                        continue
+                    pending.append((entry.path, rel_path))
+                elif entry.name.endswith(".j2") and entry.is_file():
+                    templates.append(Path(rel_path))
 
     return sorted(templates)
 
 
+def create_render_environment(project_path: Path) -> Environment:
+    """Create the Jinja environment user templates are rendered with.
+
+    Compiled templates are cached in the project's `.nao/cache/jinja/`.
+
+    Args:
+        project_path: Path to the nao project root, used as the loader path.
+    """
+    env = Environment(
+        loader=FileSystemLoader(str(project_path)),
+        autoescape=False,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        keep_trailing_newline=True,
+        bytecode_cache=ProjectBytecodeCache(project_path),
+    )
+
+    # Register custom filters
+    env.filters["to_json"] = lambda v, indent=None: json.dumps(v, indent=indent, default=str)
+    return env
+
+
 def render_template(
     template_path: Path,
     project_path: Path,
     config: NaoConfig,
+    env: Environment | None = None,
+    nao: NaoContext | None = None,
 ) -> Path:
     """Render a single template file.
 
@@ -93,6 +205,8 @@ def render_template(
         template_path: Path to the template file (relative to project_path).
         project_path: Path to the nao project root.
         config: The nao configuration.
+        env: Jinja environment shared across a render run (created if omitted).
+        nao: `nao` context shared across a render run (created if omitted).
 
     Returns:
         Path to the rendered output file.
@@ -100,22 +214,11 @@ def render_template(
     Raises:
         TemplateError: If template rendering fails.
     """
-    # Create Jinja environment with project as the loader path
-    env = Environment(
-        loader=FileSystemLoader(str(project_path)),
-        autoescape=False,
-        trim_blocks=True,
-        lstrip_blocks=True,
-        keep_trailing_newline=True,
-    )
-
-    # Register custom filters
-    import json
-
-    env.filters["to_json"] = lambda v, indent=None: json.dumps(v, indent=indent, default=str)
-
-    # Create the nao context
-    nao = create_nao_context(config)
+    if env is None:
+        env = create_render_environment(project_path)
+    if nao is None:
+        with create_nao_context(config, project_path) as own_nao:
+            return render_template(template_path, project_path, config, env=env, nao=own_nao)
 
     # Load and render the template
     template = env.get_template(str(template_path))
@@ -137,13 +240,24 @@ def render_all_templates(
     project_path: Path,
     config: NaoConfig,
     console: "Console | None" = None,
+    max_workers: int = DEFAULT_RENDER_WORKERS,
+    exclude_paths: Iterable[str] | None = None,
+    force: bool = False,
 ) -> TemplateRenderResult:
     """Discover and render all user templates in the project.
 
+    Templates are rendered concurrently with a shared environment and `nao`
+    context; results are reported in template order. A template is skipped
+    when none of the inputs recorded at its last render changed.
+
     Args:
         project_path: Path to the nao project root.
         config: The nao configuration.
         console: Optional Rich console for output.
+        max_workers: Number of templates rendered concurrently.
+        exclude_paths: Directories not searched for templates, relative to
+            project_path (default: the sync providers' output directories).
+        force: Render every template, even those whose inputs are unchanged.
 
     Returns:
         TemplateRenderResult with statistics about what was rendered.
@@ -153,9 +267,13 @@ def render_all_templates(
     if console is None:
         console = Console()
 
-    templates = discover_templates(project_path)
+    templates = discover_templates(project_path, exclude_paths=exclude_paths)
+    state = RenderState.load(get_render_state_path(project_path))
 
     if not templates:
+        if state.templates:
+            state.templates = {}
+            state.save()
         return TemplateRenderResult(
             templates_rendered=0,
             templates_failed=0,
@@ -165,31 +283,67 @@ def render_all_templates(
 
     rendered_files: list[str] = []
     errors: list[str] = []
+    skipped = 0
+
+    env = create_render_environment(project_path)
+    nao = create_nao_context(config, project_path)
+    config_hash = hash_config(config)
 
-    for template_path in templates:
+    def render(template_path: Path) -> tuple[Path | BaseException | None, TemplateDependencies | None]:
+        """Render a template, returning (output path, or None if skipped, or the error; its dependencies)."""
+        name = template_path.as_posix()
         try:
-            output_path = render_template(template_path, project_path, config)
-            rendered_files.append(str(output_path.relative_to(project_path)))
-            console.print(f"  [dim]→[/dim] {template_path} [dim]→[/dim] {output_path.name}")
-        except TemplateError as e:
-            error_msg = f"{template_path}: {e}"
-            errors.append(error_msg)
-            console.print(f"  [red]✗[/red] {template_path}: {e}")
+            # Forced renders skip change detection; their dependencies are recorded on the next run
+            sources = None if force else template_sources(env, name)
+            output_path = project_path / name[:-3]
+            if not force and state.is_up_to_date(name, sources, config_hash, output_path, nao.input_hash):
+                return None, state.templates[name]
+
+            with recording_inputs() as inputs:
+                output_path = render_template(template_path, project_path, config, env=env, nao=nao)
+            if sources is None:
+                return output_path, None
+            return output_path, TemplateDependencies(
+                sources, config_hash, dict(inputs), hash_content(output_path.read_bytes())
+            )
         except Exception as e:
-            error_msg = f"{template_path}: {type(e).__name__}: {e}"
-            errors.append(error_msg)
-            console.print(f"  [red]✗[/red] {template_path}: {e}")
+            return e, None
+
+    dependencies: dict[str, TemplateDependencies] = {}
+    with nao, ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(templates)))) as executor:
+        for template_path, (outcome, deps) in zip(templates, executor.map(render, templates)):
+            if deps is not None:
+                dependencies[template_path.as_posix()] = deps
+            if isinstance(outcome, TemplateError):
+                errors.append(f"{template_path}: {outcome}")
+                console.print(f"  [red]✗[/red] {template_path}: {outcome}")
+            elif isinstance(outcome, BaseException):
+                errors.append(f"{template_path}: {type(outcome).__name__}: {outcome}")
+                console.print(f"  [red]✗[/red] {template_path}: {outcome}")
+            elif outcome is None:
+                skipped += 1
+                console.print(f"  [dim]= {template_path} (unchanged)[/dim]")
+            else:
+                rendered_files.append(str(outcome.relative_to(project_path)))
+                console.print(f"  [dim]→[/dim] {template_path} [dim]→[/dim] {outcome.name}")
+
+    # Templates that failed or are gone are dropped, so they're rendered next time
+    state.templates = dependencies
+    state.save()
 
     return TemplateRenderResult(
         templates_rendered=len(rendered_files),
         templates_failed=len(errors),
         rendered_files=rendered_files,
         errors=errors,
+        templates_skipped=skipped,
     )
 
 
 __all__ = [
+    "DEFAULT_EXCLUDE_DIRS",
     "TemplateRenderResult",
+    "create_render_environment",
     "discover_templates",
     "render_template",
     "render_all_templates",
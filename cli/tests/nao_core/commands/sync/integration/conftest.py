@@ -16,10 +16,10 @@ load_dotenv(Path(__file__).parent / ".env")
 
 @pytest.fixture(autouse=True)
 def reset_template_engine():
-    """Reset the global template engine between tests."""
-    engine_module._engine = None
+    """Reset the cached template engines between tests."""
+    engine_module._registry.clear()
     yield
-    engine_module._engine = None
+    engine_module._registry.clear()
 
 
 @pytest.fixture(scope="module")
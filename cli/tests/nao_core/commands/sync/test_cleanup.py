@@ -5,10 +5,14 @@ from pathlib import Path
 from typing import List
 
 from nao_core.commands.sync.cleanup import (
+    MANIFEST_FILENAME,
     DatabaseSyncState,
     cleanup_stale_databases,
     cleanup_stale_paths,
     cleanup_stale_repos,
+    empty_trash,
+    load_manifest,
+    mark_manifest_incomplete,
 )
 from nao_core.config.repos import RepoConfig
 
@@ -214,6 +218,86 @@ class TestCleanupStalePaths:
         assert not table_path.exists()
 
 
+class TestManifestCleanup:
+    """Tests for manifest-driven cleanup with a trash directory."""
+
+    def _manifest(self, tmp_path: Path) -> Path:
+        return tmp_path / ".nao" / "sync" / MANIFEST_FILENAME
+
+    def _state(self, tmp_path: Path, tables: dict[str, list[str]]) -> DatabaseSyncState:
+        state = DatabaseSyncState(
+            db_path=tmp_path / "databases" / "type=duckdb" / "database=test",
+            state_dir=tmp_path / ".nao" / "sync",
+            trash_dir=tmp_path / ".nao" / "trash",
+        )
+        for schema, names in tables.items():
+            state.add_schema(schema)
+            for name in names:
+                (state.db_path / f"schema={schema}" / f"table={name}").mkdir(parents=True, exist_ok=True)
+                state.add_table(schema, name)
+        return state
+
+    def test_writes_manifest_of_synced_tables(self, tmp_path: Path):
+        """A completed cleanup records the synced schemas and tables, including empty schemas."""
+        state = self._state(tmp_path, {"public": ["users", "orders"]})
+        state.add_schema("empty")
+
+        cleanup_stale_paths(state)
+
+        assert load_manifest(self._manifest(tmp_path)) == {"public": {"users", "orders"}, "empty": set()}
+
+    def test_removes_set_difference_of_manifests(self, tmp_path: Path):
+        """Stale paths come from the previous manifest, not from walking the output tree."""
+        cleanup_stale_paths(self._state(tmp_path, {"public": ["users", "orders"], "old": ["events"]}))
+        state = self._state(tmp_path, {"public": ["users"]})
+        # Not in any manifest, so it is left alone
+        untracked = state.db_path / "schema=public" / "table=manual"
+        untracked.mkdir()
+
+        removed = cleanup_stale_paths(state)
+
+        assert removed == 2
+        assert not (state.db_path / "schema=public" / "table=orders").exists()
+        assert not (state.db_path / "schema=old").exists()
+        assert (state.db_path / "schema=public" / "table=users").exists()
+        assert untracked.exists()
+        assert load_manifest(self._manifest(tmp_path)) == {"public": {"users"}}
+
+    def test_tables_of_an_interrupted_sync_are_cleaned_up(self, tmp_path: Path):
+        """Tables written by a sync that never completed are found by walking the tree."""
+        cleanup_stale_paths(self._state(tmp_path, {"public": ["users"]}))
+        interrupted = self._state(tmp_path, {"public": ["users", "orders"], "new": ["events"]})
+        mark_manifest_incomplete(interrupted)
+        # The next sync finds the tables the interrupted run wrote dropped from the source
+        state = self._state(tmp_path, {"public": ["users"]})
+
+        removed = cleanup_stale_paths(state)
+
+        assert removed == 2
+        assert not (state.db_path / "schema=public" / "table=orders").exists()
+        assert not (state.db_path / "schema=new").exists()
+        assert load_manifest(self._manifest(tmp_path)) == {"public": {"users"}}
+
+    def test_stale_paths_are_moved_to_trash_and_emptied(self, tmp_path: Path):
+        """Removed directories are renamed into the trash, which is then emptied."""
+        cleanup_stale_paths(self._state(tmp_path, {"public": ["users", "orders"]}))
+        state = self._state(tmp_path, {"public": ["users"]})
+
+        cleanup_stale_paths(state)
+        trash_dir = tmp_path / ".nao" / "trash"
+        thread = empty_trash(trash_dir)
+        if thread is not None:
+            thread.join()
+
+        assert not (state.db_path / "schema=public" / "table=orders").exists()
+        assert list(trash_dir.iterdir()) == []
+
+    def test_empty_trash_returns_none_when_nothing_to_delete(self, tmp_path: Path):
+        assert empty_trash(tmp_path / "missing") is None
+        (tmp_path / "trash").mkdir()
+        assert empty_trash(tmp_path / "trash") is None
+
+
 class TestCleanupStaleDatabases:
     """Tests for cleanup_stale_databases function."""
 
@@ -263,6 +347,17 @@ class TestCleanupStaleDatabases:
         assert (tmp_path / "type=duckdb" / "database=valid").exists()
         assert not (tmp_path / "type=duckdb" / "database=old").exists()
 
+    def test_moves_stale_databases_to_trash(self, tmp_path: Path):
+        """Stale databases go through the trash."""
+        base_path = tmp_path / "databases"
+        (base_path / "type=postgres" / "database=old").mkdir(parents=True)
+        trash_dir = tmp_path / ".nao" / "trash"
+
+        cleanup_stale_databases([], base_path, trash_dir=trash_dir)
+
+        assert not (base_path / "type=postgres").exists()
+        assert trash_dir.exists()
+
 
 class TestCleanupStaleRespositories:
     def test_remove_unused_repos(self, tmp_path: Path):
@@ -1,10 +1,19 @@
 """Unit tests for DatabaseContext."""
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
+import ibis
 import pandas as pd
+import pytest
 
 from nao_core.commands.sync.providers.databases.context import DatabaseContext
+from nao_core.config.databases.base import QueryLimits
+from nao_core.config.databases.context import QueryCancelledError, preview_rows
+from nao_core.config.databases.governor import MAX_THROTTLE_RETRIES, QueryGovernor
+from nao_core.config.databases.postgres import PostgresConfig
+from nao_core.config.databases.redshift import RedshiftDatabaseContext
+from nao_core.config.databases.retry import RetryPolicy
+from nao_core.config.databases.snowflake import SnowflakeDatabaseContext
 
 
 class TestDatabaseContext:
@@ -65,6 +74,49 @@ class TestDatabaseContext:
         _ = ctx.table
         mock_conn.table.assert_called_once_with("table", database="schema")
 
+    def test_cancel_interrupts_underlying_connection(self):
+        mock_conn = MagicMock()
+        ctx = DatabaseContext(mock_conn, "schema", "table")
+
+        ctx.cancel()
+
+        mock_conn.con.interrupt.assert_called_once()
+        mock_conn.con.cancel.assert_not_called()
+
+    def test_cancelled_context_sends_no_more_queries(self):
+        ctx, mock_table = self._make_context()
+        ctx.retry_policy = RetryPolicy(max_retries=3)
+
+        ctx.cancel()
+
+        with pytest.raises(QueryCancelledError):
+            ctx.row_count()
+        mock_table.count.assert_not_called()
+
+    def test_throttled_queries_are_retried_by_the_governor_only(self):
+        class TooManyRequests(RuntimeError):
+            code = 429
+
+        ctx, mock_table = self._make_context()
+        ctx.governor = QueryGovernor(QueryLimits(max_queries_per_second=1000), sleep=lambda _: None)
+        ctx.retry_policy = RetryPolicy(max_retries=3)
+        mock_table.count.return_value.execute.side_effect = TooManyRequests("slow down")
+
+        with patch("nao_core.config.databases.retry.time.sleep"), pytest.raises(TooManyRequests):
+            ctx.row_count()
+
+        assert mock_table.count.return_value.execute.call_count == MAX_THROTTLE_RETRIES + 1
+        assert ctx.retries == 0
+
+    def test_snowflake_cancel_stops_further_queries(self):
+        mock_conn = MagicMock()
+        ctx = SnowflakeDatabaseContext(mock_conn, "schema", "table")
+
+        ctx.cancel()
+
+        assert ctx.cancelled
+        mock_conn.raw_sql.assert_called_once_with("SELECT SYSTEM$CANCEL_ALL_QUERIES(CURRENT_SESSION())")
+
     def test_table_is_cached(self):
         mock_conn = MagicMock()
         ctx = DatabaseContext(mock_conn, "schema", "table")
@@ -72,3 +124,221 @@ class TestDatabaseContext:
         _ = ctx.table
         _ = ctx.table
         mock_conn.table.assert_called_once()
+
+
+class TestDatabaseContextCache:
+    def _make_context(self):
+        return TestDatabaseContext()._make_context()
+
+    def test_columns_is_memoized(self):
+        ctx, mock_table = self._make_context()
+
+        first = ctx.columns()
+        second = ctx.columns()
+
+        assert first == second
+        mock_table.schema.assert_called_once()
+        assert ctx.cache_misses == 1
+        assert ctx.cache_hits == 1
+
+    def test_cached_results_are_copied(self):
+        ctx, mock_table = self._make_context()
+
+        ctx.columns()[0]["name"] = "changed"
+        ctx.columns().clear()
+
+        assert ctx.columns()[0]["name"] != "changed"
+
+    def test_preview_cache_is_keyed_by_arguments(self):
+        ctx, mock_table = self._make_context()
+        mock_table.limit.return_value.execute.return_value = pd.DataFrame({"id": [1]})
+
+        ctx.preview()
+        ctx.preview(limit=10)
+        ctx.preview(10)
+        ctx.preview(limit=5)
+
+        assert mock_table.limit.call_count == 2
+        assert ctx.cache_hits == 2
+        assert ctx.cache_misses == 2
+
+    def test_errors_are_not_cached(self):
+        ctx, mock_table = self._make_context()
+        mock_table.count.return_value.execute.side_effect = [RuntimeError("boom"), 7]
+
+        with pytest.raises(RuntimeError):
+            ctx.row_count()
+
+        assert ctx.row_count() == 7
+
+    def test_subclass_overrides_are_memoized(self):
+        calls = []
+
+        class DescribedContext(DatabaseContext):
+            def description(self) -> str | None:
+                calls.append(1)
+                return "A table"
+
+            def columns(self):
+                cols = super().columns()
+                calls.append(2)
+                return cols
+
+        ctx = DescribedContext(MagicMock(), "schema", "table")
+
+        assert ctx.description() == "A table"
+        assert ctx.description() == "A table"
+        ctx.columns()
+        ctx.columns()
+
+        assert calls == [1, 2]
+        # Nested super() calls are not counted as separate accessor calls
+        assert ctx.cache_misses == 2
+        assert ctx.cache_hits == 2
+
+    def test_seeded_results_are_served_from_cache(self):
+        ctx, mock_table = self._make_context()
+
+        ctx.seed("row_count", 42)
+        ctx.seed("preview", [{"id": 1}], limit=5)
+
+        assert ctx.row_count() == 42
+        assert ctx.preview(5) == [{"id": 1}]
+        mock_table.count.assert_not_called()
+        mock_table.limit.assert_not_called()
+        assert ctx.fetched[("row_count", ())] == 42
+
+    def test_seed_uses_subclass_override_cache_key(self):
+        class DescribedContext(DatabaseContext):
+            def description(self) -> str | None:
+                raise AssertionError("should be served from the seeded result")
+
+        ctx = DescribedContext(MagicMock(), "schema", "table")
+        ctx.seed("description", "A table")
+
+        assert ctx.description() == "A table"
+
+    def test_caches_are_per_context(self):
+        mock_conn = MagicMock()
+        first = DatabaseContext(mock_conn, "schema", "a")
+        second = DatabaseContext(mock_conn, "schema", "b")
+
+        first.columns()
+        second.columns()
+
+        assert mock_conn.table.call_count == 2
+        assert first.cache_hits == 0
+        assert second.cache_hits == 0
+
+
+class TestPreviewRows:
+    def test_values_are_normalized_per_column(self):
+        df = pd.DataFrame(
+            {
+                "id": [1, 2],
+                "score": [1.5, float("nan")],
+                "created": pd.to_datetime(["2024-01-01", None]),
+                "tags": [["a"], None],
+                "flag": [True, False],
+            }
+        )
+
+        rows = preview_rows(df)
+
+        assert rows == [
+            {"id": 1, "score": 1.5, "created": "2024-01-01 00:00:00", "tags": ["a"], "flag": True},
+            {"id": 2, "score": None, "created": None, "tags": None, "flag": False},
+        ]
+        # No upcasting across columns as with iterrows(): ints stay Python ints
+        assert type(rows[0]["id"]) is int
+        assert type(rows[0]["flag"]) is bool
+
+    def test_non_native_objects_are_stringified(self):
+        from decimal import Decimal
+
+        rows = preview_rows(pd.DataFrame({"amount": [Decimal("1.10"), None], "name": ["x", "y"]}, dtype=object))
+
+        assert rows == [{"amount": "1.10", "name": "x"}, {"amount": None, "name": "y"}]
+
+    def test_empty_frame(self):
+        assert preview_rows(pd.DataFrame({"id": []})) == []
+
+
+class TestPreviewLimits:
+    def _context(self):
+        conn = ibis.duckdb.connect()
+        conn.raw_sql("CREATE TABLE wide AS SELECT 1 AS id, repeat('x', 100) AS payload, 3 AS extra")
+        return DatabaseContext(conn, "main", "wide")
+
+    def test_preview_caps_columns(self):
+        ctx = self._context()
+        ctx.preview_max_columns = 2
+
+        assert ctx.preview() == [{"id": 1, "payload": "x" * 100}]
+
+    def test_preview_truncates_strings_in_query(self):
+        ctx = self._context()
+        ctx.preview_max_chars = 5
+
+        assert ctx.preview() == [{"id": 1, "payload": "xxxxx", "extra": 3}]
+
+    def test_redshift_preview_uses_cursor_description(self):
+        conn = MagicMock()
+        cursor = conn.raw_sql.return_value
+        cursor.description = [("id",), ("name",)]
+        cursor.fetchall.return_value = [(1, "Alice"), (None, "Bob")]
+        ctx = RedshiftDatabaseContext(conn, "public", "users")
+
+        rows = ctx.preview(limit=2)
+
+        assert rows == [{"id": 1, "name": "Alice"}, {"id": None, "name": "Bob"}]
+        assert conn.raw_sql.call_args[0][0] == 'SELECT * FROM "public"."users" LIMIT 2'
+
+    def test_redshift_preview_truncates_in_projection(self):
+        conn = MagicMock()
+        ctx = RedshiftDatabaseContext(conn, "public", "users")
+        ctx.preview_max_chars = 10
+        ctx._cache[("RedshiftDatabaseContext.columns", ())] = [
+            {"name": "id", "type": "int32"},
+            {"name": "bio", "type": "string"},
+            {"name": "amount", "type": "string"},
+        ]
+        ctx._information_schema_rows = [
+            ("id", "integer", "NO", None, 32, 0),
+            ("bio", "character varying", "YES", 256, None, None),
+            # Unmapped types are reported as "string" but can't be cut with LEFT()
+            ("amount", "numeric", "YES", None, 18, 2),
+        ]
+        conn.raw_sql.return_value.description = [("id",), ("bio",), ("amount",)]
+        conn.raw_sql.return_value.fetchall.return_value = []
+
+        ctx.preview()
+
+        assert (
+            conn.raw_sql.call_args[0][0]
+            == 'SELECT "id", LEFT("bio", 10) AS "bio", "amount" FROM "public"."users" LIMIT 10'
+        )
+
+
+class TestSchemaPrefetch:
+    def _config(self):
+        return PostgresConfig(name="pg", host="localhost", database="db", user="u", password="p")
+
+    def test_postgres_prefetches_descriptions_for_the_schema(self):
+        conn = MagicMock()
+        conn.raw_sql.return_value.fetchall.return_value = [("users", " All users "), ("orders", None)]
+
+        result = self._config().prefetch_schema(conn, "public", ["users", "orders", "events"], {"description"})
+
+        assert result == {
+            "users": {"description": "All users"},
+            "orders": {"description": None},
+            "events": {"description": None},
+        }
+        conn.raw_sql.assert_called_once()
+
+    def test_postgres_skips_accessors_templates_do_not_call(self):
+        conn = MagicMock()
+
+        assert self._config().prefetch_schema(conn, "public", ["users"], {"columns", "row_count"}) == {}
+        conn.raw_sql.assert_not_called()
@@ -0,0 +1,85 @@
+"""Unit tests for render timeout and circuit-breaker guards."""
+
+import threading
+
+import pytest
+
+from nao_core.commands.sync.providers.databases.guards import (
+    CircuitBreaker,
+    RenderTimeoutError,
+    run_with_timeout,
+)
+
+
+class TestRunWithTimeout:
+    def test_returns_value_without_timeout(self):
+        assert run_with_timeout(lambda: 42, None) == 42
+
+    def test_returns_value_within_timeout(self):
+        assert run_with_timeout(lambda: "ok", 5) == "ok"
+
+    def test_propagates_errors(self):
+        def fail():
+            raise ValueError("bad query")
+
+        with pytest.raises(ValueError, match="bad query"):
+            run_with_timeout(fail, 5)
+
+    def test_times_out_and_calls_cancel(self):
+        release = threading.Event()
+        cancelled = []
+
+        def on_timeout():
+            cancelled.append(True)
+            release.set()
+
+        with pytest.raises(RenderTimeoutError, match="timed out after 0.05s") as exc_info:
+            run_with_timeout(lambda: release.wait(5), 0.05, on_timeout=on_timeout)
+
+        assert cancelled == [True]
+        # The cancelled worker exited within the grace period
+        assert not exc_info.value.abandoned
+
+    def test_worker_ignoring_cancel_is_abandoned(self):
+        release = threading.Event()
+
+        with pytest.raises(RenderTimeoutError) as exc_info:
+            run_with_timeout(lambda: release.wait(5), 0.05, on_timeout=lambda: None, grace=0.05)
+
+        release.set()
+        assert exc_info.value.abandoned
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(threshold=2)
+
+        breaker.record_failure()
+        assert not breaker.is_open
+        breaker.record_failure()
+        assert breaker.is_open
+
+    def test_success_resets_count(self):
+        breaker = CircuitBreaker(threshold=2)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert not breaker.is_open
+
+    def test_stays_open(self):
+        breaker = CircuitBreaker(threshold=1)
+
+        breaker.record_failure()
+        breaker.record_success()
+
+        assert breaker.is_open
+
+    def test_disabled_without_threshold(self):
+        breaker = CircuitBreaker(threshold=None)
+
+        for _ in range(10):
+            breaker.record_failure()
+
+        assert not breaker.is_open
@@ -0,0 +1,84 @@
+"""Unit tests for the resumable sync journal."""
+
+from pathlib import Path
+
+from nao_core.commands.sync.journal import SyncJournal, get_database_state_dir
+
+TEMPLATES = ["databases/columns.md.j2", "databases/preview.md.j2"]
+
+
+class TestGetDatabaseStateDir:
+    def test_mirrors_output_layout_under_project(self, tmp_path: Path):
+        base_path = tmp_path / "databases"
+        db_path = base_path / "type=duckdb" / "database=mydb"
+
+        state_dir = get_database_state_dir(db_path, base_path, project_path=tmp_path)
+
+        assert state_dir == tmp_path / ".nao" / "sync" / "databases" / "type=duckdb" / "database=mydb"
+
+    def test_defaults_to_parent_of_base_path(self, tmp_path: Path):
+        base_path = tmp_path / "databases"
+        db_path = base_path / "type=duckdb" / "database=mydb"
+
+        state_dir = get_database_state_dir(db_path, base_path)
+
+        assert state_dir.parent.parent.parent.parent == tmp_path / ".nao"
+
+
+class TestSyncJournal:
+    def test_fresh_open_ignores_previous_entries(self, tmp_path: Path):
+        path = tmp_path / "journal.jsonl"
+        journal = SyncJournal(path, TEMPLATES)
+        journal.open()
+        journal.record("public", "users")
+        journal.close()
+
+        assert SyncJournal(path, TEMPLATES).open(resume=False) == set()
+
+    def test_resume_returns_completed_pairs(self, tmp_path: Path):
+        path = tmp_path / "journal.jsonl"
+        journal = SyncJournal(path, TEMPLATES)
+        journal.open()
+        journal.record("public", "users")
+        journal.record("public", "orders")
+        journal.close()
+
+        resumed = SyncJournal(path, TEMPLATES)
+        assert resumed.open(resume=True) == {("public", "users"), ("public", "orders")}
+        resumed.record("analytics", "events")
+        resumed.close()
+
+        assert SyncJournal(path, TEMPLATES).open(resume=True) == {
+            ("public", "users"),
+            ("public", "orders"),
+            ("analytics", "events"),
+        }
+
+    def test_resume_skips_truncated_last_line(self, tmp_path: Path):
+        path = tmp_path / "journal.jsonl"
+        journal = SyncJournal(path, TEMPLATES)
+        journal.open()
+        journal.record("public", "users")
+        journal.close()
+        with path.open("a") as f:
+            f.write('{"schema": "public", "tab')
+
+        assert SyncJournal(path, TEMPLATES).open(resume=True) == {("public", "users")}
+
+    def test_resume_discards_journal_when_templates_changed(self, tmp_path: Path):
+        path = tmp_path / "journal.jsonl"
+        journal = SyncJournal(path, TEMPLATES)
+        journal.open()
+        journal.record("public", "users")
+        journal.close()
+
+        assert SyncJournal(path, TEMPLATES[:1]).open(resume=True) == set()
+
+    def test_complete_removes_journal(self, tmp_path: Path):
+        path = tmp_path / "journal.jsonl"
+        journal = SyncJournal(path, TEMPLATES)
+        journal.open()
+        journal.record("public", "users")
+        journal.complete()
+
+        assert not path.exists()
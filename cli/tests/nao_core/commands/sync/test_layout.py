@@ -0,0 +1,155 @@
+"""Unit tests for consolidated database output layouts."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from nao_core.commands.sync.cleanup import DatabaseSyncState, cleanup_stale_paths
+from nao_core.commands.sync.layout import (
+    CATALOG_FILENAME,
+    SCHEMA_FILENAME,
+    ConsolidatedWriter,
+    create_output,
+    get_index_path,
+    read_section,
+)
+from nao_core.config.databases.base import OutputLayout
+
+
+def _state(tmp_path: Path, layout: OutputLayout = "tables") -> DatabaseSyncState:
+    return DatabaseSyncState(
+        db_path=tmp_path / "databases" / "type=duckdb" / "database=test",
+        state_dir=tmp_path / ".nao" / "sync",
+        output_layout=layout,
+    )
+
+
+class TestConsolidatedWriter:
+    def test_sections_are_addressable_through_the_index(self, tmp_path: Path):
+        path = tmp_path / SCHEMA_FILENAME
+        writer = ConsolidatedWriter(path)
+        writer.open()
+        writer.add("public", "users", "columns", "# users\n\n| id | int |\n")
+        writer.add("public", "orders", "columns", "# orders ✓\n")
+
+        assert writer.complete() is True
+
+        assert read_section(path, "public", "orders", "columns") == "# orders ✓\n"
+        assert read_section(path, "public", "users", "columns") == "# users\n\n| id | int |\n"
+        assert read_section(path, "public", "users", "preview") is None
+        assert "<!-- public.users columns -->" in path.read_text()
+        assert json.loads(get_index_path(path).read_text())["file"] == SCHEMA_FILENAME
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["tables.index.json", "tables.md"]
+
+    def test_identical_content_is_not_rewritten(self, tmp_path: Path):
+        path = tmp_path / CATALOG_FILENAME
+        for _ in range(2):
+            writer = ConsolidatedWriter(path)
+            writer.open()
+            writer.add("public", "users", "columns", "same")
+            written = writer.complete()
+
+        assert written is False
+
+    def test_resume_carries_over_sections_of_done_tables(self, tmp_path: Path):
+        path = tmp_path / CATALOG_FILENAME
+        interrupted = ConsolidatedWriter(path)
+        interrupted.open()
+        interrupted.add("public", "users", "columns", "users v2")
+        interrupted.add("public", "orders", "columns", "orders v2")
+        interrupted.close()
+
+        resumed = ConsolidatedWriter(path)
+        resumed.open(keep={("public", "users")})
+        resumed.add("public", "events", "columns", "events v2")
+        resumed.complete()
+
+        assert read_section(path, "public", "users", "columns") == "users v2"
+        assert read_section(path, "public", "orders", "columns") is None
+        assert read_section(path, "public", "events", "columns") == "events v2"
+
+
+class TestCreateOutput:
+    def test_schema_layout_writes_one_file_per_schema(self, tmp_path: Path):
+        state = _state(tmp_path, "schema")
+        output = create_output("schema", state)
+        for schema in ("public", "sales"):
+            output.start_schema(schema)
+            output.write(schema, "users", "columns.md", f"{schema} users")
+            output.finish_schema(schema)
+        output.complete()
+
+        public = state.db_path / "schema=public"
+        assert sorted(p.name for p in public.iterdir()) == ["tables.index.json", "tables.md"]
+        assert read_section(public / SCHEMA_FILENAME, "public", "users", "columns") == "public users"
+        assert state.files_written == 2
+
+    def test_catalog_layout_writes_a_single_file(self, tmp_path: Path):
+        state = _state(tmp_path, "catalog")
+        output = create_output("catalog", state)
+        for schema in ("public", "sales"):
+            output.start_schema(schema)
+            output.write(schema, "users", "columns.md", f"{schema} users")
+            output.finish_schema(schema)
+        output.complete()
+
+        assert sorted(p.name for p in state.db_path.iterdir()) == ["catalog.index.json", "catalog.md"]
+        assert read_section(state.db_path / CATALOG_FILENAME, "sales", "users", "columns") == "sales users"
+
+    def test_skipped_sections_keep_previous_content(self, tmp_path: Path):
+        state = _state(tmp_path, "catalog")
+        output = create_output("catalog", state)
+        output.start_schema("public")
+        output.write("public", "users", "preview.md", "rows")
+        output.complete()
+
+        output = create_output("catalog", state)
+        output.start_schema("public")
+        output.write_skipped("public", "users", "preview.md", "Skipped")
+        output.write_skipped("public", "orders", "preview.md", "Skipped")
+        output.complete()
+
+        catalog = state.db_path / CATALOG_FILENAME
+        assert read_section(catalog, "public", "users", "preview") == "rows"
+        assert read_section(catalog, "public", "orders", "preview") == "Skipped"
+
+
+class TestLayoutSwitchCleanup:
+    def _sync(self, tmp_path: Path, layout: OutputLayout, verbose: bool = False) -> DatabaseSyncState:
+        state = _state(tmp_path, layout)
+        output = create_output(layout, state)
+        output.start_schema("public")
+        state.add_schema("public")
+        output.write("public", "users", "columns.md", "users")
+        state.add_table("public", "users")
+        output.finish_schema("public")
+        output.complete()
+        cleanup_stale_paths(state, verbose=verbose)
+        return state
+
+    def test_first_consolidated_sync_reports_no_layout_change(self, tmp_path: Path):
+        with patch("nao_core.commands.sync.cleanup.console") as mock_console:
+            state = self._sync(tmp_path, "schema", verbose=True)
+
+        mock_console.print.assert_not_called()
+        assert (state.db_path / "schema=public" / "tables.md").exists()
+
+    def test_per_table_files_are_removed_when_consolidating(self, tmp_path: Path):
+        self._sync(tmp_path, "tables")
+        state = self._sync(tmp_path, "schema")
+
+        schema_dir = state.db_path / "schema=public"
+        assert sorted(p.name for p in schema_dir.iterdir()) == ["tables.index.json", "tables.md"]
+
+    def test_consolidated_files_are_removed_when_going_back_to_tables(self, tmp_path: Path):
+        self._sync(tmp_path, "catalog")
+        state = self._sync(tmp_path, "tables")
+
+        assert sorted(p.name for p in state.db_path.iterdir()) == ["schema=public"]
+        assert (state.db_path / "schema=public" / "table=users" / "columns.md").read_text() == "users"
+
+    def test_schema_directories_are_removed_for_catalog(self, tmp_path: Path):
+        self._sync(tmp_path, "schema")
+        state = self._sync(tmp_path, "catalog")
+
+        assert sorted(p.name for p in state.db_path.iterdir()) == ["catalog.index.json", "catalog.md"]
@@ -0,0 +1,120 @@
+"""Unit tests for pipelined schema table listing."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+from nao_core.commands.sync.providers.databases.listing import iter_schema_tables
+from nao_core.config.databases.base import QueryLimits, group_tables_by_schema
+from nao_core.config.databases.governor import QueryGovernor
+
+
+def _make_config(list_concurrency=4, bulk=None, limits=None):
+    db_config = MagicMock()
+    db_config.list_concurrency = list_concurrency
+    db_config.list_tables_bulk.return_value = bulk
+    db_config.limits = limits or QueryLimits()
+    return db_config
+
+
+class TestGroupTablesBySchema:
+    def test_groups_and_sorts_requested_schemas(self):
+        rows = [("b", "z"), ("a", "y"), ("a", "x"), ("other", "t"), ("a", "x")]
+
+        assert group_tables_by_schema(rows, ["a", "b", "empty"]) == {"a": ["x", "y"], "b": ["z"], "empty": []}
+
+
+class TestIterSchemaTables:
+    def test_uses_bulk_listing_when_available(self):
+        db_config = _make_config(bulk={"a": ["t1"], "b": ["t2"]})
+        conn = MagicMock()
+
+        listings = list(iter_schema_tables(db_config, conn, ["a", "b", "c"]))
+
+        assert [(item.schema, item.tables) for item in listings] == [("a", ["t1"]), ("b", ["t2"]), ("c", [])]
+        conn.list_tables.assert_not_called()
+        db_config.connect.assert_not_called()
+
+    @patch("nao_core.commands.sync.providers.databases.listing.console")
+    def test_falls_back_when_bulk_listing_fails(self, mock_console):
+        db_config = _make_config(list_concurrency=1)
+        db_config.list_tables_bulk.side_effect = RuntimeError("no access to INFORMATION_SCHEMA")
+        conn = MagicMock()
+        conn.list_tables.side_effect = lambda database: [f"{database}_t"]
+
+        listings = list(iter_schema_tables(db_config, conn, ["a", "b"]))
+
+        assert [item.tables for item in listings] == [["a_t"], ["b_t"]]
+
+    def test_serial_listing_uses_main_connection(self):
+        db_config = _make_config(list_concurrency=1)
+        conn = MagicMock()
+        conn.list_tables.side_effect = lambda database: [f"{database}_t"]
+
+        listings = list(iter_schema_tables(db_config, conn, ["a", "b"]))
+
+        assert [item.tables for item in listings] == [["a_t"], ["b_t"]]
+        db_config.connect.assert_not_called()
+
+    def test_concurrent_listing_preserves_order_and_captures_errors(self):
+        db_config = _make_config(list_concurrency=3)
+        worker_conn = MagicMock()
+
+        def list_tables(database):
+            if database == "broken":
+                raise PermissionError("denied")
+            return [f"{database}_t"]
+
+        worker_conn.list_tables.side_effect = list_tables
+        db_config.connect.return_value = worker_conn
+
+        listings = list(iter_schema_tables(db_config, MagicMock(), ["a", "broken", "c", "d"]))
+
+        assert [item.schema for item in listings] == ["a", "broken", "c", "d"]
+        assert isinstance(listings[1].error, PermissionError)
+        assert listings[3].tables == ["d_t"]
+        assert worker_conn.disconnect.call_count == db_config.connect.call_count
+
+    def test_first_schema_is_yielded_before_others_finish(self):
+        db_config = _make_config(list_concurrency=2)
+        release = threading.Event()
+        worker_conn = MagicMock()
+
+        def list_tables(database):
+            if database != "first":
+                release.wait(5)
+            return [database]
+
+        worker_conn.list_tables.side_effect = list_tables
+        db_config.connect.return_value = worker_conn
+
+        listings = iter_schema_tables(db_config, MagicMock(), ["first", "slow"])
+        first = next(listings)
+
+        assert first.tables == ["first"]
+        release.set()
+        assert next(listings).tables == ["slow"]
+        listings.close()
+
+    def test_concurrent_listing_is_capped_by_max_concurrent_queries(self):
+        db_config = _make_config(list_concurrency=4, limits=QueryLimits(max_concurrent_queries=1))
+        conn = MagicMock()
+        conn.list_tables.side_effect = lambda database: [f"{database}_t"]
+
+        listings = list(iter_schema_tables(db_config, conn, ["a", "b", "c"]))
+
+        assert [item.tables for item in listings] == [["a_t"], ["b_t"], ["c_t"]]
+        db_config.connect.assert_not_called()
+
+    def test_listing_runs_through_the_governor(self):
+        class TooManyRequests(RuntimeError):
+            code = 429
+
+        db_config = _make_config(list_concurrency=1)
+        conn = MagicMock()
+        conn.list_tables.side_effect = [TooManyRequests("slow down"), ["a_t"]]
+        governor = QueryGovernor(QueryLimits(max_queries_per_second=1000), sleep=lambda _: None)
+
+        listings = list(iter_schema_tables(db_config, conn, ["a"], governor=governor))
+
+        assert listings[0].tables == ["a_t"]
+        assert governor.throttled == 1
@@ -0,0 +1,478 @@
+"""Unit tests for the Notion sync provider, against a local fake Notion API."""
+
+import json
+import re
+import threading
+from collections.abc import Iterator
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from nao_core.commands.sync.providers.notion import client as notion_client_module
+from nao_core.commands.sync.providers.notion.cache import NotionPageCache, get_notion_cache_dir, load_page
+from nao_core.commands.sync.providers.notion.client import NotionSession, TokenBucket, parse_retry_after
+from nao_core.commands.sync.providers.notion.crawl import CrawlNode, crawl
+from nao_core.commands.sync.providers.notion.manifest import MANIFEST_FILENAME, utc_now
+from nao_core.commands.sync.providers.notion.provider import NotionSyncProvider, get_page_as_markdown
+from nao_core.templates.context import NotionProvider
+
+PAGE_IDS = [f"{i:032x}" for i in range(1, 7)]
+DATABASE_ID = "d" * 32
+ANNOTATIONS = {"bold": False, "italic": False, "strikethrough": False, "underline": False, "code": False}
+
+
+def _paragraph(text: str) -> dict:
+    rich_text = {
+        "type": "text",
+        "plain_text": text,
+        "href": None,
+        "text": {"content": text, "link": None},
+        "annotations": {**ANNOTATIONS, "color": "default"},
+    }
+    return {"type": "paragraph", "has_children": False, "paragraph": {"rich_text": [rich_text]}}
+
+
+def _dashed(notion_id: str) -> str:
+    return f"{notion_id[:8]}-{notion_id[8:12]}-{notion_id[12:16]}-{notion_id[16:20]}-{notion_id[20:]}"
+
+
+def _child_page(page_id: str) -> dict:
+    return {"id": _dashed(page_id), "type": "child_page", "has_children": True, "child_page": {"title": page_id}}
+
+
+class FakeNotion:
+    """Serves the page and block-children endpoints for PAGE_IDS, optionally answering 429 first."""
+
+    def __init__(self, rate_limited: int = 0, retry_after: str = "0"):
+        self.rate_limited = rate_limited
+        self.retry_after = retry_after
+        self.requests: list[str] = []
+        self.last_edited = {page_id: "2024-01-01T00:00:00.000Z" for page_id in PAGE_IDS}
+        self.failing: set[str] = set()
+        self.children: dict[str, list[dict]] = {}
+        """Extra child blocks per block ID"""
+        self.database_rows: list[str] = []
+        self.database_failing = False
+        self.titles: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def page(self, page_id: str) -> dict:
+        plain_text = self.titles.get(page_id, f"Page {PAGE_IDS.index(page_id) + 1}")
+        title = {"type": "title", "title": [{"plain_text": plain_text}]}
+        page = {"last_edited_time": self.last_edited[page_id], "properties": {"title": title}}
+        return {"object": "page", "id": _dashed(page_id), **page}
+
+    def respond(self, path: str) -> tuple[int, dict, dict]:
+        with self._lock:
+            self.requests.append(path)
+            if self.rate_limited > 0:
+                self.rate_limited -= 1
+                error = {"object": "error", "status": 429, "code": "rate_limited", "message": "Slow down"}
+                return 429, {"Retry-After": self.retry_after}, error
+
+        match = re.fullmatch(r"/v1/pages/([0-9a-f]{32})", path)
+        if match and match.group(1) in PAGE_IDS and match.group(1) not in self.failing:
+            return 200, {}, self.page(match.group(1))
+        if match := re.fullmatch(r"/v1/blocks/([0-9a-f]{32})/children", path):
+            blocks = [_paragraph(f"Content of {match.group(1)[-2:]}"), *self.children.get(match.group(1), [])]
+            return 200, {}, {"object": "list", "results": blocks, "next_cursor": None, "has_more": False}
+        if path == f"/v1/databases/{DATABASE_ID}":
+            return 200, {}, {"object": "database", "id": DATABASE_ID, "data_sources": [{"id": "source"}]}
+        if path == "/v1/data_sources/source/query" and not self.database_failing:
+            rows = [self.page(page_id) for page_id in self.database_rows]
+            return 200, {}, {"object": "list", "results": rows, "next_cursor": None, "has_more": False}
+        return 404, {}, {"object": "error", "status": 404, "code": "object_not_found", "message": path}
+
+
+@pytest.fixture
+def fake_notion() -> Iterator[tuple[FakeNotion, str]]:
+    notion = FakeNotion()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status, headers, body = notion.respond(self.path.split("?")[0])
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.do_GET()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    try:
+        yield notion, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket:
+    def test_bursts_then_spaces_requests_to_the_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=3.0, capacity=3, sleep=clock.sleep, clock=clock)
+
+        for _ in range(5):
+            bucket.acquire()
+
+        assert clock.sleeps == pytest.approx([1 / 3, 1 / 3])
+
+    def test_pause_holds_requests(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=3.0, capacity=3, sleep=clock.sleep, clock=clock)
+
+        bucket.pause(2.0)
+        bucket.acquire()
+
+        assert clock.sleeps == [2.0]
+
+
+class TestParseRetryAfter:
+    def test_seconds(self):
+        assert parse_retry_after("3") == 3.0
+
+    def test_http_date_in_the_past(self):
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    def test_missing_or_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+
+class TestNotionSession:
+    def test_rate_limited_requests_wait_for_retry_after(self, fake_notion):
+        notion, base_url = fake_notion
+        notion.rate_limited = 2
+        notion.retry_after = "7"
+        clock = FakeClock()
+        limiter = TokenBucket(sleep=clock.sleep, clock=clock)
+
+        with NotionSession("secret", base_url=base_url, limiter=limiter) as session:
+            title, markdown = get_page_as_markdown(PAGE_IDS[0], "secret", session)
+
+        assert title == "Page 1"
+        assert "Content of 01" in markdown
+        assert session.rate_limited == 2
+        assert clock.sleeps[:2] == [7.0, 7.0]
+        assert session.requests == 4
+
+    def test_other_errors_are_not_retried(self, fake_notion):
+        _, base_url = fake_notion
+
+        with NotionSession("secret", base_url=base_url) as session:
+            with pytest.raises(Exception, match="object_not_found|/v1/pages/"):
+                session.retrieve_page("f" * 32)
+
+        assert session.requests == 1
+
+
+class TestNotionSyncProvider:
+    def test_pages_are_exported_concurrently_through_one_client(self, tmp_path: Path, fake_notion):
+        notion, base_url = fake_notion
+        notion.rate_limited = 1
+        config = MagicMock()
+        config.api_key = "secret"
+        config.cache_ttl = 3600
+        config.databases = []
+        config.crawl_depth = 0
+        config.pages = [f"https://www.notion.so/team/Page-{page_id}" for page_id in PAGE_IDS] + ["not-a-page"]
+        session_factory = partial(NotionSession, base_url=base_url, limiter=TokenBucket(rate=1000.0, capacity=10))
+
+        with (
+            patch("nao_core.commands.sync.providers.notion.provider.NotionSession", session_factory),
+            patch.object(notion_client_module, "Client", wraps=notion_client_module.Client) as client_class,
+        ):
+            result = NotionSyncProvider().sync([config], tmp_path / "docs", project_path=tmp_path)
+
+        assert result.items_synced == len(PAGE_IDS)
+        assert result.details is not None
+        assert result.details["pages"] == [f"Page {i}" for i in range(1, len(PAGE_IDS) + 1)]
+        assert client_class.call_count == 1
+        assert "title: Page 3" in (tmp_path / "docs" / "page-3.md").read_text()
+        # One retried 429, then a page and a children request per page
+        assert len(notion.requests) == 2 * len(PAGE_IDS) + 1
+
+
+class TestIncrementalNotionSync:
+    def _sync(
+        self, tmp_path: Path, base_url: str, pages: list[str], databases: list[str] | None = None, crawl_depth: int = 0
+    ):
+        config = MagicMock()
+        config.api_key = "secret"
+        config.pages = pages
+        config.cache_ttl = 3600
+        config.databases = databases or []
+        config.crawl_depth = crawl_depth
+        session_factory = partial(NotionSession, base_url=base_url, limiter=TokenBucket(rate=1000.0, capacity=10))
+        with patch("nao_core.commands.sync.providers.notion.provider.NotionSession", session_factory):
+            return NotionSyncProvider().sync([config], tmp_path / "docs", project_path=tmp_path)
+
+    def _children_requests(self, notion: FakeNotion) -> list[str]:
+        return [path for path in notion.requests if path.endswith("/children")]
+
+    def test_unchanged_pages_are_not_exported_again(self, tmp_path: Path, fake_notion):
+        notion, base_url = fake_notion
+        self._sync(tmp_path, base_url, PAGE_IDS[:3])
+        notion.requests.clear()
+
+        notion.last_edited[PAGE_IDS[1]] = "2024-02-01T00:00:00.000Z"
+        result = self._sync(tmp_path, base_url, PAGE_IDS[:3])
+
+        assert self._children_requests(notion) == [f"/v1/blocks/{PAGE_IDS[1]}/children"]
+        assert result.items_synced == 3
+        assert result.details["unchanged"] == 2
+        assert "(2 unchanged)" in result.summary
+        assert (tmp_path / "docs" / "page-1.md").exists()
+
+    def test_modified_output_file_is_written_again(self, tmp_path: Path, fake_notion):
+        """A hand-edited file is restored, from the page cache since the page itself is unchanged."""
+        notion, base_url = fake_notion
+        self._sync(tmp_path, base_url, PAGE_IDS[:1])
+        (tmp_path / "docs" / "page-1.md").write_text("edited by hand")
+        notion.requests.clear()
+
+        self._sync(tmp_path, base_url, PAGE_IDS[:1])
+
+        assert self._children_requests(notion) == []
+        assert "title: Page 1" in (tmp_path / "docs" / "page-1.md").read_text()
+
+        for path in get_notion_cache_dir(tmp_path).iterdir():
+            path.unlink()
+        (tmp_path / "docs" / "page-1.md").write_text("edited by hand")
+        self._sync(tmp_path, base_url, PAGE_IDS[:1])
+
+        assert len(self._children_requests(notion)) == 1
+
+    def test_pages_edited_right_before_their_export_are_exported_again(self, tmp_path: Path, fake_notion):
+        """last_edited_time has minute precision, so it can't rule out edits made just before an export."""
+        notion, base_url = fake_notion
+        notion.last_edited[PAGE_IDS[0]] = utc_now()
+        self._sync(tmp_path, base_url, PAGE_IDS[:1])
+        notion.requests.clear()
+
+        self._sync(tmp_path, base_url, PAGE_IDS[:1])
+
+        assert len(self._children_requests(notion)) == 1
+
+    def test_cleanup_uses_the_manifest(self, tmp_path: Path, fake_notion):
+        """Removed pages are cleaned up, pages failing this time and unrelated files are kept."""
+        notion, base_url = fake_notion
+        self._sync(tmp_path, base_url, PAGE_IDS[:3])
+        (tmp_path / "docs" / "notes.md").write_text("mine")
+
+        notion.failing.add(PAGE_IDS[0])
+        result = self._sync(tmp_path, base_url, PAGE_IDS[:2])
+
+        docs = sorted(p.name for p in (tmp_path / "docs").iterdir())
+        assert docs == ["notes.md", "page-1.md", "page-2.md"]
+        assert result.details["removed"] == 1
+        manifest = json.loads((tmp_path / ".nao" / "sync" / "docs" / MANIFEST_FILENAME).read_text())
+        assert sorted(manifest["pages"]) == PAGE_IDS[:2]
+
+    def test_pages_with_the_same_title_get_their_own_file(self, tmp_path: Path, fake_notion):
+        """Colliding titles are disambiguated with the page ID, and each page keeps its file."""
+        notion, base_url = fake_notion
+        notion.titles = {PAGE_IDS[0]: "Notes", PAGE_IDS[1]: "Notes"}
+
+        first = self._sync(tmp_path, base_url, PAGE_IDS[:2])
+        files = sorted(p.name for p in (tmp_path / "docs").iterdir())
+        second = self._sync(tmp_path, base_url, PAGE_IDS[:2])
+
+        assert first.items_synced == 2
+        assert len(files) == 2
+        assert "notes.md" in files
+        assert sorted(p.name for p in (tmp_path / "docs").iterdir()) == files
+        assert second.details["unchanged"] == 2
+
+
+class TestNotionPageCache:
+    def _session(self, base_url: str) -> NotionSession:
+        return NotionSession("secret", base_url=base_url, limiter=TokenBucket(rate=1000.0, capacity=10))
+
+    def _backdate(self, cache: NotionPageCache, page_id: str, **fields: str) -> None:
+        page = cache.get(page_id)
+        assert page is not None
+        for name, value in fields.items():
+            setattr(page, name, value)
+        cache.put(page)
+
+    def test_fresh_pages_cost_no_request(self, tmp_path: Path, fake_notion):
+        notion, base_url = fake_notion
+        cache = NotionPageCache(tmp_path)
+        with self._session(base_url) as session:
+            load_page(session, PAGE_IDS[0], cache)
+            notion.requests.clear()
+            page = load_page(session, PAGE_IDS[0], cache)
+
+        assert page.title == "Page 1"
+        assert notion.requests == []
+
+    def test_stale_pages_are_revalidated_with_a_metadata_call(self, tmp_path: Path, fake_notion):
+        notion, base_url = fake_notion
+        cache = NotionPageCache(tmp_path, ttl=0)
+        with self._session(base_url) as session:
+            load_page(session, PAGE_IDS[0], cache)
+            # Exported long after the last edit, so the timestamp is conclusive
+            self._backdate(cache, PAGE_IDS[0], exported_at="2024-06-01T00:00:00.000Z")
+            notion.requests.clear()
+            unedited = load_page(session, PAGE_IDS[0], cache)
+            requests_when_unedited = list(notion.requests)
+
+            notion.last_edited[PAGE_IDS[0]] = "2024-07-01T00:00:00.000Z"
+            edited = load_page(session, PAGE_IDS[0], cache)
+
+        assert requests_when_unedited == [f"/v1/pages/{PAGE_IDS[0]}"]
+        assert unedited.exported_at == "2024-06-01T00:00:00.000Z"
+        assert edited.last_edited_time == "2024-07-01T00:00:00.000Z"
+        assert notion.requests[-1] == f"/v1/blocks/{PAGE_IDS[0]}/children"
+
+    def test_templates_read_pages_cached_by_the_sync(self, tmp_path: Path, fake_notion):
+        notion, base_url = fake_notion
+        config = MagicMock()
+        config.api_key = "secret"
+        config.pages = PAGE_IDS[:2]
+        config.cache_ttl = 3600
+        config.databases = []
+        config.crawl_depth = 0
+        session_factory = partial(NotionSession, base_url=base_url, limiter=TokenBucket(rate=1000.0, capacity=10))
+        with patch("nao_core.commands.sync.providers.notion.provider.NotionSession", session_factory):
+            NotionSyncProvider().sync([config], tmp_path / "docs", project_path=tmp_path)
+        notion.requests.clear()
+
+        nao_config = MagicMock()
+        nao_config.notion = config
+        with patch.object(notion_client_module, "NotionSession", session_factory):
+            page = NotionProvider(nao_config, project_path=tmp_path).page(PAGE_IDS[1])
+            content = page.content
+
+        assert page.title == "Page 2"
+        assert "Content of 02" in content
+        assert notion.requests == []
+        assert len(list(get_notion_cache_dir(tmp_path).glob("*.json"))) == 2
+
+
+class TestCrawl:
+    def test_visits_each_node_once_down_to_max_depth(self):
+        tree = {"a": ["b", "c"], "b": ["a", "d"], "c": ["d"], "d": ["e"]}
+
+        def visit(node: CrawlNode):
+            links = [CrawlNode("page", child, node.depth + 1) for child in tree.get(node.id, [])]
+            return node.id, links
+
+        visited = [node.id for node, _ in crawl([CrawlNode("page", "a", 0)], visit, max_depth=2, max_workers=2)]
+
+        assert sorted(visited) == ["a", "b", "c", "d"]
+
+    def test_concurrency_is_bounded(self):
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def visit(node: CrawlNode):
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            threading.Event().wait(0.01)
+            with lock:
+                active[0] -= 1
+            return None, [CrawlNode("page", f"{node.id}.{i}", node.depth + 1) for i in range(3)]
+
+        results = list(crawl([CrawlNode("page", "root", 0)], visit, max_depth=2, max_workers=3))
+
+        assert len(results) == 1 + 3 + 9
+        assert active[1] <= 3
+
+    def test_failed_visits_are_reported(self):
+        def visit(node: CrawlNode):
+            raise RuntimeError("boom")
+
+        [(node, outcome)] = list(crawl([CrawlNode("page", "a", 0)], visit, max_depth=1, max_workers=1))
+
+        assert isinstance(outcome, RuntimeError)
+
+
+class TestRecursiveNotionSync(TestIncrementalNotionSync):
+    def _tree(self, notion: FakeNotion) -> None:
+        # Page 1 -> Page 2 (-> Page 4 -> Page 5, Page 1), and Page 3 nested in a toggle
+        toggle = {"id": "e" * 32, "type": "toggle", "has_children": True, "toggle": {"rich_text": []}}
+        notion.children = {
+            PAGE_IDS[0]: [_child_page(PAGE_IDS[1]), toggle],
+            "e" * 32: [_child_page(PAGE_IDS[2])],
+            PAGE_IDS[1]: [_child_page(PAGE_IDS[3]), _child_page(PAGE_IDS[0])],
+            PAGE_IDS[3]: [_child_page(PAGE_IDS[4])],
+        }
+
+    def test_child_pages_are_crawled_to_the_depth_limit(self, tmp_path: Path, fake_notion):
+        notion, base_url = fake_notion
+        self._tree(notion)
+
+        result = self._sync(tmp_path, base_url, PAGE_IDS[:1], crawl_depth=2)
+
+        assert result.details["pages"] == ["Page 1", "Page 2", "Page 4", "Page 3"]
+        # Each block tree is fetched once, for both the markdown and the child pages
+        children_requests = self._children_requests(notion)
+        assert len(children_requests) == len(set(children_requests)) == 5
+        assert (tmp_path / "docs" / "page-4.md").exists()
+        assert not (tmp_path / "docs" / "page-5.md").exists()
+
+    def test_unchanged_pages_are_crawled_from_the_manifest(self, tmp_path: Path, fake_notion):
+        notion, base_url = fake_notion
+        self._tree(notion)
+        self._sync(tmp_path, base_url, PAGE_IDS[:1], crawl_depth=2)
+        notion.requests.clear()
+
+        result = self._sync(tmp_path, base_url, PAGE_IDS[:1], crawl_depth=2)
+
+        assert result.details["unchanged"] == 4
+        assert self._children_requests(notion) == []
+        assert len(list((tmp_path / "docs").iterdir())) == 4
+
+    def test_database_rows_are_synced(self, tmp_path: Path, fake_notion):
+        notion, base_url = fake_notion
+        notion.database_rows = PAGE_IDS[4:]
+
+        result = self._sync(tmp_path, base_url, [], databases=[DATABASE_ID])
+
+        assert result.details["pages"] == ["Page 5", "Page 6"]
+        # Row metadata comes with the query, so pages are not retrieved one by one
+        assert not [path for path in notion.requests if path.startswith("/v1/pages/")]
+
+    def test_rows_are_kept_when_the_database_query_fails(self, tmp_path: Path, fake_notion):
+        """A failed query falls back to the rows of the last sync instead of cleaning them up."""
+        notion, base_url = fake_notion
+        notion.database_rows = PAGE_IDS[4:]
+        self._sync(tmp_path, base_url, [], databases=[DATABASE_ID])
+
+        notion.database_failing = True
+        result = self._sync(tmp_path, base_url, [], databases=[DATABASE_ID])
+
+        assert result.details["removed"] == 0
+        assert result.details["pages"] == ["Page 5", "Page 6"]
+        assert (tmp_path / "docs" / "page-5.md").exists()
+        assert (tmp_path / "docs" / "page-6.md").exists()
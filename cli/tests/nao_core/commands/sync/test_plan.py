@@ -0,0 +1,171 @@
+"""Unit tests for nao sync --plan."""
+
+import json
+from unittest.mock import MagicMock
+
+import duckdb
+from rich.console import Console
+
+from nao_core.commands.sync.plan import format_bytes, print_plan
+from nao_core.commands.sync.providers.databases.plan import plan_database, template_accessor_calls
+from nao_core.commands.sync.providers.databases.provider import DatabaseSyncProvider
+from nao_core.config.databases import DuckDBConfig, TrinoConfig
+from nao_core.config.databases.base import DatabaseAccessor, explain_scan_bytes
+from nao_core.templates.engine import TemplateEngine
+
+
+def _duckdb_config(tmp_path, **kwargs) -> DuckDBConfig:
+    db_file = tmp_path / "plan.duckdb"
+    with duckdb.connect(str(db_file)) as conn:
+        conn.execute("CREATE TABLE users (id INTEGER)")
+        conn.execute("CREATE TABLE orders (id INTEGER)")
+        conn.execute("CREATE TABLE tmp_scratch (id INTEGER)")
+    return DuckDBConfig(name="local", path=str(db_file), **kwargs)
+
+
+class TestPlanDatabase:
+    def test_counts_tables_and_queries(self, tmp_path):
+        config = _duckdb_config(tmp_path, exclude=["*.tmp_*"])
+
+        plan = plan_database(config)
+
+        assert plan.schemas["main"] == 2
+        assert plan.tables == 2
+        # columns, partition_columns, column_count, description per table
+        assert plan.metadata_queries == 8
+        # preview and row_count per table
+        assert plan.scan_queries == 4
+        assert plan.estimated_bytes_scanned is None
+        assert plan.errors == []
+
+    def test_queries_follow_configured_accessors(self, tmp_path):
+        config = _duckdb_config(tmp_path, accessors=[DatabaseAccessor.COLUMNS])
+
+        plan = plan_database(config)
+
+        assert plan.metadata_queries == 6
+        assert plan.scan_queries == 0
+
+    def test_queries_follow_template_calls(self, tmp_path):
+        project = tmp_path / "project"
+        (project / "templates" / "databases").mkdir(parents=True)
+        (project / "templates" / "databases" / "description.md.j2").write_text("{{ db.description() }}")
+        config = _duckdb_config(tmp_path, accessors=[DatabaseAccessor.DESCRIPTION])
+
+        plan = DatabaseSyncProvider().plan([config], project_path=project)
+
+        # The overridden description template never counts rows
+        assert plan["metadata_queries"] == 3
+        assert plan["scan_queries"] == 0
+
+    def test_template_calls_fall_back_to_defaults_when_inconclusive(self, tmp_path):
+        (tmp_path / "templates" / "databases").mkdir(parents=True)
+        (tmp_path / "templates" / "databases" / "preview.md.j2").write_text(
+            "{% macro show(ctx) %}{{ ctx.preview() }}{% endmacro %}{{ show(db) }}"
+        )
+
+        calls = template_accessor_calls(TemplateEngine(tmp_path), ["databases/preview.md.j2"])
+
+        assert calls == {"preview"}
+
+    def test_disconnects_after_planning(self):
+        config = MagicMock(accessors=list(DatabaseAccessor))
+        config.get_schemas.side_effect = RuntimeError("no catalog access")
+
+        plan = plan_database(config)
+
+        assert plan.errors == ["RuntimeError: no catalog access"]
+        config.connect.return_value.disconnect.assert_called_once()
+
+    def test_connection_errors_are_reported(self):
+        config = MagicMock(accessors=list(DatabaseAccessor))
+        config.name = "broken"
+        config.connect.side_effect = RuntimeError("unreachable")
+
+        plan = plan_database(config)
+
+        assert plan.tables == 0
+        assert plan.errors == ["RuntimeError: unreachable"]
+
+    def test_provider_plan_sums_databases(self, tmp_path):
+        plan = DatabaseSyncProvider().plan([_duckdb_config(tmp_path)])
+
+        assert plan["items"] == 1
+        assert plan["tables"] == 3
+        assert plan["databases"][0]["name"] == "local"
+        json.dumps(plan)
+
+    def test_plan_does_not_write_outputs(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        plan_database(_duckdb_config(tmp_path))
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["plan.duckdb"]
+
+
+class TestScanEstimates:
+    def test_explain_io_sums_input_estimates(self):
+        conn = MagicMock()
+        explain = {
+            "inputTableColumnInfos": [
+                {"estimate": {"outputSizeInBytes": 1000.0}},
+                {"estimate": {"outputSizeInBytes": float("nan")}},
+                {"estimate": {"outputSizeInBytes": 24}},
+            ]
+        }
+        conn.raw_sql.return_value.fetchall.return_value = [(json.dumps(explain),)]
+
+        assert explain_scan_bytes(conn, "SELECT 1") == 1024
+        assert conn.raw_sql.call_args[0][0] == "EXPLAIN (TYPE IO, FORMAT JSON) SELECT 1"
+
+    def test_explain_io_without_estimates(self):
+        conn = MagicMock()
+        conn.raw_sql.return_value.fetchall.return_value = [(json.dumps({"inputTableColumnInfos": []}),)]
+
+        assert explain_scan_bytes(conn, "SELECT 1") is None
+
+    def test_trino_estimates_full_table_scan(self):
+        config = TrinoConfig(name="t", host="localhost", catalog="hive", user="nao")
+        conn = MagicMock()
+        conn.raw_sql.return_value.fetchall.return_value = [
+            (json.dumps({"inputTableColumnInfos": [{"estimate": {"outputSizeInBytes": 42}}]}),)
+        ]
+
+        assert config.estimate_scan_bytes(conn, "sales", "orders") == 42
+        assert 'SELECT * FROM "hive"."sales"."orders"' in conn.raw_sql.call_args[0][0]
+
+
+class TestPrintPlan:
+    def test_text_output(self):
+        console = Console(record=True, width=200)
+        plans = {
+            "Databases": {
+                "items": 1,
+                "tables": 2,
+                "metadata_queries": 8,
+                "scan_queries": 4,
+                "estimated_bytes_scanned": 3 * 1024**3,
+                "databases": [
+                    {
+                        "name": "wh",
+                        "type": "bigquery",
+                        "schemas": {"a": 2},
+                        "tables": 2,
+                        "metadata_queries": 8,
+                        "scan_queries": 4,
+                        "estimated_bytes_scanned": 3 * 1024**3,
+                        "errors": [],
+                    }
+                ],
+            },
+            "Repositories": {"items": 3},
+        }
+
+        print_plan(plans, console)
+
+        text = console.export_text()
+        assert "wh (bigquery) — 2 tables in 1 schemas, 8 metadata queries, 4 scan queries, ~3.0 GiB scanned" in text
+        assert "Repositories: 3 items" in text
+
+    def test_format_bytes(self):
+        assert format_bytes(512) == "512 B"
+        assert format_bytes(1536) == "1.5 KiB"
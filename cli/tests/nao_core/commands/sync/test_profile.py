@@ -0,0 +1,88 @@
+"""Unit tests for the sync profiler."""
+
+import json
+import time
+from pathlib import Path
+
+from nao_core.commands.sync.profile import SyncProfiler
+
+
+def _profiler_with_events() -> SyncProfiler:
+    profiler = SyncProfiler()
+    start = time.monotonic()
+    profiler.record("connect", "database", start, start + 0.5, database="warehouse")
+    profiler.record("list_tables", "schema", start, start + 0.25, database="warehouse", schema="public")
+    profiler.record(
+        "render",
+        "table",
+        start,
+        start + 1.0,
+        database="warehouse",
+        schema="public",
+        table="users",
+        accessor="preview",
+        bytes_written=120,
+        error=None,
+    )
+    profiler.record(
+        "render",
+        "table",
+        start,
+        start + 2.0,
+        database="warehouse",
+        schema="public",
+        table="orders",
+        accessor="preview",
+        bytes_written=0,
+        error="RuntimeError: locked",
+    )
+    profiler.record("query", "table", start, start + 0.75, database="warehouse", table="users", accessor="preview")
+    return profiler
+
+
+class TestSyncProfiler:
+    def test_disabled_profiler_records_nothing(self):
+        profiler = SyncProfiler(enabled=False)
+
+        profiler.record("connect", "database", time.monotonic(), database="db")
+
+        assert profiler.events == []
+
+    def test_drops_none_args(self):
+        profiler = _profiler_with_events()
+
+        render = next(e for e in profiler.events if e.name == "render")
+
+        assert "error" not in render.args
+        assert render.args["bytes_written"] == 120
+
+    def test_to_dict_aggregates_per_database(self):
+        profile = _profiler_with_events().to_dict()
+
+        totals = profile["databases"]["warehouse"]
+        assert totals["connect_seconds"] == 0.5
+        assert totals["list_seconds"] == 0.25
+        assert totals["render_seconds"] == 3.0
+        assert totals["query_seconds"] == 0.75
+        assert totals["bytes_written"] == 120
+        assert totals["errors"] == 1
+        assert len(profile["events"]) == 5
+
+    def test_chrome_trace_uses_complete_events_in_microseconds(self):
+        trace = _profiler_with_events().to_chrome_trace()
+
+        complete = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        metadata = [e for e in trace["traceEvents"] if e["ph"] == "M"]
+        assert len(complete) == 5
+        assert complete[0]["dur"] == 500_000
+        assert complete[2]["name"] == "render public/users/preview"
+        assert metadata == [{"name": "thread_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "warehouse"}}]
+
+    def test_write_formats(self, tmp_path: Path):
+        profiler = _profiler_with_events()
+
+        profiler.write(tmp_path / "profile.json")
+        profiler.write(tmp_path / "trace.json", "chrome")
+
+        assert "databases" in json.loads((tmp_path / "profile.json").read_text())
+        assert "traceEvents" in json.loads((tmp_path / "trace.json").read_text())
@@ -1,11 +1,18 @@
 """Test that template rendering errors are logged to CLI."""
 
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
+import pandas as pd
 import pytest
 
-from nao_core.commands.sync.providers.databases.provider import sync_database
-from nao_core.config.databases.base import DatabaseAccessor
+from nao_core.commands.sync.layout import read_section
+from nao_core.commands.sync.profile import SyncProfiler
+from nao_core.commands.sync.providers.databases.context import DatabaseContext
+from nao_core.commands.sync.providers.databases.provider import render_database_snapshot, sync_database
+from nao_core.config.databases.base import DatabaseAccessor, QueryLimits
+from nao_core.templates.analysis import AccessorCall
 
 
 @pytest.fixture
@@ -31,12 +38,23 @@ def create_mock_db_config(
     mock_config.name = name
     mock_config.type = db_type
     mock_config.accessors = list(DatabaseAccessor)
+    mock_config.query_timeout = None
+    mock_config.max_consecutive_failures = 3
+    mock_config.list_concurrency = 1
+    mock_config.list_tables_bulk.return_value = None
+    mock_config.preview_max_columns = None
+    mock_config.preview_max_chars = None
+    mock_config.limits = QueryLimits()
+    mock_config.max_retries = 3
+    mock_config.prefetch_schema.return_value = {}
+    mock_config.output_layout = "tables"
     mock_conn = MagicMock()
     mock_config.connect.return_value = mock_conn
     mock_config.get_database_name.return_value = database_name
     mock_config.get_schemas.return_value = schemas
     mock_config.matches_pattern.return_value = True
     mock_conn.list_tables.return_value = tables
+    mock_config.create_context.side_effect = lambda conn, schema, table: DatabaseContext(conn, schema, table)
 
     return mock_config
 
@@ -49,14 +67,14 @@ def create_mock_engine(templates, render_behavior):
     return mock
 
 
-def run_sync_with_mocks(db_config, engine, tmp_path, progress):
+def run_sync_with_mocks(db_config, engine, tmp_path, progress, **kwargs):
     """Run sync_database with patched console and engine, return state and console mock."""
     with patch("nao_core.commands.sync.providers.databases.provider.console") as mock_console:
         with patch(
             "nao_core.commands.sync.providers.databases.provider.get_template_engine",
             return_value=engine,
         ):
-            state = sync_database(db_config, tmp_path, progress, None)
+            state = sync_database(db_config, tmp_path, progress, None, **kwargs)
     return state, mock_console
 
 
@@ -162,3 +180,439 @@ class TestSyncDatabaseErrorLogging:
         assert "ANALYTICS.CUSTOMERS" in error_msg
         # Should have the actual error message
         assert "Test error message" in error_msg
+
+
+class TestSyncDatabaseWrites:
+    """Test that unchanged output files are not rewritten."""
+
+    def test_second_sync_leaves_unchanged_files(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config()
+        engine = create_mock_engine(
+            templates=["databases/columns.md.j2", "databases/preview.md.j2"],
+            render_behavior=lambda template_name, **kwargs: f"{template_name} for {kwargs['table_name']}",
+        )
+
+        first, _ = run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+        second, _ = run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+
+        assert (first.files_written, first.files_unchanged) == (2, 0)
+        assert (second.files_written, second.files_unchanged) == (0, 2)
+
+
+class Interrupted(BaseException):
+    """Simulates the process dying mid-sync (e.g. KeyboardInterrupt, OOM kill)."""
+
+
+class TestSyncDatabaseResume:
+    """Test checkpointing and resuming an interrupted sync."""
+
+    def test_resume_skips_tables_completed_before_interruption(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config(tables=["a", "b", "c"])
+        rendered: list[str] = []
+
+        def crash_on_b(template_name, **kwargs):
+            if kwargs["table_name"] == "b":
+                raise Interrupted()
+            rendered.append(kwargs["table_name"])
+            return "content"
+
+        engine = create_mock_engine(templates=["databases/columns.md.j2"], render_behavior=crash_on_b)
+        with pytest.raises(Interrupted):
+            run_sync_with_mocks(db_config, engine, tmp_path / "databases", mock_progress)
+
+        assert rendered == ["a"]
+
+        def record(template_name, **kwargs):
+            rendered.append(kwargs["table_name"])
+            return "content"
+
+        engine = create_mock_engine(templates=["databases/columns.md.j2"], render_behavior=record)
+        state, _ = run_sync_with_mocks(db_config, engine, tmp_path / "databases", mock_progress, resume=True)
+
+        assert rendered == ["a", "b", "c"]
+        assert state.completed is True
+        assert state.tables_resumed == 1
+        assert state.synced_tables == {"test_schema": {"a", "b", "c"}}
+        assert not list((tmp_path / ".nao" / "sync").rglob("journal.jsonl"))
+
+    def test_without_resume_starts_over(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config(tables=["a", "b"])
+
+        def crash_on_b(template_name, **kwargs):
+            if kwargs["table_name"] == "b":
+                raise Interrupted()
+            return "content"
+
+        engine = create_mock_engine(templates=["databases/columns.md.j2"], render_behavior=crash_on_b)
+        with pytest.raises(Interrupted):
+            run_sync_with_mocks(db_config, engine, tmp_path / "databases", mock_progress)
+
+        engine = create_mock_engine(templates=["databases/columns.md.j2"], render_behavior=lambda t, **kw: "content")
+        state, _ = run_sync_with_mocks(db_config, engine, tmp_path / "databases", mock_progress)
+
+        assert state.tables_resumed == 0
+        assert engine.render.call_count == 2
+
+
+class TestSyncDatabaseGuards:
+    """Test per-render timeouts and the per-schema circuit breaker."""
+
+    @patch("nao_core.commands.sync.providers.databases.guards.CANCEL_GRACE_SECONDS", 0.05)
+    def test_timed_out_render_writes_error_and_counts_timeout(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config()
+        db_config.query_timeout = 0.05
+        release = threading.Event()
+        engine = create_mock_engine(
+            templates=["databases/preview.md.j2"],
+            render_behavior=lambda template_name, **kwargs: release.wait(5),
+        )
+
+        try:
+            state, _ = run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+        finally:
+            release.set()
+
+        assert state.timeouts == 1
+        preview_file = next(tmp_path.rglob("preview.md"))
+        assert "timed out after 0.05s" in preview_file.read_text()
+
+    @patch("nao_core.commands.sync.providers.databases.guards.CANCEL_GRACE_SECONDS", 0.05)
+    def test_reconnects_when_timed_out_render_does_not_stop(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config(tables=["slow", "next"])
+        db_config.query_timeout = 0.05
+        old_conn, new_conn = MagicMock(), MagicMock()
+        old_conn.list_tables.return_value = ["slow", "next"]
+        db_config.connect.side_effect = [old_conn, new_conn]
+        release = threading.Event()
+        contexts: list[tuple[str, str, object]] = []
+
+        def render(template_name, db, table_name, **kwargs):
+            contexts.append((table_name, template_name, db._conn))
+            if table_name == "slow" and template_name.endswith("preview.md.j2"):
+                release.wait(5)
+            return "ok"
+
+        engine = create_mock_engine(
+            templates=["databases/preview.md.j2", "databases/columns.md.j2"],
+            render_behavior=render,
+        )
+
+        try:
+            state, _ = run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+        finally:
+            release.set()
+
+        assert state.timeouts == 1
+        # Everything after the abandoned render runs on the new connection
+        assert contexts == [
+            ("slow", "databases/preview.md.j2", old_conn),
+            ("slow", "databases/columns.md.j2", new_conn),
+            ("next", "databases/preview.md.j2", new_conn),
+            ("next", "databases/columns.md.j2", new_conn),
+        ]
+
+    @patch("nao_core.commands.sync.providers.databases.guards.CANCEL_GRACE_SECONDS", 1.0)
+    def test_accessor_after_timed_out_render_still_runs(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config()
+        db_config.query_timeout = 0.05
+
+        def render(template_name, db, **kwargs):
+            if template_name.endswith("description.md.j2"):
+                # Stops as soon as its query is cancelled
+                while not db.cancelled:
+                    time.sleep(0.01)
+                return "late"
+            db._conn.table.return_value.count.return_value.execute.return_value = 3
+            return f"rows: {db.row_count()}"
+
+        engine = create_mock_engine(
+            templates=["databases/description.md.j2", "databases/preview.md.j2"],
+            render_behavior=render,
+        )
+
+        state, _ = run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+
+        assert state.timeouts == 1
+        assert next(tmp_path.rglob("preview.md")).read_text() == "rows: 3"
+
+    def test_breaker_skips_expensive_accessors_after_failures(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config(tables=["a", "b", "c", "d"])
+        db_config.max_consecutive_failures = 2
+        rendered: list[tuple[str, str]] = []
+
+        def fail_preview(template_name, **kwargs):
+            rendered.append((kwargs["table_name"], template_name))
+            if template_name.endswith("preview.md.j2"):
+                raise RuntimeError("table locked")
+            return "columns"
+
+        engine = create_mock_engine(
+            templates=["databases/columns.md.j2", "databases/preview.md.j2"],
+            render_behavior=fail_preview,
+        )
+
+        state, mock_console = run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+
+        # columns always renders; preview fails for a and b (but columns resets the breaker in between)
+        assert [t for t, name in rendered if name.endswith("preview.md.j2")] == ["a", "b", "c", "d"]
+
+        db_config.max_consecutive_failures = 1
+        rendered.clear()
+        state, mock_console = run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+
+        assert [t for t, name in rendered if name.endswith("preview.md.j2")] == ["a"]
+        assert [t for t, name in rendered if name.endswith("columns.md.j2")] == ["a", "b", "c", "d"]
+        assert state.skipped_tables == ["test_schema.b", "test_schema.c", "test_schema.d"]
+        all_output = [call.args[0] for call in mock_console.print.call_args_list if call.args]
+        assert any("exclude" in line for line in all_output)
+
+
+class TestSyncDatabaseQueryLimits:
+    """Test that query limits are enforced on the accessors called by templates."""
+
+    def test_previews_are_skipped_once_scan_budget_is_spent(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config(tables=["a", "b", "c"])
+        db_config.limits = QueryLimits(max_bytes_scanned=250)
+        db_config.estimate_scan_bytes.return_value = 100
+        scanned: list[str] = []
+
+        def render(template_name, db, table_name, **kwargs):
+            db._conn.table.return_value.limit.return_value.execute.return_value = pd.DataFrame({"id": [1]})
+            db.preview()
+            scanned.append(table_name)
+            return "preview"
+
+        engine = create_mock_engine(templates=["databases/preview.md.j2"], render_behavior=render)
+
+        state, _ = run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+
+        assert scanned == ["a", "b"]
+        assert state.bytes_scanned == 200
+        assert state.skipped_tables == ["test_schema.c"]
+        assert "budget" in next(p for p in tmp_path.rglob("preview.md") if "table=c" in str(p)).read_text()
+
+    def test_throttled_queries_are_retried(self, tmp_path, mock_progress):
+        class TooManyRequests(RuntimeError):
+            code = 429
+
+        db_config = create_mock_db_config()
+        db_config.limits = QueryLimits(max_queries_per_second=1000)
+        attempts = []
+
+        def render(template_name, db, **kwargs):
+            def execute():
+                attempts.append(1)
+                if len(attempts) == 1:
+                    raise TooManyRequests("Too many concurrent queries")
+                return pd.DataFrame({"id": [1]})
+
+            db._conn.table.return_value.limit.return_value.execute.side_effect = execute
+            return str(db.preview())
+
+        engine = create_mock_engine(templates=["databases/preview.md.j2"], render_behavior=render)
+
+        with patch("nao_core.config.databases.governor.THROTTLE_BACKOFF_SECONDS", 0):
+            state, _ = run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+
+        assert len(attempts) == 2
+        assert state.throttled_queries == 1
+        assert "Error" not in next(tmp_path.rglob("preview.md")).read_text()
+
+
+class TestSyncDatabaseRetries:
+    """Test that transient query errors are retried and reported."""
+
+    def test_transient_errors_are_retried_and_counted(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config()
+        attempts = []
+
+        def render(template_name, db, **kwargs):
+            def execute():
+                attempts.append(1)
+                if len(attempts) == 1:
+                    raise ConnectionResetError("connection reset by peer")
+                return pd.DataFrame({"id": [1]})
+
+            db._conn.table.return_value.limit.return_value.execute.side_effect = execute
+            return str(db.preview())
+
+        engine = create_mock_engine(templates=["databases/preview.md.j2"], render_behavior=render)
+
+        with patch("nao_core.config.databases.retry.time.sleep"):
+            state, _ = run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+
+        assert len(attempts) == 2
+        assert state.query_retries == 1
+        assert "Error" not in next(tmp_path.rglob("preview.md")).read_text()
+
+    def test_permanent_errors_are_not_retried(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config()
+        attempts = []
+
+        def render(template_name, db, **kwargs):
+            def execute():
+                attempts.append(1)
+                raise RuntimeError("permission denied for table")
+
+            db._conn.table.return_value.limit.return_value.execute.side_effect = execute
+            return str(db.preview())
+
+        engine = create_mock_engine(templates=["databases/preview.md.j2"], render_behavior=render)
+
+        state, _ = run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+
+        assert len(attempts) == 1
+        assert state.query_retries == 0
+        assert "permission denied" in next(tmp_path.rglob("preview.md")).read_text()
+
+
+class TestSyncDatabaseSnapshot:
+    """Test the metadata snapshot written by sync and --render-only re-rendering."""
+
+    def test_render_only_rerenders_from_snapshot_without_connecting(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config(tables=["users"])
+        db_config.matches_pattern.side_effect = None
+        db_config.connect.return_value.table.return_value.schema.return_value.items.return_value = [
+            ("id", MagicMock(__str__=lambda s: "int64", nullable=False))
+        ]
+        engine = create_mock_engine(
+            templates=["databases/columns.md.j2"],
+            render_behavior=lambda template_name, db, **kwargs: f"v1 {db.columns()[0]['name']}",
+        )
+        run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+        db_config.connect.reset_mock()
+
+        engine.render.side_effect = lambda template_name, db, **kwargs: f"v2 {db.columns()[0]['name']}"
+        with patch("nao_core.commands.sync.providers.databases.provider.get_template_engine", return_value=engine):
+            state = render_database_snapshot(db_config, tmp_path, mock_progress)
+
+        db_config.connect.assert_not_called()
+        assert state.tables_synced == 1
+        assert next(tmp_path.rglob("columns.md")).read_text() == "v2 id"
+
+    def test_render_only_reports_accessors_missing_from_snapshot(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config()
+        engine = create_mock_engine(templates=["databases/columns.md.j2"], render_behavior=lambda *a, **k: "ok")
+        run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+
+        engine.render.side_effect = lambda template_name, db, **kwargs: str(db.preview(limit=3))
+        with patch("nao_core.commands.sync.providers.databases.provider.console"):
+            with patch("nao_core.commands.sync.providers.databases.provider.get_template_engine", return_value=engine):
+                render_database_snapshot(db_config, tmp_path, mock_progress)
+
+        assert "preview(limit=3) is not in the metadata snapshot" in next(tmp_path.rglob("columns.md")).read_text()
+
+    def test_render_only_requires_a_snapshot(self, tmp_path, mock_progress):
+        with pytest.raises(FileNotFoundError, match="run `nao sync` first"):
+            render_database_snapshot(create_mock_db_config(database_name="never_synced"), tmp_path, mock_progress)
+
+
+class TestSyncDatabasePrefetch:
+    """Test per-schema batch prefetching of the accessors templates call."""
+
+    def test_prefetched_results_answer_accessor_calls(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config(tables=["users", "orders"])
+        db_config.prefetch_schema.return_value = {"users": {"description": "All users"}}
+        engine = create_mock_engine(
+            templates=["databases/description.md.j2"],
+            render_behavior=lambda template_name, db, **kwargs: str(db.description()),
+        )
+        engine.accessor_calls.return_value = frozenset({AccessorCall("description")})
+
+        run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+
+        db_config.prefetch_schema.assert_called_once_with(
+            db_config.connect.return_value, "test_schema", ["users", "orders"], {"description"}
+        )
+        assert (next(tmp_path.rglob("table=users")) / "description.md").read_text() == "All users"
+        assert (next(tmp_path.rglob("table=orders")) / "description.md").read_text() == "None"
+
+    def test_no_prefetch_when_templates_call_no_accessors(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config()
+        engine = create_mock_engine(templates=["databases/columns.md.j2"], render_behavior=lambda *a, **k: "static")
+        engine.accessor_calls.return_value = frozenset()
+
+        run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+
+        db_config.prefetch_schema.assert_not_called()
+
+    def test_failed_prefetch_falls_back_to_per_table_queries(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config()
+        db_config.prefetch_schema.side_effect = RuntimeError("permission denied for pg_description")
+        engine = create_mock_engine(
+            templates=["databases/description.md.j2"],
+            render_behavior=lambda template_name, db, **kwargs: str(db.description()),
+        )
+        engine.accessor_calls.return_value = frozenset({AccessorCall("description")})
+
+        state, mock_console = run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+
+        assert state.tables_synced == 1
+        assert next(tmp_path.rglob("description.md")).read_text() == "None"
+        printed = " ".join(str(call) for call in mock_console.print.call_args_list)
+        assert "Batch metadata query failed" in printed
+
+    def test_throttled_prefetch_is_retried_by_the_governor(self, tmp_path, mock_progress):
+        class TooManyRequests(RuntimeError):
+            code = 429
+
+        db_config = create_mock_db_config(tables=["users"])
+        db_config.limits = QueryLimits(max_queries_per_second=1000)
+        db_config.prefetch_schema.side_effect = [
+            TooManyRequests("Too many concurrent queries"),
+            {"users": {"description": "All users"}},
+        ]
+        engine = create_mock_engine(
+            templates=["databases/description.md.j2"],
+            render_behavior=lambda template_name, db, **kwargs: str(db.description()),
+        )
+        engine.accessor_calls.return_value = frozenset({AccessorCall("description")})
+
+        with patch("nao_core.config.databases.governor.THROTTLE_BACKOFF_SECONDS", 0):
+            state, _ = run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+
+        assert state.throttled_queries == 1
+        assert next(tmp_path.rglob("description.md")).read_text() == "All users"
+
+
+class TestSyncDatabaseOutputLayout:
+    """Test that sync writes consolidated files in the schema/catalog layouts."""
+
+    def test_schema_layout_consolidates_tables(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config(tables=["users", "orders"])
+        db_config.output_layout = "schema"
+        engine = create_mock_engine(
+            templates=["databases/columns.md.j2", "databases/preview.md.j2"],
+            render_behavior=lambda template_name, table_name, **kwargs: f"{table_name} {template_name}",
+        )
+
+        state, _ = run_sync_with_mocks(db_config, engine, tmp_path, mock_progress)
+
+        schema_dir = next(tmp_path.rglob("schema=test_schema"))
+        assert sorted(p.name for p in schema_dir.iterdir()) == ["tables.index.json", "tables.md"]
+        assert read_section(schema_dir / "tables.md", "test_schema", "orders", "preview") == (
+            "orders databases/preview.md.j2"
+        )
+        assert state.tables_synced == 2
+        assert state.files_written == 1
+
+
+class TestSyncDatabaseProfile:
+    """Test that sync_database records profile events."""
+
+    def test_records_connect_list_render_and_errors(self, tmp_path, mock_progress):
+        db_config = create_mock_db_config()
+        engine = create_mock_engine(
+            templates=["databases/columns.md.j2", "databases/preview.md.j2"],
+            render_behavior=[RuntimeError("boom"), "ok"],
+        )
+        profiler = SyncProfiler()
+
+        run_sync_with_mocks(db_config, engine, tmp_path, mock_progress, profiler=profiler)
+
+        names = [e.name for e in profiler.events]
+        assert names == ["connect", "list_schemas", "list_tables", "render", "render"]
+        failed, succeeded = [e for e in profiler.events if e.name == "render"]
+        assert failed.args["error"] == "RuntimeError: boom"
+        assert failed.args["accessor"] == "columns"
+        assert succeeded.args["bytes_written"] == 2
@@ -1,11 +1,16 @@
 """Unit tests for the repository sync provider."""
 
+import threading
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+from nao_core.commands.sync.providers.base import SyncOptions
 from nao_core.commands.sync.providers.repositories.provider import (
     RepositorySyncProvider,
+    RepoSyncOutcome,
     clone_or_pull_repo,
+    sync_repo,
 )
 from nao_core.config.base import NaoConfig
 from nao_core.config.repos import RepoConfig
@@ -49,20 +54,53 @@ class TestRepositorySyncProvider:
         assert result.provider_name == "Repositories"
         assert result.items_synced == 0
 
-    @patch("nao_core.commands.sync.providers.repositories.provider.clone_or_pull_repo")
+    @patch("nao_core.commands.sync.providers.repositories.provider.sync_repo")
     @patch("nao_core.commands.sync.providers.repositories.provider.console")
-    def test_sync_counts_successful_repos(self, mock_console, mock_clone, tmp_path: Path):
+    def test_sync_counts_successful_repos(self, mock_console, mock_sync, tmp_path: Path):
         provider = RepositorySyncProvider()
         repos = [
             RepoConfig(name="repo1", url="https://github.com/test/repo1"),
             RepoConfig(name="repo2", url="https://github.com/test/repo2"),
             RepoConfig(name="repo3", url="https://github.com/test/repo3"),
         ]
-        mock_clone.side_effect = [True, False, True]  # 2 successes, 1 failure
+        # 2 successes, 1 failure
+        mock_sync.side_effect = lambda repo, _: RepoSyncOutcome(
+            repo.name, "clone", 0.1, "Failed to clone repo2: denied" if repo.name == "repo2" else None
+        )
 
         result = provider.sync(repos, tmp_path)
 
         assert result.items_synced == 2
+        assert result.details is not None
+        assert result.details["errors"] == {"repo2": "Failed to clone repo2: denied"}
+        assert result.get_summary() == "2 synced (1 failed)"
+
+    @patch("nao_core.commands.sync.providers.repositories.provider.sync_repo")
+    @patch("nao_core.commands.sync.providers.repositories.provider.console")
+    def test_sync_runs_repos_concurrently_and_reports_in_order(self, mock_console, mock_sync, tmp_path: Path):
+        provider = RepositorySyncProvider()
+        repos = [RepoConfig(name=f"repo{i}", url=f"https://github.com/test/repo{i}") for i in range(6)]
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def fake_sync(repo: RepoConfig, _: Path) -> RepoSyncOutcome:
+            with lock:
+                active[0] += 1
+                active[1] = max(active[1], active[0])
+            # Later repos finish first
+            time.sleep(0.01 * (6 - int(repo.name[-1])))
+            with lock:
+                active[0] -= 1
+            return RepoSyncOutcome(repo.name, "pull", 0.1)
+
+        mock_sync.side_effect = fake_sync
+
+        result = provider.sync(repos, tmp_path, options=SyncOptions(repo_workers=3))
+
+        assert result.details is not None
+        assert [repo["name"] for repo in result.details["repos"]] == [repo.name for repo in repos]
+        assert result.details["repos"][0] == {"name": "repo0", "action": "pull", "seconds": 0.1, "error": None}
+        assert 1 < active[1] <= 3
 
     def test_should_sync_returns_true_when_repos_exist(self):
         provider = RepositorySyncProvider()
@@ -171,3 +209,36 @@ class TestCloneOrPullRepo:
         result = clone_or_pull_repo(repo, tmp_path)
 
         assert result is False
+
+
+class TestSyncRepo:
+    @patch("nao_core.commands.sync.providers.repositories.provider.subprocess.run")
+    def test_times_successful_clone(self, mock_run, tmp_path: Path):
+        repo = RepoConfig(name="new-repo", url="https://github.com/test/new-repo")
+        mock_run.return_value = MagicMock(returncode=0)
+
+        outcome = sync_repo(repo, tmp_path)
+
+        assert outcome.success
+        assert outcome.action == "clone"
+        assert outcome.seconds >= 0
+
+    @patch("nao_core.commands.sync.providers.repositories.provider.subprocess.run")
+    def test_returns_git_error(self, mock_run, tmp_path: Path):
+        (tmp_path / "existing-repo").mkdir()
+        repo = RepoConfig(name="existing-repo", url="https://github.com/test/existing-repo")
+        mock_run.return_value = MagicMock(returncode=1, stderr="fatal: unable to access\n")
+
+        outcome = sync_repo(repo, tmp_path)
+
+        assert outcome.action == "pull"
+        assert outcome.error == "Failed to pull existing-repo: fatal: unable to access"
+
+    @patch("nao_core.commands.sync.providers.repositories.provider.subprocess.run")
+    def test_git_never_prompts_for_credentials(self, mock_run, tmp_path: Path):
+        repo = RepoConfig(name="private-repo", url="https://github.com/test/private-repo")
+        mock_run.return_value = MagicMock(returncode=0)
+
+        sync_repo(repo, tmp_path)
+
+        assert mock_run.call_args.kwargs["env"]["GIT_TERMINAL_PROMPT"] == "0"
@@ -0,0 +1,76 @@
+"""Unit tests for the database metadata snapshot."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from nao_core.commands.sync.providers.databases.snapshot import (
+    SnapshotDatabaseContext,
+    SnapshotMissError,
+    SnapshotWriter,
+    load_snapshot,
+)
+
+
+class TestSnapshotWriter:
+    def test_round_trip(self, tmp_path: Path):
+        writer = SnapshotWriter(tmp_path / "snapshot.jsonl")
+        writer.open()
+        writer.record(
+            "public",
+            "users",
+            {("columns", ()): [{"name": "id", "type": "int64"}], ("row_count", ()): np.int64(3)},
+        )
+        writer.record("public", "orders", {("preview", (("limit", 10),)): [{"id": 1}]})
+        writer.complete()
+
+        snapshot = load_snapshot(tmp_path / "snapshot.jsonl")
+
+        assert snapshot[("public", "users")] == {
+            ("columns", ()): [{"name": "id", "type": "int64"}],
+            ("row_count", ()): 3,
+        }
+        assert snapshot[("public", "orders")] == {("preview", (("limit", 10),)): [{"id": 1}]}
+
+    def test_interrupted_snapshot_is_not_published(self, tmp_path: Path):
+        path = tmp_path / "snapshot.jsonl"
+        writer = SnapshotWriter(path)
+        writer.open()
+        writer.record("public", "users", {})
+        writer.close()
+
+        assert not path.exists()
+        assert writer.partial_path.exists()
+
+    def test_resume_keeps_entries_of_completed_tables(self, tmp_path: Path):
+        path = tmp_path / "snapshot.jsonl"
+        first = SnapshotWriter(path)
+        first.open()
+        first.record("public", "users", {("row_count", ()): 1})
+        first.record("public", "orders", {("row_count", ()): 2})
+        first.close()
+
+        second = SnapshotWriter(path)
+        second.open(keep={("public", "users")})
+        second.record("public", "events", {("row_count", ()): 3})
+        second.complete()
+
+        assert set(load_snapshot(path)) == {("public", "users"), ("public", "events")}
+
+
+class TestSnapshotDatabaseContext:
+    def test_answers_from_recorded_results(self):
+        ctx = SnapshotDatabaseContext(
+            "public", "users", {("columns", ()): [{"name": "id"}], ("preview", (("limit", 10),)): [{"id": 1}]}
+        )
+
+        assert ctx.columns() == [{"name": "id"}]
+        assert ctx.preview() == [{"id": 1}]
+        assert ctx.preview(limit=10) == [{"id": 1}]
+
+    def test_missing_results_raise(self):
+        ctx = SnapshotDatabaseContext("public", "users", {})
+
+        with pytest.raises(SnapshotMissError, match=r"row_count\(\) is not in the metadata snapshot"):
+            ctx.row_count()
@@ -1,9 +1,11 @@
 """Unit tests for the main sync command function."""
 
+import json
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+from rich.console import Console
 
 from nao_core.commands.sync import sync
 from nao_core.commands.sync.providers import ProviderSelection, SyncProvider, SyncResult
@@ -146,3 +148,58 @@ class TestSyncCommand:
         calls = [str(call) for call in mock_console.print.call_args_list]
         # Should show "Sync Failed" status
         assert any("Sync Failed" in call for call in calls)
+
+    def test_sync_writes_profile_when_requested(self, tmp_path: Path, create_config):
+        create_config()
+        selection = _make_provider(items=["item1"], items_synced=1)
+        profile_path = tmp_path / "profile.json"
+
+        with patch("nao_core.commands.sync.console"):
+            sync(_providers=[selection], profile=str(profile_path), render_templates=False)
+
+        options = selection.provider.sync.call_args.kwargs["options"]
+        assert options.profiler is not None
+        profile = json.loads(profile_path.read_text())
+        assert [e["name"] for e in profile["events"]] == ["TestProvider"]
+
+    def test_sync_plan_prints_json_without_syncing(self, create_config, capsys):
+        create_config()
+        selection = _make_provider(items=["item1", "item2"])
+        selection.provider.plan.return_value = {"items": 2}
+
+        with patch("nao_core.commands.sync.console"):
+            sync(_providers=[selection], plan=True, plan_format="json")
+
+        assert json.loads(capsys.readouterr().out) == {"providers": {"TestProvider": {"items": 2}}}
+        selection.provider.plan.assert_called_once_with(["item1", "item2"], project_path=Path.cwd())
+        selection.provider.pre_sync.assert_not_called()
+        selection.provider.sync.assert_not_called()
+
+    def test_sync_json_plan_sends_warnings_to_stderr(self, create_config, capsys):
+        create_config()
+        selection = _make_provider(items=["item1"])
+
+        def plan(items, project_path):
+            Console().print("⚠ Bulk table listing failed")
+            return {"items": 1}
+
+        selection.provider.plan.side_effect = plan
+
+        sync(_providers=[selection], plan=True, plan_format="json")
+
+        captured = capsys.readouterr()
+        assert json.loads(captured.out) == {"providers": {"TestProvider": {"items": 1}}}
+        assert "Bulk table listing failed" in captured.err
+
+    def test_sync_render_only_skips_providers_without_support(self, create_config):
+        create_config()
+        supported = _make_provider(name="Databases", items=["db"], items_synced=1)
+        supported.provider.supports_render_only = True
+        unsupported = _make_provider(name="Repositories", items=["repo"])
+        unsupported.provider.supports_render_only = False
+
+        with patch("nao_core.commands.sync.console"):
+            sync(_providers=[supported, unsupported], render_only=True, render_templates=False)
+
+        assert supported.provider.sync.call_args.kwargs["options"].render_only is True
+        unsupported.provider.sync.assert_not_called()
@@ -0,0 +1,72 @@
+"""Unit tests for sync output file writing."""
+
+import os
+import stat
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from nao_core.commands.sync.writer import write_if_changed
+
+
+class TestWriteIfChanged:
+    def test_writes_new_file(self, tmp_path: Path):
+        target = tmp_path / "columns.md"
+
+        assert write_if_changed(target, "# users\n") is True
+        assert target.read_text() == "# users\n"
+
+    def test_skips_unchanged_file(self, tmp_path: Path):
+        target = tmp_path / "columns.md"
+        target.write_text("# users\n")
+        os.utime(target, (1_000_000, 1_000_000))
+
+        assert write_if_changed(target, "# users\n") is False
+        assert target.stat().st_mtime == 1_000_000
+
+    def test_rewrites_changed_file_of_same_size(self, tmp_path: Path):
+        target = tmp_path / "columns.md"
+        target.write_text("# users\n")
+
+        assert write_if_changed(target, "# order\n") is True
+        assert target.read_text() == "# order\n"
+
+    def test_leaves_no_temp_files(self, tmp_path: Path):
+        target = tmp_path / "columns.md"
+
+        write_if_changed(target, "a")
+        write_if_changed(target, "b")
+
+        assert [p.name for p in tmp_path.iterdir()] == ["columns.md"]
+
+    def test_failed_write_keeps_original_and_cleans_up(self, tmp_path: Path):
+        target = tmp_path / "columns.md"
+        target.write_text("original")
+
+        with patch("nao_core.commands.sync.writer.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                write_if_changed(target, "new content")
+
+        assert target.read_text() == "original"
+        assert [p.name for p in tmp_path.iterdir()] == ["columns.md"]
+
+    @pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+    def test_new_file_gets_umask_mode(self, tmp_path: Path):
+        target = tmp_path / "columns.md"
+        reference = tmp_path / "reference.md"
+        reference.write_text("x")
+
+        write_if_changed(target, "a")
+
+        assert stat.S_IMODE(target.stat().st_mode) == stat.S_IMODE(reference.stat().st_mode)
+
+    @pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+    def test_rewrite_keeps_existing_mode(self, tmp_path: Path):
+        target = tmp_path / "columns.md"
+        target.write_text("a")
+        target.chmod(0o640)
+
+        write_if_changed(target, "b")
+
+        assert stat.S_IMODE(target.stat().st_mode) == 0o640
@@ -0,0 +1,171 @@
+import threading
+import time
+
+import pytest
+
+from nao_core.config.databases.base import QueryLimits
+from nao_core.config.databases.governor import (
+    QueryBudgetExceededError,
+    QueryGovernor,
+    is_throttling_error,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _governor(clock: FakeClock, **limits) -> QueryGovernor:
+    return QueryGovernor(QueryLimits(**limits), sleep=clock.sleep, clock=clock)
+
+
+def test_limits_enabled():
+    """Test that limits are only enabled when at least one is set."""
+    assert not QueryLimits().enabled
+    assert QueryLimits(max_queries_per_second=2).enabled
+    assert QueryLimits(max_concurrent_queries=2).enabled
+
+
+class TooManyRequests(Exception):
+    code = 429
+
+
+class DriverError(Exception):
+    def __init__(self, message: str, **attrs):
+        super().__init__(message)
+        self.__dict__.update(attrs)
+
+
+def test_throttling_errors_are_recognized():
+    """Test classification of warehouse rate/quota errors by driver type and code."""
+    assert is_throttling_error(TooManyRequests("slow down"))
+    assert is_throttling_error(DriverError("Quota exceeded", errors=[{"reason": "quotaExceeded"}]))
+    assert is_throttling_error(DriverError("Rate exceeded", response={"Error": {"Code": "ThrottlingException"}}))
+    assert is_throttling_error(DriverError("too many connections", pgcode="53300"))
+    assert is_throttling_error(DriverError("queue full", error_name="QUERY_QUEUE_FULL"))
+
+    wrapped = RuntimeError("query failed")
+    wrapped.__cause__ = TooManyRequests("slow down")
+    assert is_throttling_error(wrapped)
+
+
+def test_error_text_alone_is_not_throttling():
+    """Test that ordinary errors mentioning throttling-like words are not retried."""
+    assert not is_throttling_error(RuntimeError("Table not found"))
+    assert not is_throttling_error(RuntimeError("Column order_429 does not exist"))
+    assert not is_throttling_error(RuntimeError("Invalid concurrency setting; query queued forever"))
+    assert not is_throttling_error(DriverError("syntax error", pgcode="42601"))
+
+
+def test_rate_limit_spaces_queries():
+    """Test that queries are started no faster than max_queries_per_second."""
+    clock = FakeClock()
+    governor = _governor(clock, max_queries_per_second=2)
+
+    for _ in range(3):
+        governor.run("columns", "s", "t", lambda: None)
+
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_throttled_query_is_retried_and_rate_halved():
+    """Test AIMD decrease and retry when the warehouse throttles a query."""
+    clock = FakeClock()
+    governor = _governor(clock, max_queries_per_second=8)
+    calls = []
+
+    def query():
+        calls.append(1)
+        if len(calls) < 3:
+            raise TooManyRequests("rate limit exceeded")
+        return "ok"
+
+    assert governor.run("columns", "s", "t", query) == "ok"
+    assert governor.throttled == 2
+    assert governor.rate < 8
+    assert 1.0 in clock.sleeps and 2.0 in clock.sleeps
+
+
+def test_rate_grows_back_additively():
+    """Test that successful queries grow the rate back up to the limit."""
+    clock = FakeClock()
+    governor = _governor(clock, max_queries_per_second=4)
+    governor.rate = 1.0
+
+    for _ in range(20):
+        governor.run("columns", "s", "t", lambda: None)
+
+    assert governor.rate == 4
+
+
+def test_non_throttling_errors_are_raised():
+    """Test that other errors are not retried."""
+    governor = _governor(FakeClock(), max_queries_per_second=2)
+
+    with pytest.raises(ValueError):
+        governor.run("columns", "s", "t", lambda: (_ for _ in ()).throw(ValueError("bad sql")))
+    assert governor.throttled == 0
+
+
+def test_concurrency_is_capped():
+    """Test that no more than max_concurrent_queries run at once."""
+    governor = QueryGovernor(QueryLimits(max_concurrent_queries=2))
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def query():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+    threads = [threading.Thread(target=governor.run, args=("list_tables", str(i), "", query)) for i in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak <= 2
+
+
+def test_scan_budget_is_charged_once_per_table():
+    """Test that scan accessors are charged the table estimate once and refused past the budget."""
+    estimates = {"small": 100, "big": 1000}
+    governor = QueryGovernor(
+        QueryLimits(max_bytes_scanned=500), estimate_scan_bytes=lambda schema, table: estimates[table]
+    )
+
+    governor.run("preview", "s", "small", lambda: None)
+    governor.run("row_count", "s", "small", lambda: None)
+    governor.run("columns", "s", "big", lambda: None)
+
+    assert governor.bytes_scanned == 100
+    with pytest.raises(QueryBudgetExceededError):
+        governor.run("preview", "s", "big", lambda: None)
+    assert governor.budget_exhausted
+
+
+def test_failed_scan_estimate_is_treated_as_unknown():
+    """Test that a failing estimate neither charges the budget nor refuses the scan."""
+
+    def estimate(schema, table):
+        raise PermissionError("dry run not allowed")
+
+    governor = QueryGovernor(QueryLimits(max_bytes_scanned=500), estimate_scan_bytes=estimate)
+
+    assert governor.run("preview", "s", "t", lambda: "rows") == "rows"
+    assert governor.bytes_scanned == 0
+    assert not governor.budget_exhausted
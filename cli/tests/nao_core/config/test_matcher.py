@@ -0,0 +1,87 @@
+from unittest.mock import MagicMock
+
+from nao_core.config.databases import DuckDBConfig, PostgresConfig, SnowflakeConfig
+from nao_core.config.databases.matcher import PatternMatcher
+
+
+def test_matches_include_and_exclude():
+    """Test that a table must match an include pattern and no exclude pattern."""
+    matcher = PatternMatcher(include=["prod_*.*", "analytics.dim_*"], exclude=["*.backup_*"])
+
+    assert matcher.matches("prod_sales", "orders")
+    assert matcher.matches("analytics", "dim_users")
+    assert not matcher.matches("analytics", "fact_orders")
+    assert not matcher.matches("prod_sales", "backup_orders")
+    assert not matcher.matches("staging", "orders")
+
+
+def test_no_patterns_matches_everything():
+    """Test that an empty include list includes all tables."""
+    matcher = PatternMatcher(include=[], exclude=[])
+
+    assert matcher.matches("any", "table")
+    assert matcher.schema_may_match("any")
+
+
+def test_case_sensitivity():
+    """Test that matching honours the case-sensitivity flag."""
+    assert not PatternMatcher(include=["public.*"], exclude=[]).matches("PUBLIC", "USERS")
+    assert PatternMatcher(include=["public.*"], exclude=[], case_sensitive=False).matches("PUBLIC", "USERS")
+
+
+def test_schema_pruning():
+    """Test that schemas are pruned by include schema parts and 'schema.*' excludes only."""
+    matcher = PatternMatcher(include=["prod_*.*", "analytics.dim_*"], exclude=["prod_tmp.*", "*.backup_*"])
+
+    assert matcher.schema_may_match("prod_sales")
+    assert matcher.schema_may_match("analytics")
+    assert not matcher.schema_may_match("staging")
+    assert not matcher.schema_may_match("prod_tmp")
+
+
+def test_dotless_include_disables_schema_pruning():
+    """Test that an include pattern without a schema part never prunes schemas."""
+    matcher = PatternMatcher(include=["*users"], exclude=[])
+
+    assert matcher.schema_may_match("anything")
+    assert matcher.matches("anything", "users")
+
+
+def test_get_schemas_prunes_for_every_backend():
+    """Test that get_schemas drops schemas the patterns rule out before tables are listed."""
+    config = PostgresConfig(
+        name="pg",
+        host="localhost",
+        port=5432,
+        database="db",
+        user="u",
+        password="p",
+        include=["public.*", "sales.*"],
+        exclude=["sales.*"],
+    )
+    conn = MagicMock()
+    conn.list_databases.return_value = ["public", "sales", "staging", "pg_catalog"]
+
+    assert config.get_schemas(conn) == ["public"]
+
+
+def test_snowflake_patterns_are_case_insensitive():
+    """Test that Snowflake matches and prunes identifiers regardless of case."""
+    config = SnowflakeConfig(
+        name="sf", username="u", account_id="acc", password="p", database="DB", include=["analytics.*"]
+    )
+    conn = MagicMock()
+    conn.list_databases.return_value = ["ANALYTICS", "RAW", "INFORMATION_SCHEMA"]
+
+    assert config.get_schemas(conn) == ["ANALYTICS"]
+    assert config.matches_pattern("ANALYTICS", "USERS")
+
+
+def test_matcher_follows_pattern_changes():
+    """Test that the compiled matcher is rebuilt when patterns change."""
+    config = DuckDBConfig(name="duck", path=":memory:", include=["main.*"])
+    assert not config.matches_pattern("other", "t")
+
+    config.include = ["other.*"]
+
+    assert config.matches_pattern("other", "t")
@@ -0,0 +1,123 @@
+import pytest
+
+from nao_core.config.databases.retry import RetryPolicy, call_with_retry, is_retryable_error
+
+
+class TooManyRequests(Exception):
+    code = 429
+
+
+class DriverError(Exception):
+    def __init__(self, message: str, code: int):
+        super().__init__(message)
+        self.code = code
+
+
+class PgError(Exception):
+    def __init__(self, message: str, pgcode: str):
+        super().__init__(message)
+        self.pgcode = pgcode
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        RuntimeError("503 Service Unavailable"),
+        TooManyRequests("Too many queries queued for warehouse"),
+        RuntimeError("Warehouse 'WH' is resuming, please try again"),
+        ConnectionResetError("Connection reset by peer"),
+        TimeoutError("read timed out"),
+    ],
+)
+def test_transient_errors_are_retryable(error):
+    """Test that rate limits, dropped connections and resuming warehouses are retried."""
+    assert is_retryable_error(error)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        RuntimeError("Authentication failed for user 'nao'"),
+        DriverError("request rejected", code=401),
+        RuntimeError("SQL compilation error: syntax error line 1"),
+        RuntimeError("Table 'foo' does not exist"),
+        ConnectionError("403 Forbidden"),
+        ValueError("unexpected value"),
+    ],
+)
+def test_permanent_errors_fail_fast(error):
+    """Test that auth, syntax and unknown errors are not retried."""
+    assert not is_retryable_error(error)
+
+
+def test_fatal_markers_match_whole_phrases():
+    """Test that identifiers containing fatal words do not make transient errors permanent."""
+    assert is_retryable_error(RuntimeError("Connection reset while reading column 'author'"))
+    assert is_retryable_error(RuntimeError("Connection timed out while scanning syntax_trees.nodes"))
+
+
+def test_transient_status_codes_come_from_the_driver():
+    """Test that HTTP statuses and SQLSTATEs are read from the error, not from its message text."""
+    assert is_retryable_error(DriverError("upstream error", code=503))
+    assert is_retryable_error(PgError("deadlock", pgcode="40P01"))
+    assert not is_retryable_error(RuntimeError("Column orders_503.total cannot be cast to INT"))
+    assert not is_retryable_error(RuntimeError("Division by zero in view report_504_timed_out"))
+
+
+def test_throttling_is_not_retried_when_governed():
+    """Test that throttling errors are left to the governor when one is active."""
+    assert is_retryable_error(TooManyRequests("slow down"))
+    assert not is_retryable_error(TooManyRequests("slow down"), retry_throttling=False)
+
+
+def test_backoff_is_exponential_with_jitter():
+    """Test that backoff stays within the exponentially growing, capped bound."""
+    policy = RetryPolicy(base_delay=1, max_delay=5)
+
+    for retry, bound in [(0, 1), (1, 2), (2, 4), (5, 5)]:
+        assert all(0 <= policy.backoff(retry) <= bound for _ in range(20))
+
+
+def test_call_with_retry_retries_transient_errors():
+    """Test that transient errors are retried until the call succeeds."""
+    attempts = []
+    retried = []
+    sleeps = []
+
+    def query():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionResetError("connection reset")
+        return "ok"
+
+    result = call_with_retry(query, RetryPolicy(max_retries=3), on_retry=retried.append, sleep=sleeps.append)
+
+    assert result == "ok"
+    assert len(retried) == 2
+    assert len(sleeps) == 2
+
+
+def test_call_with_retry_gives_up_after_max_retries():
+    """Test that the last transient error is raised once retries are exhausted."""
+    attempts = []
+
+    def query():
+        attempts.append(1)
+        raise RuntimeError("503 Service Unavailable")
+
+    with pytest.raises(RuntimeError, match="503"):
+        call_with_retry(query, RetryPolicy(max_retries=2), sleep=lambda _: None)
+    assert len(attempts) == 3
+
+
+def test_call_with_retry_fails_fast_on_permanent_errors():
+    """Test that permanent errors are raised without retrying."""
+    attempts = []
+
+    def query():
+        attempts.append(1)
+        raise RuntimeError("permission denied for relation users")
+
+    with pytest.raises(RuntimeError):
+        call_with_retry(query, RetryPolicy(max_retries=5), sleep=lambda _: None)
+    assert len(attempts) == 1
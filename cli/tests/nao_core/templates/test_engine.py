@@ -1,12 +1,19 @@
 """Unit tests for the template engine."""
 
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
+from jinja2 import Environment
+
+from nao_core.templates.analysis import AccessorCall
 from nao_core.templates.engine import (
     DEFAULT_TEMPLATES_DIR,
     TemplateEngine,
+    TemplateEngineRegistry,
+    get_bytecode_cache_dir,
     get_template_engine,
 )
 
@@ -245,6 +252,81 @@ class TestTemplateFilters:
         assert result == "12345"
 
 
+class TestAccessorCalls:
+    """Tests for static analysis of the db accessors a template calls."""
+
+    def _engine_with(self, tmp_path: Path, **templates: str) -> TemplateEngine:
+        databases_dir = tmp_path / "templates" / "databases"
+        databases_dir.mkdir(parents=True)
+        for name, source in templates.items():
+            (databases_dir / f"{name}.md.j2").write_text(source)
+        return TemplateEngine(project_path=tmp_path)
+
+    def _call_names(self, engine: TemplateEngine, template_name: str) -> set[str]:
+        calls = engine.accessor_calls(template_name)
+        assert calls is not None
+        return {c.name for c in calls}
+
+    def test_default_templates(self):
+        """Calls of the default templates are found with their constant arguments."""
+        engine = TemplateEngine()
+
+        assert self._call_names(engine, "databases/columns.md.j2") == {"columns", "partition_columns"}
+        assert self._call_names(engine, "databases/description.md.j2") == {
+            "row_count",
+            "column_count",
+            "description",
+        }
+        assert engine.accessor_calls("databases/preview.md.j2") == frozenset({AccessorCall("preview")})
+
+    def test_constant_and_dynamic_arguments(self, tmp_path: Path):
+        """Constant arguments are recorded; arguments known only at render time are flagged."""
+        engine = self._engine_with(
+            tmp_path,
+            custom="{{ db.preview(limit=5) }}{{ db.preview(2 * 10) }}{{ db.preview(limit=n) }}",
+        )
+
+        assert engine.accessor_calls("databases/custom.md.j2") == frozenset(
+            {
+                AccessorCall("preview", kwargs=(("limit", 5),)),
+                AccessorCall("preview", args=(20,)),
+                AccessorCall("preview", dynamic=True),
+            }
+        )
+
+    def test_includes_are_followed(self, tmp_path: Path):
+        """Calls made by included templates are part of the including template's calls."""
+        engine = self._engine_with(
+            tmp_path,
+            outer="{% include 'databases/inner.md.j2' %}{{ db.columns() }}",
+            inner="{{ db.row_count() }}",
+        )
+
+        assert self._call_names(engine, "databases/outer.md.j2") == {"columns", "row_count"}
+
+    def test_passing_db_around_is_inconclusive(self, tmp_path: Path):
+        """None is returned when db is used other than through method calls."""
+        engine = self._engine_with(
+            tmp_path,
+            macro="{% macro show(ctx) %}{{ ctx.row_count() }}{% endmacro %}{{ show(db) }}",
+            dynamic_include="{% include name %}",
+        )
+
+        assert engine.accessor_calls("databases/macro.md.j2") is None
+        assert engine.accessor_calls("databases/dynamic_include.md.j2") is None
+
+    def test_templates_are_parsed_once(self, tmp_path: Path, monkeypatch):
+        """The analysis of a template is cached on the engine."""
+        engine = self._engine_with(tmp_path, custom="{{ db.columns() }}")
+        parse = MagicMock(wraps=engine.env.parse)
+        monkeypatch.setattr(engine.env, "parse", parse)
+
+        engine.accessor_calls("databases/custom.md.j2")
+        engine.accessor_calls("databases/custom.md.j2")
+
+        assert parse.call_count == 1
+
+
 class TestGetTemplateEngine:
     """Tests for the get_template_engine function."""
 
@@ -253,7 +335,7 @@ class TestGetTemplateEngine:
         # Reset global state
         import nao_core.templates.engine as engine_module
 
-        engine_module._engine = None
+        engine_module._registry.clear()
 
         engine = get_template_engine()
 
@@ -263,7 +345,7 @@ class TestGetTemplateEngine:
         """get_template_engine returns the same instance on repeated calls."""
         import nao_core.templates.engine as engine_module
 
-        engine_module._engine = None
+        engine_module._registry.clear()
 
         engine1 = get_template_engine()
         engine2 = get_template_engine()
@@ -274,7 +356,7 @@ class TestGetTemplateEngine:
         """get_template_engine creates new instance when project path changes."""
         import nao_core.templates.engine as engine_module
 
-        engine_module._engine = None
+        engine_module._registry.clear()
 
         engine1 = get_template_engine(project_path=None)
         engine2 = get_template_engine(project_path=tmp_path)
@@ -282,6 +364,68 @@ class TestGetTemplateEngine:
         assert engine1 is not engine2
         assert engine2.project_path == tmp_path
 
+    def test_switching_projects_keeps_both_engines(self, tmp_path: Path):
+        """Alternating between projects reuses each project's engine."""
+        import nao_core.templates.engine as engine_module
+
+        engine_module._registry.clear()
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+
+        engine_a = get_template_engine(tmp_path / "a")
+        get_template_engine(tmp_path / "b")
+
+        assert get_template_engine(tmp_path / "a") is engine_a
+
+
+class TestTemplateEngineRegistry:
+    """Tests for the TemplateEngineRegistry class."""
+
+    def test_engine_reloads_when_templates_change(self, tmp_path: Path):
+        """Adding or editing a user template replaces the cached engine."""
+        registry = TemplateEngineRegistry()
+        engine = registry.get(tmp_path)
+        assert registry.get(tmp_path) is engine
+
+        templates_dir = tmp_path / "templates" / "databases"
+        templates_dir.mkdir(parents=True)
+        (templates_dir / "custom.md.j2").write_text("v1")
+        reloaded = registry.get(tmp_path)
+
+        assert reloaded is not engine
+        assert reloaded.is_user_override("databases/custom.md.j2")
+        assert registry.get(tmp_path) is reloaded
+
+        template = templates_dir / "custom.md.j2"
+        mtime = template.stat().st_mtime_ns
+        os.utime(template, ns=(mtime + 10**9, mtime + 10**9))
+        assert registry.get(tmp_path) is not reloaded
+
+    def test_least_recently_used_engine_is_evicted(self, tmp_path: Path):
+        """The registry holds at most max_size engines."""
+        registry = TemplateEngineRegistry(max_size=2)
+        projects = [tmp_path / name for name in ("a", "b", "c")]
+        for project in projects:
+            project.mkdir()
+
+        engine_a = registry.get(projects[0])
+        engine_b = registry.get(projects[1])
+        registry.get(projects[0])
+        registry.get(projects[2])
+
+        assert len(registry) == 2
+        assert registry.get(projects[0]) is engine_a
+        assert registry.get(projects[1]) is not engine_b
+
+    def test_concurrent_callers_share_one_engine(self, tmp_path: Path):
+        """Threads asking for the same project get the same engine."""
+        registry = TemplateEngineRegistry()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            engines = list(executor.map(lambda _: registry.get(tmp_path), range(32)))
+
+        assert len({id(engine) for engine in engines}) == 1
+
 
 class TestDefaultTemplatesDir:
     """Tests for the DEFAULT_TEMPLATES_DIR constant."""
@@ -311,3 +455,46 @@ class TestDefaultTemplatesDir:
             template_path = databases_dir / filename
             assert template_path.exists(), f"Missing default template: {filename}"
             assert template_path.stat().st_size > 0, f"Empty template: {filename}"
+
+
+class TestBytecodeCache:
+    """Tests for the on-disk cache of compiled templates."""
+
+    def _write(self, project: Path, source: str) -> None:
+        templates_dir = project / "templates"
+        templates_dir.mkdir(exist_ok=True)
+        (templates_dir / "report.j2").write_text(source)
+
+    def test_compiled_templates_are_reused_across_engines(self, tmp_path: Path):
+        """A new engine (i.e. a new CLI run) loads the bytecode instead of compiling."""
+        self._write(tmp_path, "Hello {{ name }}")
+        TemplateEngine(project_path=tmp_path).render("report.j2", name="a")
+        assert list(get_bytecode_cache_dir(tmp_path).glob("*.cache"))
+
+        with patch.object(Environment, "compile", wraps=Environment.compile, autospec=True) as compile_:
+            rendered = TemplateEngine(project_path=tmp_path).render("report.j2", name="b")
+
+        assert rendered == "Hello b"
+        compile_.assert_not_called()
+
+    def test_default_templates_are_cached(self, tmp_path: Path):
+        """Templates shipped with nao are cached in the project as well."""
+        engine = TemplateEngine(project_path=tmp_path)
+        engine.env.get_template("databases/columns.md.j2")
+
+        assert len(list(get_bytecode_cache_dir(tmp_path).glob("*.cache"))) == 1
+
+    def test_edited_template_is_recompiled(self, tmp_path: Path):
+        """Cached bytecode is only used while the source checksum matches."""
+        self._write(tmp_path, "v1")
+        TemplateEngine(project_path=tmp_path).render("report.j2")
+
+        self._write(tmp_path, "v2")
+        assert TemplateEngine(project_path=tmp_path).render("report.j2") == "v2"
+
+    def test_unwritable_cache_is_ignored(self, tmp_path: Path):
+        """Rendering works when the cache directory can't be created."""
+        self._write(tmp_path, "ok")
+        (tmp_path / ".nao").write_text("not a directory")
+
+        assert TemplateEngine(project_path=tmp_path).render("report.j2") == "ok"
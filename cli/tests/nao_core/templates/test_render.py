@@ -0,0 +1,258 @@
+"""Unit tests for rendering user templates in the context folder."""
+
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from nao_core.templates.context import NotionPage
+from nao_core.templates.dependencies import get_render_state_path
+from nao_core.templates.render import discover_templates, render_all_templates
+
+
+def _config() -> MagicMock:
+    config = MagicMock()
+    config.project_name = "demo"
+    config.notion.pages = []
+    config.notion.api_key = "secret"
+    config.notion.cache_ttl = 3600
+    config.model_dump_json.return_value = "{}"
+    return config
+
+
+class TestRenderAllTemplates:
+    """Tests for render_all_templates."""
+
+    def test_renders_templates_next_to_their_source(self, tmp_path: Path):
+        """Each .j2 file is rendered to the same path without the extension."""
+        (tmp_path / "docs").mkdir()
+        (tmp_path / "docs" / "a.md.j2").write_text("# {{ nao.config.project_name }}")
+        (tmp_path / "b.md.j2").write_text("{{ [1, 2] | to_json }}")
+
+        result = render_all_templates(tmp_path, _config(), MagicMock())
+
+        assert result.rendered_files == ["b.md", "docs/a.md"]
+        assert (tmp_path / "docs" / "a.md").read_text() == "# demo"
+        assert (tmp_path / "b.md").read_text() == "[1, 2]"
+
+    def test_notion_pages_are_fetched_once_per_run(self, tmp_path: Path):
+        """Templates share one nao context, so a page referenced everywhere is loaded once."""
+        for i in range(5):
+            (tmp_path / f"page{i}.md.j2").write_text("{{ nao.notion.page('abc').title }}")
+        loads = []
+
+        def load(page: NotionPage) -> dict:
+            with page._lock:
+                if page._data is None:
+                    loads.append(page.page_url_or_id)
+                    page._data = {"id": "abc", "title": "Roadmap", "content": "", "url": ""}
+            return page._data
+
+        with patch.object(NotionPage, "_load", load):
+            result = render_all_templates(tmp_path, _config(), MagicMock(), max_workers=4)
+
+        assert result.templates_rendered == 5
+        assert loads == ["abc"]
+        assert (tmp_path / "page3.md").read_text() == "Roadmap"
+
+    def test_notion_sessions_are_closed_after_the_run(self, tmp_path: Path):
+        """The Notion session opened for the run is closed once every template is rendered."""
+        (tmp_path / "page.md.j2").write_text("{{ nao.notion.page('abc').title }}")
+
+        def load(page: NotionPage) -> dict:
+            return {"id": "abc", "title": "Roadmap", "content": "", "url": ""}
+
+        with (
+            patch.object(NotionPage, "_load", load),
+            patch("nao_core.commands.sync.providers.notion.client.NotionSession.close") as close,
+        ):
+            result = render_all_templates(tmp_path, _config(), MagicMock())
+
+        assert result.templates_rendered == 1
+        close.assert_called_once()
+
+    def test_failures_are_reported_in_template_order(self, tmp_path: Path):
+        """A failing template doesn't stop the others, and errors keep the discovery order."""
+        (tmp_path / "a.md.j2").write_text("{{ missing() }}")
+        (tmp_path / "b.md.j2").write_text("{% if %}")
+        (tmp_path / "c.md.j2").write_text("ok")
+        console = MagicMock()
+
+        result = render_all_templates(tmp_path, _config(), console)
+
+        assert result.rendered_files == ["c.md"]
+        assert [error.split(":")[0] for error in result.errors] == ["a.md.j2", "b.md.j2"]
+        assert result.get_summary() == "1 rendered, 2 failed"
+        assert console.print.call_count == 3
+
+    def test_no_templates(self, tmp_path: Path):
+        """An empty project renders nothing."""
+        result = render_all_templates(tmp_path, _config(), MagicMock())
+
+        assert result.get_summary() == "No templates found"
+
+
+class TestIncrementalRendering:
+    """Tests for skipping templates whose inputs are unchanged."""
+
+    def _render(self, project: Path, pages: dict[str, str] | None = None, **kwargs):
+        pages = pages or {}
+
+        def fetch(page: NotionPage) -> dict:
+            return {"id": page.page_url_or_id, "title": pages[page.page_url_or_id], "content": "", "url": ""}
+
+        with patch.object(NotionPage, "_fetch", fetch):
+            return render_all_templates(project, kwargs.pop("config", _config()), MagicMock(), **kwargs)
+
+    def test_unchanged_templates_are_skipped(self, tmp_path: Path):
+        """A second run with identical inputs renders nothing and keeps the output."""
+        (tmp_path / "a.md.j2").write_text("{{ nao.config.project_name }}")
+
+        first = self._render(tmp_path)
+        second = self._render(tmp_path)
+
+        assert first.templates_rendered == 1
+        assert second.templates_rendered == 0
+        assert second.templates_skipped == 1
+        assert second.get_summary() == "1 unchanged"
+        assert (tmp_path / "a.md").read_text() == "demo"
+        assert get_render_state_path(tmp_path).exists()
+
+    def test_changed_include_rerenders_dependents(self, tmp_path: Path):
+        """Editing an included template re-renders the templates that include it, and only those."""
+        (tmp_path / "partials").mkdir()
+        (tmp_path / "partials" / "footer.txt").write_text("v1")
+        (tmp_path / "a.md.j2").write_text("{% include 'partials/footer.txt' %}")
+        (tmp_path / "b.md.j2").write_text("standalone")
+        self._render(tmp_path)
+
+        (tmp_path / "partials" / "footer.txt").write_text("v2")
+        result = self._render(tmp_path)
+
+        assert result.rendered_files == ["a.md"]
+        assert (tmp_path / "a.md").read_text() == "v2"
+
+    def test_missing_optional_include_is_tracked(self, tmp_path: Path):
+        """An `ignore missing` include renders, and creating the included template re-renders."""
+        (tmp_path / "a.md.j2").write_text('hi {% include "partials/footer.txt" ignore missing %}')
+
+        first = self._render(tmp_path)
+        assert first.templates_failed == 0
+        assert (tmp_path / "a.md").read_text() == "hi "
+        assert self._render(tmp_path).templates_skipped == 1
+
+        (tmp_path / "partials").mkdir()
+        (tmp_path / "partials" / "footer.txt").write_text("there")
+        third = self._render(tmp_path)
+
+        assert third.rendered_files == ["a.md"]
+        assert (tmp_path / "a.md").read_text() == "hi there"
+
+    def test_changed_notion_page_rerenders(self, tmp_path: Path):
+        """The content hash of every Notion page read is an input of the template."""
+        (tmp_path / "a.md.j2").write_text("{{ nao.notion.page('abc').title }}")
+        self._render(tmp_path, {"abc": "Roadmap"})
+
+        unchanged = self._render(tmp_path, {"abc": "Roadmap"})
+        changed = self._render(tmp_path, {"abc": "Roadmap 2027"})
+
+        assert unchanged.templates_skipped == 1
+        assert changed.rendered_files == ["a.md"]
+        assert (tmp_path / "a.md").read_text() == "Roadmap 2027"
+
+    def test_config_and_output_changes_rerender(self, tmp_path: Path):
+        """A changed config or a hand-edited output invalidates the last render."""
+        (tmp_path / "a.md.j2").write_text("{{ nao.config.project_name }}")
+        self._render(tmp_path)
+
+        config = _config()
+        config.model_dump_json.return_value = '{"project_name": "other"}'
+        assert self._render(tmp_path, config=config).templates_rendered == 1
+
+        (tmp_path / "a.md").write_text("edited")
+        assert self._render(tmp_path, config=config).templates_rendered == 1
+        assert (tmp_path / "a.md").read_text() == "demo"
+
+    def test_force_rerenders_everything(self, tmp_path: Path):
+        """force ignores the recorded dependencies."""
+        (tmp_path / "a.md.j2").write_text("static")
+        self._render(tmp_path)
+
+        result = self._render(tmp_path, force=True)
+
+        assert result.templates_rendered == 1
+        assert result.templates_skipped == 0
+
+    def test_force_does_not_hash_sources(self, tmp_path: Path):
+        """force renders without resolving the templates a template pulls in."""
+        (tmp_path / "a.md.j2").write_text("static")
+
+        with patch("nao_core.templates.render.template_sources") as template_sources:
+            result = self._render(tmp_path, force=True)
+
+        template_sources.assert_not_called()
+        assert result.templates_rendered == 1
+
+    def test_failed_templates_are_retried(self, tmp_path: Path):
+        """A template that failed has no recorded dependencies and renders again."""
+        (tmp_path / "a.md.j2").write_text("{{ missing() }}")
+        self._render(tmp_path)
+
+        result = self._render(tmp_path)
+
+        assert result.templates_failed == 1
+        assert result.templates_skipped == 0
+
+
+class TestDiscoverTemplates:
+    """Tests for discover_templates."""
+
+    def test_excluded_directories_are_skipped(self, tmp_path: Path):
+        """Templates under excluded directories (e.g. accessor overrides) are not discovered."""
+        (tmp_path / "templates" / "databases").mkdir(parents=True)
+        (tmp_path / "templates" / "databases" / "columns.md.j2").write_text("")
+        (tmp_path / "report.md.j2").write_text("")
+
+        assert discover_templates(tmp_path) == [Path("report.md.j2")]
+
+    def test_provider_output_dirs_are_skipped(self, tmp_path: Path):
+        """Sync output directories are excluded by path, not by name."""
+        (tmp_path / "databases" / "type=duckdb").mkdir(parents=True)
+        (tmp_path / "databases" / "type=duckdb" / "x.md.j2").write_text("")
+        (tmp_path / "docs" / "notion").mkdir(parents=True)
+        (tmp_path / "docs" / "notion" / "page.md.j2").write_text("")
+        (tmp_path / "docs" / "databases").mkdir()
+        (tmp_path / "docs" / "databases" / "overview.md.j2").write_text("")
+
+        assert discover_templates(tmp_path) == [Path("docs/databases/overview.md.j2")]
+
+    def test_naoignore_directory_patterns_are_honored(self, tmp_path: Path):
+        """Directory patterns from .naoignore prune the walk; file patterns like *.j2 are ignored."""
+        (tmp_path / ".naoignore").write_text("*.j2\n# scratch/\nbuild/\n/docs/archive/\n")
+        for directory in ("build", "docs/archive", "scratch", "src/build", "src/docs/archive"):
+            (tmp_path / directory).mkdir(parents=True, exist_ok=True)
+            (tmp_path / directory / "t.md.j2").write_text("")
+
+        assert discover_templates(tmp_path) == [Path("scratch/t.md.j2"), Path("src/docs/archive/t.md.j2")]
+
+    def test_excluded_directories_are_never_scanned(self, tmp_path: Path):
+        """A large synthetic synced tree is pruned without listing any of its directories."""
+        for db in range(5):
+            for schema in range(20):
+                schema_dir = tmp_path / "databases" / f"database={db}" / f"schema={schema}"
+                for table in range(10):
+                    (schema_dir / f"table={table}").mkdir(parents=True)
+                    (schema_dir / f"table={table}" / "columns.md").write_text("")
+        (tmp_path / "repos" / "app" / ".git").mkdir(parents=True)
+        (tmp_path / "report.md.j2").write_text("")
+        scanned: list[str] = []
+        real_scandir = os.scandir
+
+        def scandir(path):
+            scanned.append(str(path))
+            return real_scandir(path)
+
+        with patch("nao_core.templates.render.os.scandir", side_effect=scandir):
+            templates = discover_templates(tmp_path)
+
+        assert templates == [Path("report.md.j2")]
+        assert scanned == [str(tmp_path)]